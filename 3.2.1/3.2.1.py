@@ -1,5 +1,8 @@
-import csv
 import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from VacancyPartitions import partition_vacancies
 
 
 def custom_exit(message: str) -> None:
@@ -12,31 +15,26 @@ def custom_exit(message: str) -> None:
     exit()
 
 
-def separate_csv(file_name: str) -> None:
+def separate_csv(file_name: str, granularity: str = 'year', file_format: str = 'csv') -> None:
     """
-    Выполняет разделение исходного csv-файла на отдельные csv-файлы по годам.
-    Сохраняет новые csv-файлы в папку vacancies
+    Выполняет разделение исходного csv-файла на отдельные файлы по годам (или по месяцам) за один проход.
+    Сохраняет партиции в папку vacancies в формате year=[год]/part.csv (или в колоночном формате .npy)
+    вместе с манифестом
 
     :param file_name: Название исходного файла
+    :param granularity: Гранулярность деления ('year' или 'month')
+    :param file_format: Формат партиций ('csv' или колоночный 'npy')
     """
-    separated_vacancies = {}
-    vacancies = [line for line in csv.reader(open(file_name, encoding='utf-8-sig'))]
-    if len(vacancies) == 0:
-        custom_exit('Пустой файл')
-    for vacancy in [dict(zip(vacancies[0], value)) for value in vacancies[1:]]:
-        if separated_vacancies.get(vacancy['published_at'][:4]) is None:
-            separated_vacancies[vacancy['published_at'][:4]] = [vacancy]
-        else:
-            separated_vacancies[vacancy['published_at'][:4]].append(vacancy)
-
-    os.mkdir('../3.2.2-3.2.3/vacancies')
-    for year in separated_vacancies.keys():
-        with open(f'../3.2.2-3.2.3/vacancies/{year}.csv', mode="w", encoding='utf-8-sig') as write_file:
-            file_writer = csv.DictWriter(write_file,
-                                         delimiter=",",
-                                         lineterminator="\r",
-                                         fieldnames=vacancies[0])
-            file_writer.writeheader()
-            file_writer.writerows(separated_vacancies[year])
-
-separate_csv(r'..\csv\vacancies_by_year.csv')
\ No newline at end of file
+    try:
+        manifest = partition_vacancies(file_name,
+                                       os.path.join('..', '3.2.2-3.2.3', 'vacancies'),
+                                       granularity,
+                                       file_format=file_format)
+    except ValueError as error:
+        custom_exit(str(error))
+    for partition in manifest['partitions']:
+        print(f"{partition['path']}: {partition['rows']}")
+
+
+if __name__ == '__main__':
+    separate_csv(os.path.join('..', 'csv', 'vacancies_by_year.csv'))
@@ -1,56 +1,94 @@
 import itertools
 import multiprocessing
+import numpy as np
 import pandas as pd
 import os
+import sys
 import cProfile
-from collections import ChainMap
-from typing import List, Dict
+from typing import List, Dict, Tuple, Any
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from VacancyPartitions import list_partitions, prune_partitions, read_partition, published_year
+from VacancyPartitions import get_year_partials, merge_year_partials
+from SharedColumns import SharedColumns
 
-def print_multiprocess_result(file_name: str, profession_name: str, queue: multiprocessing.Queue) -> None:
+YEAR_COLUMNS = [('salary_sum', np.float64), ('salary_count', np.int64), ('size', np.int64),
+                ('vacancy_salary_sum', np.float64), ('vacancy_salary_count', np.int64), ('vacancy_size', np.int64)]
+
+
+def print_multiprocess_result(file_name: str, profession_name: str, queue: multiprocessing.Queue,
+                              profession_matches: bool = True) -> None:
     """
-    Формирует данные аналитики по годам в режиме многопроцессорности
+    Формирует частичные данные по годам и по городам для одной партиции в режиме многопроцессорности.
+    Результаты записываются в разделяемую память, через очередь передается только описание блока памяти
 
-    :param file_name: Название csv-файла
+    :param file_name: Путь к партиции (csv-файл или каталог в колоночном формате)
     :param profession_name: Название профессии
     :param queue: Передаваемая очередь класса Queue из библиотеки multiprocessing
+    :param profession_matches: Может ли партиция содержать вакансии профессии (по статистике манифеста)
     """
-    df = pd.read_csv(file_name)
+    columns = ['salary_from', 'salary_to', 'area_name', 'published_at']
+    df = read_partition(file_name, columns=columns + ['name'] if profession_matches else columns)
     df['salary'] = df[['salary_from', 'salary_to']].mean(axis=1)
-    df['published_at'] = df['published_at'].apply(lambda x: int(x[:4]))
-    vacancy_df = df[df['name'].str.contains(profession_name)]
-    vacancy_years = df['published_at'].unique()
-    year_salary = {year: [] for year in vacancy_years}
-    count_salary = {year: 0 for year in vacancy_years}
-    job_year_salary = {year: [] for year in vacancy_years}
-    job_count_salary = {year: 0 for year in vacancy_years}
-
-    for year in vacancy_years:
-        year_salary[year] = int(df[df['published_at'] == year]['salary'].mean())
-        count_salary[year] = len(df[df['published_at'] == year])
-        job_year_salary[year] = int(vacancy_df[vacancy_df['published_at'] == year]['salary'].mean())
-        job_count_salary[year] = len(vacancy_df[vacancy_df['published_at'] == year].index)
-
-    queue.put([year_salary, count_salary, job_year_salary, job_count_salary])
-
-def print_singleprocess_result(file_name: str) -> List[Dict]:
+    df['published_at'] = published_year(df['published_at'])
+    df['vacancy'] = df['name'].str.contains(profession_name, regex=False) if profession_matches else False
+    year_partials = get_year_partials(df)
+    city_stats = df.groupby('area_name', observed=True, dropna=False)['salary'].agg(['sum', 'count', 'size'])
+
+    shared = SharedColumns.create({
+        'year': np.array(list(year_partials), dtype=np.int64),
+        **{column: np.array([values[index] for values in year_partials.values()], dtype=dtype)
+           for index, (column, dtype) in enumerate(YEAR_COLUMNS)},
+        'city': np.array(['' if pd.isna(city) else city for city in city_stats.index], dtype=str),
+        'city_salary_sum': city_stats['sum'].to_numpy(dtype=np.float64),
+        'city_salary_count': city_stats['count'].to_numpy(dtype=np.int64),
+        'city_size': city_stats['size'].to_numpy(dtype=np.int64)
+    })
+    queue.put(shared.descriptor)
+    shared.close()
+
+
+def read_shared_result(descriptor: Dict[str, Any]) -> List[Dict]:
+    """
+    Читает результаты процесса из разделяемой памяти и освобождает блок памяти
+
+    :param descriptor: Описание блока разделяемой памяти
+    :return: Возвращает частичные данные по годам (см. get_year_partials) и по городам в виде
+    {город: (сумма зарплат, количество зарплат, количество вакансий)}
+    """
+    shared = SharedColumns.attach(descriptor)
+    year_partials = {year: values for year, *values in zip(shared['year'].tolist(),
+                                                            *[shared[column].tolist() for column, _ in YEAR_COLUMNS])}
+    city_partials = {city or None: values for city, *values in zip(shared['city'].tolist(),
+                                                                    shared['city_salary_sum'].tolist(),
+                                                                    shared['city_salary_count'].tolist(),
+                                                                    shared['city_size'].tolist())}
+    shared.unlink()
+    return [year_partials, city_partials]
+
+
+def merge_city_partials(city_partials: List[Dict[str, Tuple[float, int, int]]]) -> List[Dict]:
     """
-    Формирует данные аналитики по городам в режиме однопроцессорности
+    Объединяет частичные данные по городам всех партиций и оставляет города, в которых больше 1% вакансий.
+    Вакансии без города учитываются в общем количестве вакансий
 
-    :param file_name: Название csv-файла
+    :param city_partials: Список частичных данных по городам каждой партиции
     :return: Возвращает словари с информацией об уровне зарплат и доле вакансий по городам
     """
-    df = pd.read_csv(file_name)
-    df['salary'] = df[['salary_from', 'salary_to']].mean(axis=1)
-    df['published_at'] = df['published_at'].apply(lambda x: int(x[:4]))
-    df['count'] = df.groupby('area_name')['area_name'].transform('count')
-    sample_df = df[df['count'] > 0.01 * len(df)]
+    cities = {}
+    for partials in city_partials:
+        for city, (salary_sum, salary_count, size) in partials.items():
+            total = cities.setdefault(city, [0.0, 0, 0])
+            total[0] += salary_sum
+            total[1] += salary_count
+            total[2] += size
+    vacancies_count = sum(total[2] for total in cities.values())
     city_salary = {}
     city_count = {}
-    for city in list(sample_df['area_name'].unique()):
-        salary_df = sample_df[sample_df['area_name'] == city]
-        city_salary[city] = int(salary_df['salary'].mean())
-        city_count[city] = round(len(salary_df) / len(df), 4)
+    for city, (salary_sum, salary_count, size) in cities.items():
+        if size > 0.01 * vacancies_count and not pd.isna(city):
+            city_salary[city] = int(salary_sum / salary_count) if salary_count > 0 else 0
+            city_count[city] = round(size / vacancies_count, 4)
     return [city_salary, city_count]
 
 
@@ -64,26 +102,25 @@ def start_multiprocess_analytics(directory_name: str, profession_name: str) -> N
     data = []
     queue = multiprocessing.Queue()
     processes = []
-    for file_name in os.listdir(directory_name):
-        file_csv_name = os.path.join(directory_name, file_name)
-        process = multiprocessing.Process(target=print_multiprocess_result, args=(file_csv_name, profession_name, queue))
+    profession_partitions = set(prune_partitions(directory_name, profession_name))
+    for file_csv_name in list_partitions(directory_name):
+        process = multiprocessing.Process(target=print_multiprocess_result,
+                                          args=(file_csv_name, profession_name, queue,
+                                                file_csv_name in profession_partitions))
         processes.append(process)
         process.start()
 
     for process in processes:
-        data.append(queue.get())
+        data.append(read_shared_result(queue.get()))
         process.join()
 
-    city_data = print_singleprocess_result(r'..\csv\vacancies_by_year.csv')
-    years_data = list(zip(*data))
-    print(f'Динамика уровня зарплат по годам: '
-          f'{dict(sorted(dict(ChainMap(*years_data[0])).items(), key=lambda x: x[0]))}')
-    print(f'Динамика количества вакансий по годам: '
-          f'{dict(sorted(dict(ChainMap(*years_data[1])).items(), key=lambda x: x[0]))}')
-    print(f'Динамика уровня зарплат по годам для выбранной профессии: '
-          f'{dict(sorted(dict(ChainMap(*years_data[2])).items(), key=lambda x: x[0]))}')
-    print(f'Динамика количества вакансий по годам для выбранной профессии: '
-          f'{dict(sorted(dict(ChainMap(*years_data[3])).items(), key=lambda x: x[0]))}')
+    year_partials, city_partials = zip(*data)
+    years_data = merge_year_partials(year_partials)
+    city_data = merge_city_partials(city_partials)
+    print(f'Динамика уровня зарплат по годам: {years_data[0]}')
+    print(f'Динамика количества вакансий по годам: {years_data[1]}')
+    print(f'Динамика уровня зарплат по годам для выбранной профессии: {years_data[2]}')
+    print(f'Динамика количества вакансий по годам для выбранной профессии: {years_data[3]}')
     print(f'Уровень зарплат по городам (в порядке убывания): '
           f'{dict(itertools.islice(sorted(city_data[0].items(), key=lambda x: x[1], reverse=True), 10))}')
     print(f'Доля вакансий по городам (в порядке убывания): '
@@ -1,83 +1,93 @@
+import argparse
 import itertools
 import pandas as pd
 import os
+import sys
 import cProfile
-from concurrent import futures
-from collections import ChainMap
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from VacancyPartitions import list_partitions, prune_partitions, read_partition, published_year
+from VacancyPartitions import get_year_partials, merge_year_partials
+from PartitionScheduler import schedule_partitions, print_timings
 
-def print_multiprocess_result(file_name: str, profession_name: str) -> List[Dict]:
+
+def print_multiprocess_result(file_name: str, profession_name: str, profession_matches: bool = True) -> List[Dict]:
     """
-    Формирует данные аналитики по годам в режиме многопроцессорности
+    Формирует частичные данные по годам и по городам для одной партиции в режиме многопроцессорности
 
-    :param file_name: Название csv-файла
+    :param file_name: Путь к партиции (csv-файл или каталог в колоночном формате)
     :param profession_name: Название профессии
-    :param queue: Передаваемая очередь класса Queue из библиотеки multiprocessing
+    :param profession_matches: Может ли партиция содержать вакансии профессии (по статистике манифеста)
+    :return: Возвращает частичные данные по годам и по городам
     """
-    df = pd.read_csv(file_name)
+    columns = ['salary_from', 'salary_to', 'area_name', 'published_at']
+    df = read_partition(file_name, columns=columns + ['name'] if profession_matches else columns)
     df['salary'] = df[['salary_from', 'salary_to']].mean(axis=1)
-    df['published_at'] = df['published_at'].apply(lambda x: int(x[:4]))
-    vacancy_df = df[df['name'].str.contains(profession_name)]
-    vacancy_years = df['published_at'].unique()
-    year_salary = {year: [] for year in vacancy_years}
-    count_salary = {year: 0 for year in vacancy_years}
-    job_year_salary = {year: [] for year in vacancy_years}
-    job_count_salary = {year: 0 for year in vacancy_years}
-
-    for year in vacancy_years:
-        year_salary[year] = int(df[df['published_at'] == year]['salary'].mean())
-        count_salary[year] = len(df[df['published_at'] == year])
-        job_year_salary[year] = int(vacancy_df[vacancy_df['published_at'] == year]['salary'].mean())
-        job_count_salary[year] = len(vacancy_df[vacancy_df['published_at'] == year].index)
-
-    return [year_salary, count_salary, job_year_salary, job_count_salary]
-
-def print_singleprocess_result(file_name: str) -> List[Dict]:
+    df['published_at'] = published_year(df['published_at'])
+    df['vacancy'] = df['name'].str.contains(profession_name, regex=False) if profession_matches else False
+    return [get_year_partials(df), get_city_partials(df)]
+
+def get_city_partials(df: pd.DataFrame) -> Dict[str, Tuple[float, int, int]]:
     """
-    Формирует данные аналитики по городам в режиме однопроцессорности
+    Формирует частичные данные по городам для одной партиции
+
+    :param df: Фрейм данных партиции со столбцом salary
+    :return: Возвращает словарь в виде {город: (сумма зарплат, количество зарплат, количество вакансий)}
+    """
+    grouped = df.groupby('area_name', observed=True, dropna=False)['salary'].agg(['sum', 'count', 'size'])
+    return {city: (float(row['sum']), int(row['count']), int(row['size'])) for city, row in grouped.iterrows()}
+
 
-    :param file_name: Название csv-файла
+def merge_city_partials(city_partials: List[Dict[str, Tuple[float, int, int]]]) -> List[Dict]:
+    """
+    Объединяет частичные данные по городам всех партиций и оставляет города, в которых больше 1% вакансий.
+    Вакансии без города учитываются в общем количестве вакансий
+
+    :param city_partials: Список частичных данных по городам каждой партиции
     :return: Возвращает словари с информацией об уровне зарплат и доле вакансий по городам
     """
-    df = pd.read_csv(file_name)
-    df['salary'] = df[['salary_from', 'salary_to']].mean(axis=1)
-    df['published_at'] = df['published_at'].apply(lambda x: int(x[:4]))
-    df['count'] = df.groupby('area_name')['area_name'].transform('count')
-    sample_df = df[df['count'] > 0.01 * len(df)]
+    cities = {}
+    for partials in city_partials:
+        for city, (salary_sum, salary_count, size) in partials.items():
+            total = cities.setdefault(city, [0.0, 0, 0])
+            total[0] += salary_sum
+            total[1] += salary_count
+            total[2] += size
+    vacancies_count = sum(total[2] for total in cities.values())
     city_salary = {}
     city_count = {}
-    for city in list(sample_df['area_name'].unique()):
-        salary_df = sample_df[sample_df['area_name'] == city]
-        city_salary[city] = int(salary_df['salary'].mean())
-        city_count[city] = round(len(salary_df) / len(df), 4)
+    for city, (salary_sum, salary_count, size) in cities.items():
+        if size > 0.01 * vacancies_count and not pd.isna(city):
+            city_salary[city] = int(salary_sum / salary_count) if salary_count > 0 else 0
+            city_count[city] = round(size / vacancies_count, 4)
     return [city_salary, city_count]
 
 
-def start_multiprocess_analytics(directory_name: str, profession_name: str) -> None:
+def start_multiprocess_analytics(directory_name: str, profession_name: str,
+                                 max_workers: int = None, chunk_size: int = 1) -> None:
     """
     Запускает обработку и формирование аналитики по вакансиям в режиме многопроцессорности
 
     :param directory_name: Название директории csv-файлов
     :param profession_name: Название профессии
+    :param max_workers: Количество процессов (по умолчанию - количество процессоров)
+    :param chunk_size: Количество партиций, обрабатываемых одним процессом за одну задачу
     """
-    data = []
-    executor = futures.ProcessPoolExecutor()
-    for file_name in os.listdir(directory_name):
-        file_csv_name = os.path.join(directory_name, file_name)
-        ans = executor.submit(print_multiprocess_result, file_csv_name, profession_name).result()
-        data.append(ans)
-
-    city_data = print_singleprocess_result(r'..\csv\vacancies_by_year.csv')
-    years_data = list(zip(*data))
-    print(f'Динамика уровня зарплат по годам: '
-          f'{dict(sorted(dict(ChainMap(*years_data[0])).items(), key=lambda x: x[0]))}')
-    print(f'Динамика количества вакансий по годам: '
-          f'{dict(sorted(dict(ChainMap(*years_data[1])).items(), key=lambda x: x[0]))}')
-    print(f'Динамика уровня зарплат по годам для выбранной профессии: '
-          f'{dict(sorted(dict(ChainMap(*years_data[2])).items(), key=lambda x: x[0]))}')
-    print(f'Динамика количества вакансий по годам для выбранной профессии: '
-          f'{dict(sorted(dict(ChainMap(*years_data[3])).items(), key=lambda x: x[0]))}')
+    profession_partitions = set(prune_partitions(directory_name, profession_name))
+    tasks = [(file_csv_name, (file_csv_name, profession_name, file_csv_name in profession_partitions))
+             for file_csv_name in list_partitions(directory_name)]
+    results = schedule_partitions(print_multiprocess_result, tasks, max_workers, chunk_size)
+    print_timings(results)
+    data = [result for _, result, _ in results]
+
+    year_partials, city_partials = zip(*data)
+    years_data = merge_year_partials(year_partials)
+    city_data = merge_city_partials(city_partials)
+    print(f'Динамика уровня зарплат по годам: {years_data[0]}')
+    print(f'Динамика количества вакансий по годам: {years_data[1]}')
+    print(f'Динамика уровня зарплат по годам для выбранной профессии: {years_data[2]}')
+    print(f'Динамика количества вакансий по годам для выбранной профессии: {years_data[3]}')
     print(f'Уровень зарплат по городам (в порядке убывания): '
           f'{dict(itertools.islice(sorted(city_data[0].items(), key=lambda x: x[1], reverse=True), 10))}')
     print(f'Доля вакансий по городам (в порядке убывания): '
@@ -122,11 +132,17 @@ def custom_exit(message: str) -> None:
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=None, help='Количество процессов')
+    parser.add_argument('--chunk-size', type=int, default=1, help='Количество партиций в одной задаче процесса')
+    args = parser.parse_args()
+
     p = cProfile.Profile()
     p.enable()
 
     inputs = UserInput()
-    start_multiprocess_analytics(directory_name=inputs.directory_name, profession_name=inputs.profession_name)
+    start_multiprocess_analytics(directory_name=inputs.directory_name, profession_name=inputs.profession_name,
+                                 max_workers=args.workers, chunk_size=args.chunk_size)
 
     p.disable()
     p.print_stats(sort='cumtime')
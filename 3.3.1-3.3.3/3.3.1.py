@@ -1,10 +1,15 @@
+import os
+import sys
+
 import pandas as pd
-import requests
-from typing import List
-from xml.etree import ElementTree
+from typing import List, Dict
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from CurrencyFetcher import update_currency_table
+from CurrencyRates import profile_currencies
+
 
 class DataSet:
     """
@@ -13,6 +18,7 @@ class DataSet:
     Attributes:
         df (DataFrame): Фрейм данных вакансий
         currency_dict (dict): Словарь частотности валют в вакансиях
+        currency_dates (dict): Словарь в виде {валюта: (дата первой публикации, дата последней публикации)}
         start_date (date): Начальная дата (самая старая вакансия в выборке)
         end_date (date): Конечная дата (самая новая вакансия в выборке)
     """
@@ -22,37 +28,37 @@ class DataSet:
 
         :param file_name: Имя файла исходных данных в .csv формате
         """
-        self.df = pd.read_csv(file_name).sort_values(by='published_at')
+        self.df = pd.read_csv(file_name)
+        currency_counts, self.currency_dates = profile_currencies(self.df['salary_currency'], self.df['published_at'])
         self.currency_dict = {}
-        self.get_currency_count()
-        self.start_date = self.get_date(range(len(self.df)))
-        self.end_date = self.get_date(range(len(self.df) - 1, -1, -1))
+        self.get_currency_count(currency_counts)
+        date_ranges = [date_range for currency, date_range in self.currency_dates.items()
+                       if currency in self.currency_dict]
+        self.start_date = self.get_date(min((first for first, _ in date_ranges), default=None))
+        self.end_date = self.get_date(max((last for _, last in date_ranges), default=None))
 
-    def get_currency_count(self) -> None:
+    def get_currency_count(self, currency_counts: Dict[str, int]) -> None:
         """
-        Производит подсчет частотности встречающихся валют в вакансиях
+        Формирует словарь частотности валют в вакансиях (без рублей), оставляя валюты, встречающиеся более 5000 раз
+
+        :param currency_counts: Словарь частотности всех валют в вакансиях
         """
-        for i in range(len(self.df)):
-            key = self.df['salary_currency'][i]
-            if str(key) == 'nan' or str(key) == 'RUR':
-                continue
-            if key not in self.currency_dict:
-                self.currency_dict[key] = 0
-            self.currency_dict[key] += 1
+        self.currency_dict = {key: count for key, count in currency_counts.items() if key != 'RUR'}
         print(self.currency_dict)
         self.currency_dict = dict([x for x in self.currency_dict.items() if x[1] > 5000])
         self.currency_dict = dict(sorted(self.currency_dict.items(), key=lambda x: x[0]))
 
-    def get_date(self, date_range) -> datetime.date:
+    @staticmethod
+    def get_date(published_at: str) -> datetime.date:
         """
-        Производит перебор по началу и концу списка вакансий в поисках самой старой и новой вакансии соответственно
+        Преобразует дату публикации вакансии в дату
 
-        :param date_range: Задает промежуток вакансий, который нужно рассмотреть
-        :return: Возвращает дату вакансии в формате (date)
+        :param published_at: Дата публикации в формате ISO 8601
+        :return: Возвращает дату вакансии в формате (date) или None, если подходящих вакансий нет
         """
-        for i in date_range:
-            if self.df['salary_currency'][i] in self.currency_dict:
-                return datetime.strptime(self.df['published_at'][i], '%Y-%m-%dT%H:%M:%S%z').date()
+        if published_at is None:
+            return None
+        return datetime.strptime(published_at, '%Y-%m-%dT%H:%M:%S%z').date()
 
 
 class CurrencyData:
@@ -89,29 +95,16 @@ class CurrencyData:
 
     def get_currency_csv(self, currency_list: List[str], start_date: datetime.date, end_date: datetime.date) -> None:
         """
-        Формирует .csv файл с курсами валют в зависимости от даты
+        Формирует .csv файл с курсами валют в зависимости от даты. Существующий файл дополняется:
+        загружаются только месяцы с валютами, которые еще не загружались
 
         :param currency_list: Список рассматриваемых валют
         :param start_date: Начальная дата выборки
         :param end_date: Конечная дата выборки
         """
-        currency_df = pd.DataFrame(columns=['date'] + currency_list)
         dates = self.get_year_range(start_date, end_date)
-        for date in dates:
-            response = requests.get(f'http://www.cbr.ru/scripts/XML_daily.asp?date_req=28/{date}d=1')
-            response = ElementTree.fromstring(response.content.decode("WINDOWS-1251"))
-            currency_dict = {x: '' for x in currency_list}
-            for valute in response.findall('./Valute'):
-                if valute.find('./CharCode').text in currency_list:
-                    currency_dict[valute.find('./CharCode').text] = \
-                        round(float(valute.find('./Value').text.replace(',', '.')) /
-                              int(valute.find('./Nominal').text), 4)
-                    if all(currency_dict.values()):
-                        break
-            currency_dict = sorted(currency_dict.items(), key=lambda x: x[0])
-            currency = [x[1] for x in currency_dict]
-            currency_df.loc[len(currency_df.index)] = [datetime.strptime(date, '%m/%Y').strftime('%Y-%m')] + currency
-        currency_df.to_csv('currency.csv', index=False)
+        months = [datetime.strptime(date, '%m/%Y').strftime('%Y-%m') for date in dates]
+        currency_df = update_currency_table('currency.csv', months, currency_list)
 
 
 data = DataSet('vacancies_dif_currencies.csv')
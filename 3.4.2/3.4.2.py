@@ -1,4 +1,6 @@
+import argparse
 import os
+import sys
 from typing import Dict, List, Any, Tuple
 
 import pdfkit
@@ -6,11 +8,14 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 from jinja2 import Environment, FileSystemLoader
-from concurrent import futures
-from statistics import mean
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from VacancyPartitions import partition_vacancies, partition_may_match, read_partition
+from CurrencyRates import RateMatrix
+from PartitionScheduler import schedule_partitions, print_timings
 
 currency = pd.read_csv('currency.csv')
+vacancy_columns = ["name", "salary_from", "salary_to", "salary_currency", "area_name", "published_at"]
 
 class ValuteConverter:
     """
@@ -32,69 +37,58 @@ class ValuteConverter:
         self.currency_df = currency_df
         self.currencies = list(self.currency_df.keys()[2:])
 
-    def csv_create(self, date):
+    def csv_create(self, partition_dir: str):
         """
         Создает .csv файл с обработанными вакансиями, у которых зарплата переведена по курсу валют
+
+        :param partition_dir: Каталог партиции, в который сохраняется обработанный файл
         """
-        self.df.insert(1, 'salary', None)
-        self.df['salary'] = self.df[['salary_from', 'salary_to', 'salary_currency', 'published_at']]\
-                                                        .apply(self.get_salary, axis=1)
+        salary, valid = RateMatrix(self.currency_df, self.currencies).convert(self.df['salary_from'],
+                                                                              self.df['salary_to'],
+                                                                              self.df['salary_currency'],
+                                                                              self.df['published_at'])
+        self.df.insert(1, 'salary', salary)
         self.df.drop(labels=['salary_to', 'salary_from', 'salary_currency'], axis=1, inplace=True)
-        self.df = self.df.loc[self.df['salary'] != 'nan']
-        self.df.to_csv(f'csv\\part_{date}.csv', index=False)
+        self.df = self.df.loc[valid]
+        self.df.to_csv(os.path.join(partition_dir, 'converted.csv'), index=False)
         return self.df
 
-    def get_salary(self, row) -> (str or float):
-        """
-        Возвращает значение зарплаты по вакансии, переведенное в рубли по курсу валют. В случае недопустимых значений,
-        возвращает 'nan' и останавливает функцию.
-
-        :param row: Строка из DataFrame - рассматриваемая вакансия (ее строка)
-        :return: Возвращает значение зарплаты или 'nan' при несоблюдении условий конвертации и обработки вакансии
-        """
-        salary_currency = str(row[2])
-        salary_list = list(filter(lambda x: str(x) != 'nan', row[:2]))
-        if salary_currency == 'nan':
-            return 'nan'
-
-        if len(salary_list) != 0:
-            salary = mean(salary_list)
-        else:
-            return 'nan'
-
-        if salary_currency != 'RUR' and salary_currency in self.currencies:
-            multiplier = self.currency_df[self.currency_df['date'] == str(row[3])[:7]][salary_currency].iat[0]
-            salary *= multiplier
-        return salary
-
 class SeparateCSV:
     """
-    Класс для деления общего .csv файла с вакансиями на несколько по годам в формате part_[year].csv
+    Класс для деления общего .csv файла с вакансиями на несколько по годам в формате csv/year=[year]/part.csv
+    или в колоночном формате .npy
 
     Attributes:
-        file_name (str): Имя исходного .csv файла
+        manifest (Dict[str, Any]): Манифест с данными о партициях
+        years (List[int]): Годы публикации вакансий
+        partitions (Dict[int, str]): Словарь в виде {год: путь к файлу партиции}
     """
-    def __init__(self, file_name: str):
+    def __init__(self, file_name: str, output_dir: str = 'csv', file_format: str = 'csv'):
         """
         Инициализирует класс SeparateCSV, производит деление большого .csv файла на несколько малых по годам
+        за один проход по файлу
 
         :param file_name: Имя исходного .csv файла
+        :param output_dir: Каталог для сохранения партиций
+        :param file_format: Формат партиций ('csv' или колоночный 'npy')
         """
-        self.df = pd.read_csv(file_name)
-        self.df["years"] = self.df["published_at"].apply(lambda year: int(".".join(year[:4].split("-"))))
-        self.years = list(self.df["years"].unique())
+        self.manifest = partition_vacancies(file_name,
+                                            output_dir,
+                                            columns=vacancy_columns,
+                                            file_format=file_format)
+        self.partitions = {partition['year']: os.path.join(output_dir, partition['path'])
+                           for partition in self.manifest['partitions']}
+        self.years = list(self.partitions.keys())
 
-        for year in self.years:
-            if not os.path.exists('csv'):
-                os.mkdir('csv')
+    def get_matching_years(self, profession_name: str) -> List[int]:
+        """
+        Определяет по статистике манифеста годы, в партициях которых могут быть вакансии выбранной профессии
 
-            data = self.df[self.df["years"] == year]
-            data[["name",
-                  "salary_from",
-                  "salary_to",
-                  "salary_currency",
-                  "area_name",
-                  "published_at"]].to_csv(f"csv\\part_{year}.csv", index=False)
+        :param profession_name: Название профессии
+        :return: Возвращает список годов
+        """
+        return [partition['year'] for partition in self.manifest['partitions']
+                if partition_may_match(partition, profession_name=profession_name)]
 
 class UserInput:
     """
@@ -173,7 +167,7 @@ class Report:
         plt.tight_layout()
         plt.savefig("graph.png")
 
-def sort_dict(unsorted_dict: Dict[Any]) -> Dict[Any]:
+def sort_dict(unsorted_dict: Dict[Any, Any]) -> Dict[Any, Any]:
     """
     Метод для сортировки словаря
 
@@ -186,23 +180,25 @@ def sort_dict(unsorted_dict: Dict[Any]) -> Dict[Any]:
     return sorted_dict
 
 
-def csv_process(proccess_args: Tuple[str, str]) -> List[Dict[Any]]:
+def csv_process(proccess_args: Tuple[str, int, str, bool]) -> List[Dict[Any, Any]]:
     """
     Запускает процесс обработки данных за год и формирует словари с аналитикой
 
-    :param proccess_args: Аргументы, передаваемые при запуске процесса
+    :param proccess_args: Аргументы, передаваемые при запуске процесса: название профессии, год, путь к партиции
+    и признак того, что партиция может содержать вакансии профессии
     :return: Возвращает словарь с аналитикой:
     - Динамина уровня зарплат по годам
     - Динамика количества вакансий по годам
     - Динамика уровня зарплат по годам для выбранной профессии
     - Динамика количества вакансий по годам для выбранной профессии
     """
-    profession_name = proccess_args[0]
-    current_year = proccess_args[1]
-    year_df = pd.read_csv(f'csv\\part_{current_year}.csv')
-    year_df = ValuteConverter(year_df, currency).csv_create(current_year)
+    profession_name, current_year, partition_file, profession_matches = proccess_args
+    partition_dir = partition_file if os.path.isdir(partition_file) else os.path.dirname(partition_file)
+    year_df = read_partition(partition_file, columns=vacancy_columns)
+    year_df = ValuteConverter(year_df, currency).csv_create(partition_dir)
 
-    vacancy_year_df = year_df[year_df["name"].str.contains(profession_name)]
+    vacancy_year_df = year_df[year_df["name"].str.contains(profession_name, regex=False)] if profession_matches \
+        else year_df.iloc[0:0]
 
     salary_year = {current_year: []}
     vacancy_year = {current_year: 0}
@@ -211,26 +207,33 @@ def csv_process(proccess_args: Tuple[str, str]) -> List[Dict[Any]]:
 
     salary_year[current_year] = int(year_df['salary'].mean())
     vacancy_year[current_year] = len(year_df)
-    profession_salary_year[current_year] = int(vacancy_year_df['salary'].mean())
+    profession_salary_year[current_year] = int(vacancy_year_df['salary'].mean()) if len(vacancy_year_df) > 0 else 0
     profession_vacancy_year[current_year] = len(vacancy_year_df)
 
     analytics_dicts = [salary_year, vacancy_year, profession_salary_year, profession_vacancy_year]
     return analytics_dicts
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=None, help='Количество процессов')
+    parser.add_argument('--chunk-size', type=int, default=1, help='Количество партиций в одной задаче процесса')
+    args = parser.parse_args()
+
     inputs = UserInput()
     file_name, profession_name = inputs.file_name, inputs.profession_name
 
     separate_csv = SeparateCSV(file_name)
-    df = separate_csv.df
     years = separate_csv.years
+    profession_years = separate_csv.get_matching_years(profession_name)
 
     salary_year, vacancy_year, profession_salary_year, profession_vacancy_year = {}, {}, {}, {}
 
-    executor = futures.ProcessPoolExecutor()
-    for year in years:
-        args = (profession_name, year)
-        result = executor.submit(csv_process, args).result()
+    tasks = [(separate_csv.partitions[year],
+              ((profession_name, year, separate_csv.partitions[year], year in profession_years),))
+             for year in years]
+    results = schedule_partitions(csv_process, tasks, args.workers, args.chunk_size)
+    print_timings(results)
+    for _, result, _ in results:
         salary_year.update(result[0])
         vacancy_year.update(result[1])
         profession_salary_year.update(result[2])
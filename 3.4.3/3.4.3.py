@@ -1,12 +1,21 @@
+import os
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import pdfkit
-from statistics import mean
 from typing import Dict, Any, List
 from matplotlib import cm
 from jinja2 import Environment, FileSystemLoader
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from VacancyPartitions import list_partitions, prune_partitions, read_partition, published_year
+from CurrencyRates import RateMatrix
+from ResultCache import ResultCache, get_fingerprint
+
+AREA_COLUMNS = ['salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at']
+
+
 def sort_dict_area(unsorted_dict: Dict[Any, Any]) -> Dict[Any, Any]:
     """
     Метод для сортировки словаря по городам вакансии
@@ -56,37 +65,16 @@ class ValuteConverter:
         """
         Создает .csv файл с обработанными вакансиями, у которых зарплата переведена по курсу валют
         """
-        self.df.insert(1, 'salary', None)
-        self.df['salary'] = self.df[['salary_from', 'salary_to', 'salary_currency', 'published_at']]\
-                                                        .apply(self.get_salary, axis=1)
+        salary, valid = RateMatrix(self.currency_df, self.currencies).convert(self.df['salary_from'],
+                                                                              self.df['salary_to'],
+                                                                              self.df['salary_currency'],
+                                                                              self.df['published_at'])
+        self.df.insert(1, 'salary', salary)
         self.df.drop(labels=['salary_to', 'salary_from', 'salary_currency'], axis=1, inplace=True)
-        self.df = self.df.loc[self.df['salary'] != 'nan']
+        self.df = self.df.loc[valid]
         self.df.to_csv(f'converted_vacancies.csv', index=False)
         return self.df
 
-    def get_salary(self, row) -> (str or float):
-        """
-        Возвращает значение зарплаты по вакансии, переведенное в рубли по курсу валют. В случае недопустимых значений,
-        возвращает 'nan' и останавливает функцию.
-
-        :param row: Строка из DataFrame - рассматриваемая вакансия (ее строка)
-        :return: Возвращает значение зарплаты или 'nan' при несоблюдении условий конвертации и обработки вакансии
-        """
-        salary_currency = str(row[2])
-        salary_list = list(filter(lambda x: str(x) != 'nan', row[:2]))
-        if salary_currency == 'nan':
-            return 'nan'
-
-        if len(salary_list) != 0:
-            salary = mean(salary_list)
-        else:
-            return 'nan'
-
-        if salary_currency != 'RUR' and salary_currency in self.currencies:
-            multiplier = self.currency_df[self.currency_df['date'] == str(row[3])[:7]][salary_currency].iat[0]
-            salary *= multiplier
-        return salary
-
 
 class UserInput:
     """
@@ -96,7 +84,7 @@ class UserInput:
         """
         Инициализирует класс UserInput, в поля сохраняет пользовательские исходные данные
         """
-        self.file_name = input("Введите название файла: ")
+        self.file_name = input("Введите название файла (или каталога партиций): ")
         self.profession_name = input("Введите название профессии: ")
         self.area_name = input("Введите название региона: ")
 
@@ -209,32 +197,53 @@ class Report:
         plt.savefig("graph.png")
 
 
-if __name__ == '__main__':
-    inputs = UserInput()
-    file_name, profession_name, area_name = inputs.file_name, inputs.profession_name, inputs.area_name
-    df = pd.read_csv(file_name)
+def get_statistics(file_name: str, profession_name: str, area_name: str) -> List[Dict[Any, Any]]:
+    """
+    Рассчитывает статистику по вакансиям из .csv файла или каталога партиций
+
+    :param file_name: Имя .csv файла или каталога партиций
+    :param profession_name: Название профессии
+    :param area_name: Название региона
+    :return: Возвращает словари: уровень зарплат и доля вакансий по городам, уровень зарплат и количество
+    вакансий по годам для выбранной профессии и региона
+    """
+    if os.path.isdir(file_name):
+        matching_partitions = set(prune_partitions(file_name, profession_name, area_name))
+        df = pd.concat([read_partition(path, AREA_COLUMNS + ['name'] if path in matching_partitions else AREA_COLUMNS)
+                        for path in list_partitions(file_name)], ignore_index=True)
+    else:
+        df = pd.read_csv(file_name, usecols=AREA_COLUMNS + ['name'])
     df_currency = pd.read_csv("currency.csv")
 
-    df["years"] = df["published_at"].apply(lambda date: int(".".join(date[:4].split("-"))))
-    years = list(df["years"].unique())
+    df["years"] = published_year(df["published_at"])
     salary_area, vacancy_area, profession_vacancy_salary, profession_vacancy_count = {}, {}, {}, {}
 
     df = ValuteConverter(df, df_currency).csv_create()
 
     vacancies_count = len(df)
-    df["count"] = df.groupby("area_name")['area_name'].transform("count")
-    df_splitted = df[df['count'] >= 0.01 * vacancies_count]
-    for city in list(df_splitted["area_name"].unique()):
-        df_salary = df_splitted[df_splitted['area_name'] == city]
-        salary_area[city] = int(df_salary['salary'].mean())
-        vacancy_area[city] = round(len(df_salary) / len(df), 4)
-
-    df_vacancy = df[df["name"].str.contains(profession_name)]
-    for year in years:
-        df_vacancy_salary = df_vacancy[(df_vacancy['years'] == year) & (df_vacancy['area_name'] == area_name)]
-        if not df_vacancy_salary.empty:
-            profession_vacancy_salary[year] = int(df_vacancy_salary['salary'].mean())
-            profession_vacancy_count[year] = len(df_vacancy_salary)
+    area_stats = df.groupby("area_name", observed=True)['salary'].agg(['mean', 'size'])
+    area_stats = area_stats[area_stats['size'] >= 0.01 * vacancies_count]
+    for city, row in area_stats.iterrows():
+        salary_area[city] = int(row['mean'])
+        vacancy_area[city] = round(row['size'] / vacancies_count, 4)
+
+    df_vacancy = df[df['area_name'] == area_name]
+    df_vacancy = df_vacancy[df_vacancy["name"].str.contains(profession_name, regex=False, na=False)]
+    year_stats = df_vacancy.groupby('years')['salary'].agg(['mean', 'size'])
+    for year, row in year_stats.iterrows():
+        profession_vacancy_salary[year] = int(row['mean'])
+        profession_vacancy_count[year] = int(row['size'])
+    return [salary_area, vacancy_area, profession_vacancy_salary, profession_vacancy_count]
+
+
+if __name__ == '__main__':
+    inputs = UserInput()
+    file_name, profession_name, area_name = inputs.file_name, inputs.profession_name, inputs.area_name
+    with ResultCache() as cache:
+        salary_area, vacancy_area, profession_vacancy_salary, profession_vacancy_count = cache.get_or_compute(
+            f'area_year_statistics:{os.path.abspath(file_name)}', profession_name, area_name,
+            get_fingerprint(file_name, 'currency.csv'),
+            lambda: get_statistics(file_name, profession_name, area_name))
 
     print("Уровень зарплат по городам (в порядке убывания):", sort_dict_area(salary_area))
     print("Доля вакансий по городам (в порядке убывания):", sort_dict_area(vacancy_area))
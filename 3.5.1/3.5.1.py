@@ -1,19 +1,21 @@
+import os
+import sys
+
 import pandas as pd
-import sqlite3
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from VacancyDatabase import load_currency
 
 
 def convert_csv_to_sql(file_name: str, db_name: str) -> None:
     """
-    Создает базу данных на основе .csv файла
+    Создает базу данных на основе .csv файла с курсами валют. Курсы хранятся в таблице currency
+    в виде (месяц, валюта, курс) с первичным ключом (date, code), загрузка выполняется одной транзакцией
 
     :param file_name: Имя исходного .csv файла
     :param db_name: Имя базы данных sqlite
     """
-    df = pd.read_csv(file_name)
-    connect = sqlite3.connect(db_name)
-    cursor = connect.cursor()
-    df.to_sql(name=db_name, con=connect, if_exists='replace', index=False)
-    connect.commit()
+    load_currency(db_name, pd.read_csv(file_name))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,354 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import date
+from typing import List, Dict, Optional, Set, Tuple
+from xml.etree import ElementTree
+
+import aiohttp
+import pandas as pd
+
+from CurrencyRates import read_rate_table, insert_rates
+
+
+CBR_URL = 'http://www.cbr.ru/scripts/XML_daily.asp'
+CACHE_DIR = 'cbr_cache'
+MAX_CONCURRENCY = 8
+RETRIES = 3
+TIMEOUT = 10
+BACKOFF = 0.5
+FETCHED_TABLE = 'currency_fetched'
+
+
+class ResponseCache:
+    """
+    Класс для представления дискового кэша ответов сервера. Ответы хранятся по хэшу содержимого (sha256),
+    индекс сопоставляет адрес запроса с хэшем ответа
+
+    Attributes:
+        directory (str): Каталог кэша
+        index (Dict[str, str]): Словарь в виде {адрес запроса: хэш ответа}
+    """
+    def __init__(self, directory: str = CACHE_DIR):
+        """
+        Инициализирует объект ResponseCache, загружает индекс кэша
+
+        :param directory: Каталог кэша
+        """
+        self.directory = directory
+        os.makedirs(os.path.join(directory, 'objects'), exist_ok=True)
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding='utf-8') as file:
+                self.index = json.load(file)
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.directory, 'index.json')
+
+    def get_object_path(self, digest: str) -> str:
+        """
+        Определяет путь к файлу ответа по его хэшу
+
+        :param digest: Хэш содержимого ответа
+        :return: Возвращает путь к файлу ответа
+        """
+        return os.path.join(self.directory, 'objects', digest[:2], digest[2:])
+
+    def get(self, url: str) -> Optional[bytes]:
+        """
+        Возвращает сохраненный ответ на запрос
+
+        :param url: Адрес запроса
+        :return: Возвращает содержимое ответа или None, если ответа нет в кэше
+        """
+        digest = self.index.get(url)
+        if digest is None or not os.path.exists(self.get_object_path(digest)):
+            return None
+        with open(self.get_object_path(digest), mode='rb') as file:
+            return file.read()
+
+    def put(self, url: str, content: bytes) -> str:
+        """
+        Сохраняет ответ на запрос. Одинаковые ответы хранятся в одном файле
+
+        :param url: Адрес запроса
+        :param content: Содержимое ответа
+        :return: Возвращает хэш содержимого ответа
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.get_object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(f'{path}.tmp', mode='wb') as file:
+                file.write(content)
+            os.replace(f'{path}.tmp', path)
+        self.index[url] = digest
+        return digest
+
+    def save(self) -> None:
+        """
+        Сохраняет индекс кэша на диск
+        """
+        with open(f'{self.index_path}.tmp', mode='w', encoding='utf-8') as file:
+            json.dump(self.index, file, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(f'{self.index_path}.tmp', self.index_path)
+
+
+def get_month_url(month: str, base_url: str = CBR_URL) -> str:
+    """
+    Формирует адрес запроса курсов валют на 28 число месяца
+
+    :param month: Месяц в формате ГГГГ-ММ
+    :param base_url: Адрес сервиса курсов валют
+    :return: Возвращает адрес запроса
+    """
+    return f'{base_url}?date_req=28/{month[5:7]}/{month[:4]}'
+
+
+def is_past_month(month: str) -> bool:
+    """
+    Проверяет, что месяц завершился, и курсы на него больше не изменятся
+
+    :param month: Месяц в формате ГГГГ-ММ
+    :return: Возвращает True, если месяц раньше текущего
+    """
+    return month < date.today().strftime('%Y-%m')
+
+
+def parse_rates(content: bytes, currencies: List[str]) -> Dict[str, float]:
+    """
+    Извлекает курсы валют из XML-ответа сервиса
+
+    :param content: Содержимое ответа
+    :param currencies: Список рассматриваемых валют
+    :return: Возвращает словарь в виде {валюта: курс за единицу валюты}
+    """
+    rates = {}
+    for valute in ElementTree.fromstring(content).findall('./Valute'):
+        code = valute.find('./CharCode').text
+        if code in currencies:
+            rates[code] = round(float(valute.find('./Value').text.replace(',', '.')) /
+                                int(valute.find('./Nominal').text), 4)
+    return rates
+
+
+async def fetch_month(session: aiohttp.ClientSession,
+                      semaphore: asyncio.Semaphore,
+                      url: str,
+                      retries: int = RETRIES,
+                      backoff: float = BACKOFF) -> bytes:
+    """
+    Выполняет запрос с ограничением числа одновременных запросов и повторными попытками при ошибках сети,
+    превышении времени ожидания и ответах 5xx
+
+    :param session: Сессия aiohttp с общим пулом соединений
+    :param semaphore: Семафор, ограничивающий число одновременных запросов
+    :param url: Адрес запроса
+    :param retries: Количество попыток
+    :param backoff: Начальная задержка между попытками в секундах (удваивается после каждой попытки)
+    :return: Возвращает содержимое ответа
+    """
+    for attempt in range(retries):
+        try:
+            async with semaphore:
+                async with session.get(url) as response:
+                    if response.status < 500:
+                        response.raise_for_status()
+                        return await response.read()
+                    error = aiohttp.ClientResponseError(response.request_info, response.history,
+                                                        status=response.status)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as exception:
+            error = exception
+        if attempt < retries - 1:
+            await asyncio.sleep(backoff * 2 ** attempt)
+    raise error
+
+
+async def fetch_months(months: List[str],
+                       base_url: str = CBR_URL,
+                       cache: ResponseCache = None,
+                       max_concurrency: int = MAX_CONCURRENCY,
+                       retries: int = RETRIES,
+                       timeout: float = TIMEOUT) -> Dict[str, bytes]:
+    """
+    Загружает ответы сервиса курсов валют за несколько месяцев параллельно. Ответы за завершившиеся месяцы
+    берутся из кэша и сохраняются в него
+
+    :param months: Список месяцев в формате ГГГГ-ММ
+    :param base_url: Адрес сервиса курсов валют
+    :param cache: Кэш ответов (по умолчанию - без кэша)
+    :param max_concurrency: Максимальное число одновременных запросов
+    :param retries: Количество попыток запроса
+    :param timeout: Время ожидания ответа на один запрос в секундах
+    :return: Возвращает словарь в виде {месяц: содержимое ответа}
+    """
+    responses = {}
+    urls = {}
+    for month in months:
+        url = get_month_url(month, base_url)
+        content = cache.get(url) if cache is not None and is_past_month(month) else None
+        if content is None:
+            urls[month] = url
+        else:
+            responses[month] = content
+    if urls:
+        semaphore = asyncio.Semaphore(max_concurrency)
+        connector = aiohttp.TCPConnector(limit=max_concurrency)
+        async with aiohttp.ClientSession(connector=connector,
+                                         timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+            contents = await asyncio.gather(*[fetch_month(session, semaphore, url, retries)
+                                              for url in urls.values()])
+        for (month, url), content in zip(urls.items(), contents):
+            responses[month] = content
+            if cache is not None and is_past_month(month):
+                cache.put(url, content)
+        if cache is not None:
+            cache.save()
+    return responses
+
+
+def fetch_currency_frame(months: List[str],
+                         currencies: List[str],
+                         base_url: str = CBR_URL,
+                         cache_dir: Optional[str] = CACHE_DIR,
+                         max_concurrency: int = MAX_CONCURRENCY) -> pd.DataFrame:
+    """
+    Формирует фрейм курсов валют за несколько месяцев одним построением в конце загрузки
+
+    :param months: Список месяцев в формате ГГГГ-ММ
+    :param currencies: Список рассматриваемых валют
+    :param base_url: Адрес сервиса курсов валют
+    :param cache_dir: Каталог кэша ответов (None - без кэша)
+    :param max_concurrency: Максимальное число одновременных запросов
+    :return: Возвращает фрейм со столбцом date и столбцами валют в алфавитном порядке,
+    отсутствующие курсы равны NaN
+    """
+    cache = ResponseCache(cache_dir) if cache_dir is not None else None
+    responses = asyncio.run(fetch_months(months, base_url, cache, max_concurrency))
+    currencies = sorted(currencies)
+    rows = []
+    for month in months:
+        rates = parse_rates(responses[month], currencies)
+        rows.append([month] + [rates.get(currency) for currency in currencies])
+    return pd.DataFrame(rows, columns=['date'] + currencies).astype({currency: float for currency in currencies})
+
+
+def read_currency_table(file_name: str) -> pd.DataFrame:
+    """
+    Загружает сохраненную таблицу курсов валют из .csv файла или из базы данных sqlite
+
+    :param file_name: Имя .csv файла или файла БД
+    :return: Возвращает фрейм со столбцом date и столбцами валют (пустой фрейм, если файла нет)
+    """
+    if not os.path.exists(file_name):
+        return pd.DataFrame(columns=['date'])
+    if file_name.endswith('.csv'):
+        return pd.read_csv(file_name, dtype={'date': str})
+    connect = sqlite3.connect(file_name)
+    try:
+        return read_rate_table(connect)
+    finally:
+        connect.close()
+
+
+def get_fetched_path(file_name: str) -> str:
+    return f'{os.path.splitext(file_name)[0]}.fetched.csv'
+
+
+def read_fetched(file_name: str) -> Set[Tuple[str, str]]:
+    """
+    Загружает отметки о загруженных парах (месяц, валюта). Для .csv таблицы курсов отметки хранятся в соседнем
+    файле [имя].fetched.csv, для базы данных sqlite - в таблице currency_fetched
+
+    :param file_name: Имя .csv файла или файла БД
+    :return: Возвращает множество пар (месяц, валюта), которые уже загружались
+    """
+    if file_name.endswith('.csv'):
+        path = get_fetched_path(file_name)
+        if not os.path.exists(path):
+            return set()
+        fetched = pd.read_csv(path, dtype=str)
+        return set(zip(fetched['date'], fetched['code']))
+    if not os.path.exists(file_name):
+        return set()
+    connect = sqlite3.connect(file_name)
+    try:
+        create_fetched_table(connect)
+        return set(connect.execute(f'SELECT date, code FROM {FETCHED_TABLE}').fetchall())
+    finally:
+        connect.close()
+
+
+def create_fetched_table(connect: sqlite3.Connection) -> None:
+    connect.execute(f'CREATE TABLE IF NOT EXISTS {FETCHED_TABLE} (date TEXT NOT NULL, code TEXT NOT NULL, '
+                    f'PRIMARY KEY (date, code)) WITHOUT ROWID')
+
+
+def get_missing_months(currency_df: pd.DataFrame,
+                       months: List[str],
+                       currencies: List[str],
+                       fetched: Set[Tuple[str, str]] = frozenset()) -> List[str]:
+    """
+    Определяет месяцы, для которых нет курса хотя бы одной из рассматриваемых валют и эта валюта за этот месяц
+    еще не загружалась. Курс, которого не было в ответе сервиса (например, BYR после деноминации), не считается
+    недостающим. Текущий и будущие месяцы загружаются всегда: их курс еще может измениться
+
+    :param currency_df: Фрейм с курсами валют
+    :param months: Список месяцев в формате ГГГГ-ММ
+    :param currencies: Список рассматриваемых валют
+    :param fetched: Множество уже загруженных пар (месяц, валюта)
+    :return: Возвращает список месяцев, которые нужно загрузить
+    """
+    table = currency_df.set_index('date').reindex(index=months, columns=currencies)
+    return [month for month, row in zip(table.index, table.isna().to_numpy())
+            if not is_past_month(month) or
+            any(missing and (month, currency) not in fetched for currency, missing in zip(currencies, row))]
+
+
+def update_currency_table(file_name: str,
+                          months: List[str],
+                          currencies: List[str],
+                          base_url: str = CBR_URL,
+                          cache_dir: Optional[str] = CACHE_DIR,
+                          max_concurrency: int = MAX_CONCURRENCY) -> pd.DataFrame:
+    """
+    Дополняет сохраненную таблицу курсов валют: загружаются только месяцы с недостающими парами (месяц, валюта),
+    которые еще не загружались, и текущий месяц. Загруженные курсы добавляются к таблице или заменяют прежние
+    значения, отметки о загрузке сохраняются только для прошедших месяцев.
+    Таблица хранится в .csv файле или в таблице currency базы данных sqlite вместе с отметками о загруженных парах
+
+    :param file_name: Имя .csv файла или файла БД
+    :param months: Список месяцев в формате ГГГГ-ММ
+    :param currencies: Список рассматриваемых валют
+    :param base_url: Адрес сервиса курсов валют
+    :param cache_dir: Каталог кэша ответов (None - без кэша)
+    :param max_concurrency: Максимальное число одновременных запросов
+    :return: Возвращает обновленный фрейм курсов валют
+    """
+    currency_df = read_currency_table(file_name)
+    fetched_pairs = read_fetched(file_name)
+    missing_months = get_missing_months(currency_df, months, currencies, fetched_pairs)
+    if not missing_months:
+        return currency_df
+    fetched = fetch_currency_frame(missing_months, currencies, base_url, cache_dir, max_concurrency)
+    new_pairs = sorted({(month, currency) for month in missing_months if is_past_month(month)
+                        for currency in currencies} - fetched_pairs)
+    if not file_name.endswith('.csv'):
+        connect = sqlite3.connect(file_name)
+        try:
+            insert_rates(fetched, connect)
+            create_fetched_table(connect)
+            connect.executemany(f'INSERT OR IGNORE INTO {FETCHED_TABLE} (date, code) VALUES (?, ?)', new_pairs)
+            connect.commit()
+            return read_rate_table(connect)
+        finally:
+            connect.close()
+    currency_df = fetched.set_index('date').combine_first(currency_df.set_index('date'))
+    currency_df = currency_df[sorted(currency_df.columns)].sort_index().rename_axis('date').reset_index()
+    currency_df.to_csv(file_name, index=False)
+    pd.DataFrame(sorted(fetched_pairs.union(new_pairs)), columns=['date', 'code']) \
+        .to_csv(get_fetched_path(file_name), index=False)
+    return currency_df
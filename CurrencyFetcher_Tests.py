@@ -0,0 +1,142 @@
+import asyncio
+import math
+import os
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from datetime import date
+from unittest import TestCase, mock
+from urllib.parse import urlparse, parse_qs
+
+import CurrencyFetcher
+from CurrencyFetcher import ResponseCache
+from CurrencyFetcher import parse_rates
+from CurrencyFetcher import fetch_months
+from CurrencyFetcher import fetch_currency_frame
+from CurrencyFetcher import update_currency_table
+
+
+RESPONSE = """<?xml version="1.0" encoding="windows-1251"?>
+<ValCurs Date="28.{month}.{year}" name="Foreign Currency Market">
+<Valute ID="R01235"><NumCode>840</NumCode><CharCode>USD</CharCode><Nominal>1</Nominal><Name>Доллар США</Name>
+<Value>{usd},5000</Value></Valute>
+<Valute ID="R01335"><NumCode>398</NumCode><CharCode>KZT</CharCode><Nominal>100</Nominal><Name>Тенге</Name>
+<Value>20,5100</Value></Valute>
+</ValCurs>"""
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if self.server.failures > 0:
+            self.server.failures -= 1
+            self.send_response(503)
+            self.end_headers()
+            return
+        day, month, year = parse_qs(urlparse(self.path).query)['date_req'][0].split('/')
+        content = RESPONSE.format(month=month, year=year, usd=int(month) + 30).encode('windows-1251')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/xml')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class CurrencyFetcherTests(TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        self.server.requests = []
+        self.server.failures = 0
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f'http://127.0.0.1:{self.server.server_port}/scripts/XML_daily.asp'
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.directory.cleanup()
+
+    def test_parse_rates(self):
+        content = RESPONSE.format(month='01', year='2020', usd=31).encode('windows-1251')
+        self.assertEqual(parse_rates(content, ['USD', 'KZT', 'EUR']), {'USD': 31.5, 'KZT': 0.2051})
+
+    def test_fetch_currency_frame(self):
+        df = fetch_currency_frame(['2020-01', '2020-02', '2020-03'], ['USD', 'EUR'], base_url=self.url,
+                                  cache_dir=None)
+        self.assertEqual(list(df.columns), ['date', 'EUR', 'USD'])
+        self.assertEqual(df['USD'].tolist(), [31.5, 32.5, 33.5])
+        self.assertTrue(all(math.isnan(value) for value in df['EUR']))
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_fetch_cache(self):
+        months = ['2020-01', '2020-02']
+        fetch_currency_frame(months, ['USD'], base_url=self.url, cache_dir=self.directory.name)
+        df = fetch_currency_frame(months, ['USD'], base_url=self.url, cache_dir=self.directory.name)
+        self.assertEqual(df['USD'].tolist(), [31.5, 32.5])
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(len(ResponseCache(self.directory.name).index), 2)
+
+    def test_fetch_retry(self):
+        self.server.failures = 2
+        responses = asyncio.run(fetch_months(['2020-01'], base_url=self.url, retries=3))
+        self.assertIn(b'USD', responses['2020-01'])
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_update_currency_csv(self):
+        file_name = os.path.join(self.directory.name, 'currency.csv')
+        with open(file_name, mode='w') as file:
+            file.write('date,USD\n2020-01,31.5\n2020-02,\n')
+        df = update_currency_table(file_name, ['2020-01', '2020-02', '2020-03'], ['USD'], base_url=self.url,
+                                   cache_dir=None)
+        self.assertEqual(df['date'].tolist(), ['2020-01', '2020-02', '2020-03'])
+        self.assertEqual(df['USD'].tolist(), [31.5, 32.5, 33.5])
+        self.assertEqual(len(self.server.requests), 2)
+        update_currency_table(file_name, ['2020-01', '2020-02', '2020-03'], ['USD'], base_url=self.url,
+                              cache_dir=None)
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_update_currency_absent_quote(self):
+        file_name = os.path.join(self.directory.name, 'currency.csv')
+        months = ['2020-01', '2020-02']
+        df = update_currency_table(file_name, months, ['USD', 'EUR'], base_url=self.url, cache_dir=None)
+        self.assertTrue(df['EUR'].isna().all())
+        self.assertEqual(len(self.server.requests), 2)
+        update_currency_table(file_name, months, ['USD', 'EUR'], base_url=self.url, cache_dir=None)
+        self.assertEqual(len(self.server.requests), 2)
+        update_currency_table(file_name, months, ['USD', 'EUR', 'KZT'], base_url=self.url, cache_dir=None)
+        self.assertEqual(len(self.server.requests), 4)
+
+    def test_update_currency_database(self):
+        file_name = os.path.join(self.directory.name, 'db.sqlite')
+        update_currency_table(file_name, ['2020-01'], ['USD'], base_url=self.url, cache_dir=None)
+        df = update_currency_table(file_name, ['2020-01', '2020-02'], ['USD', 'KZT'], base_url=self.url,
+                                   cache_dir=None)
+        self.assertEqual(df['KZT'].tolist(), [0.2051, 0.2051])
+        self.assertEqual(df['USD'].tolist(), [31.5, 32.5])
+        self.assertEqual(len(self.server.requests), 3)
+        update_currency_table(file_name, ['2020-01', '2020-02'], ['USD', 'KZT', 'EUR'], base_url=self.url,
+                              cache_dir=None)
+        self.assertEqual(len(self.server.requests), 5)
+        update_currency_table(file_name, ['2020-01', '2020-02'], ['USD', 'KZT', 'EUR'], base_url=self.url,
+                              cache_dir=None)
+        self.assertEqual(len(self.server.requests), 5)
+
+    def test_update_currency_current_month(self):
+        file_name = os.path.join(self.directory.name, 'currency.csv')
+        with open(file_name, mode='w') as file:
+            file.write('date,USD\n2020-01,31.5\n2020-02,99.0\n')
+        with open(os.path.join(self.directory.name, 'currency.fetched.csv'), mode='w') as file:
+            file.write('date,code\n2020-01,USD\n')
+        with mock.patch.object(CurrencyFetcher, 'date') as fake_date:
+            fake_date.today.return_value = date(2020, 2, 15)
+            df = update_currency_table(file_name, ['2020-01', '2020-02'], ['USD'], base_url=self.url,
+                                       cache_dir=None)
+            self.assertEqual(df['USD'].tolist(), [31.5, 32.5])
+            self.assertEqual(len(self.server.requests), 1)
+            self.assertNotIn(('2020-02', 'USD'), CurrencyFetcher.read_fetched(file_name))
+            update_currency_table(file_name, ['2020-01', '2020-02'], ['USD'], base_url=self.url, cache_dir=None)
+            self.assertEqual(len(self.server.requests), 2)
@@ -0,0 +1,295 @@
+import os
+import sqlite3
+from functools import lru_cache
+from typing import List, Tuple, Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+CURRENCY_TABLE = 'currency'
+RATE_FILES = (os.path.join(os.path.dirname(os.path.abspath(__file__)), '3.5.1', 'currency.csv'),
+              os.path.join(os.path.dirname(os.path.abspath(__file__)), '3.3.1-3.3.3', 'currency.csv'))
+DEFAULT_RATES = {
+    "AZN": 35.68,
+    "BYR": 23.91,
+    "EUR": 59.90,
+    "GEL": 21.74,
+    "KGS": 0.76,
+    "KZT": 0.13,
+    "RUR": 1,
+    "UAH": 1.64,
+    "USD": 60.66,
+    "UZS": 0.0055
+}
+
+
+def published_month(published_at: pd.Series) -> pd.Series:
+    """
+    Извлекает месяц публикации вакансий в формате ГГГГ-ММ из столбца дат в строковом (csv) или datetime (npy)
+    представлении
+
+    :param published_at: Столбец дат публикации
+    :return: Возвращает столбец месяцев публикации
+    """
+    if pd.api.types.is_datetime64_any_dtype(published_at):
+        return published_at.dt.strftime('%Y-%m')
+    return published_at.astype(str).str[:7]
+
+
+def profile_currencies(salary_currency: pd.Series,
+                       published_at: pd.Series) -> Tuple[Dict[str, int], Dict[str, Tuple[str, str]]]:
+    """
+    Выполняет профилирование валют вакансий за один проход без сортировки фрейма
+
+    :param salary_currency: Столбец валют зарплат
+    :param published_at: Столбец дат публикации в формате ISO 8601
+    :return: Возвращает словарь частотности валют в порядке первого появления и словарь в виде
+    {валюта: (дата первой публикации, дата последней публикации)}
+    """
+    currencies = salary_currency.dropna().astype(str)
+    counts = currencies.value_counts(sort=False)
+    dates = published_at.astype(str)[currencies.index].groupby(currencies, sort=False).agg(['min', 'max'])
+    return ({currency: int(count) for currency, count in counts.items()},
+            {currency: (row['min'], row['max']) for currency, row in dates.iterrows()})
+
+
+class RateMatrix:
+    """
+    Класс для представления таблицы курсов валют в виде матрицы (месяц × валюта) для векторной конвертации зарплат
+
+    Attributes:
+        months (Index): Месяцы таблицы курсов в формате ГГГГ-ММ, номер месяца - номер строки матрицы
+        currencies (Index): Конвертируемые валюты, номер валюты - номер столбца матрицы
+        rates (ndarray): Матрица курсов валют, отсутствующие курсы равны NaN
+    """
+    def __init__(self, currency_df: pd.DataFrame, currencies: List[str]):
+        """
+        Инициализирует класс RateMatrix. При повторе месяца в таблице курсов используется первая строка
+
+        :param currency_df: Фрейм с курсами валют, в столбце date - месяц в формате ГГГГ-ММ
+        :param currencies: Конвертируемые валюты (столбцы фрейма курсов)
+        """
+        months = currency_df['date'].astype(str).str[:7]
+        first_rows = ~months.duplicated().to_numpy()
+        self.months = pd.Index(months[first_rows])
+        self.currencies = pd.Index([currency for currency in currencies if currency != 'RUR'])
+        self.rates = currency_df.loc[first_rows, list(self.currencies)].apply(pd.to_numeric, errors='coerce') \
+            .to_numpy(dtype=np.float64).reshape(len(self.months), len(self.currencies))
+
+    def get_rates(self, salary_currency: pd.Series, published_at: pd.Series) -> np.ndarray:
+        """
+        Определяет курс валюты для каждой вакансии одной выборкой из матрицы
+
+        :param salary_currency: Столбец валют зарплат
+        :param published_at: Столбец дат публикации
+        :return: Возвращает массив курсов: 1 для неконвертируемых валют, NaN при отсутствии курса на месяц публикации
+        """
+        currency_codes = self.currencies.get_indexer(salary_currency.astype(object))
+        month_codes = self.months.get_indexer(published_month(published_at))
+        rates = np.ones(len(salary_currency))
+        converted = currency_codes >= 0
+        rates[converted] = np.nan
+        found = converted & (month_codes >= 0)
+        rates[found] = self.rates[month_codes[found], currency_codes[found]]
+        return rates
+
+    def convert(self,
+                salary_from: pd.Series,
+                salary_to: pd.Series,
+                salary_currency: pd.Series,
+                published_at: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Переводит зарплаты вакансий в рубли: зарплата - среднее непустых границ, умноженное на курс валюты
+        на месяц публикации
+
+        :param salary_from: Столбец нижних границ оклада
+        :param salary_to: Столбец верхних границ оклада
+        :param salary_currency: Столбец валют зарплат
+        :param published_at: Столбец дат публикации
+        :return: Возвращает массив зарплат в рублях (NaN при отсутствии курса) и маску вакансий, у которых указаны
+        валюта и хотя бы одна граница оклада
+        """
+        bounds = np.column_stack([pd.to_numeric(salary_from, errors='coerce').to_numpy(dtype=np.float64),
+                                  pd.to_numeric(salary_to, errors='coerce').to_numpy(dtype=np.float64)])
+        bounds_count = np.count_nonzero(~np.isnan(bounds), axis=1)
+        salary = np.full(len(bounds), np.nan)
+        np.divide(np.nansum(bounds, axis=1), bounds_count, out=salary, where=bounds_count > 0)
+        valid = salary_currency.notna().to_numpy() & (bounds_count > 0)
+        return salary * self.get_rates(salary_currency, published_at), valid
+
+
+def create_rate_table(connect: sqlite3.Connection) -> None:
+    """
+    Создает таблицу курсов валют (месяц, валюта, курс) с первичным ключом (date, code), если ее нет
+
+    :param connect: Подключение к БД sqlite
+    """
+    connect.execute(f'CREATE TABLE IF NOT EXISTS {CURRENCY_TABLE} (date TEXT NOT NULL, code TEXT NOT NULL, '
+                    f'rate REAL NOT NULL, PRIMARY KEY (date, code)) WITHOUT ROWID')
+
+
+def insert_rates(currency_df: pd.DataFrame, connect: sqlite3.Connection) -> int:
+    """
+    Добавляет курсы валют в таблицу курсов в текущей транзакции без ее завершения, существующие курсы
+    на те же (месяц, валюта) заменяются. Отсутствующие курсы не сохраняются
+
+    :param currency_df: Фрейм с курсами валют, в столбце date - месяц в формате ГГГГ-ММ, в остальных - валюты
+    :param connect: Подключение к БД sqlite
+    :return: Возвращает количество сохраненных курсов
+    """
+    rates = currency_df.melt(id_vars='date', var_name='code', value_name='rate').dropna(subset=['rate'])
+    create_rate_table(connect)
+    connect.executemany(f'INSERT INTO {CURRENCY_TABLE} (date, code, rate) VALUES (?, ?, ?) '
+                        f'ON CONFLICT (date, code) DO UPDATE SET rate = excluded.rate',
+                        rates[['date', 'code', 'rate']].itertuples(index=False, name=None))
+    return len(rates)
+
+
+def upsert_rates(currency_df: pd.DataFrame, connect: sqlite3.Connection) -> int:
+    """
+    Добавляет курсы валют в таблицу курсов и сохраняет изменения, существующие курсы на те же (месяц, валюта)
+    заменяются. Отсутствующие курсы не сохраняются
+
+    :param currency_df: Фрейм с курсами валют, в столбце date - месяц в формате ГГГГ-ММ, в остальных - валюты
+    :param connect: Подключение к БД sqlite
+    :return: Возвращает количество сохраненных курсов
+    """
+    count = insert_rates(currency_df, connect)
+    connect.commit()
+    return count
+
+
+def write_rate_table(currency_df: pd.DataFrame, connect: sqlite3.Connection) -> None:
+    """
+    Сохраняет курсы валют в БД в нормализованном виде (месяц, валюта, курс) с первичным ключом (date, code),
+    заменяя прежнюю таблицу курсов
+
+    :param currency_df: Фрейм с курсами валют, в столбце date - месяц в формате ГГГГ-ММ, в остальных - валюты
+    :param connect: Подключение к БД sqlite
+    """
+    connect.execute(f'DROP TABLE IF EXISTS {CURRENCY_TABLE}')
+    upsert_rates(currency_df, connect)
+
+
+def read_rate_table(connect: sqlite3.Connection) -> pd.DataFrame:
+    """
+    Загружает курсы валют из БД одним запросом
+
+    :param connect: Подключение к БД sqlite
+    :return: Возвращает фрейм с курсами валют: столбец date и по столбцу на каждую валюту
+    """
+    create_rate_table(connect)
+    rates = pd.read_sql(f'SELECT date, code, rate FROM {CURRENCY_TABLE} ORDER BY date', connect)
+    return rates.pivot(index='date', columns='code', values='rate').rename_axis(columns=None).reset_index()
+
+
+class RateProvider:
+    """
+    Класс для представления неизменяемого источника курсов валют по месяцам публикации. Курс валюты из таблицы
+    берется на месяц публикации, а при пропуске - на ближайший предыдущий месяц таблицы (до начала таблицы -
+    на первый месяц с курсом). Курсы по умолчанию используются только для валют, которых нет в таблице:
+    они могут быть в другом номинале (например, BYN вместо BYR)
+
+    Attributes:
+        months (Index): Месяцы таблицы курсов в формате ГГГГ-ММ в порядке возрастания
+        currencies (Index): Валюты, для которых известен курс
+        rates (ndarray): Матрица курсов (месяц × валюта) только для чтения, пропуски таблицы заполнены
+        предыдущими курсами, валюты вне таблицы - курсами по умолчанию
+        default_rates (ndarray): Курсы по умолчанию для каждой валюты только для чтения
+    """
+    def __init__(self, currency_df: pd.DataFrame = None, default_rates: Dict[str, float] = None):
+        """
+        Инициализирует класс RateProvider
+
+        :param currency_df: Фрейм с курсами валют, в столбце date - месяц в формате ГГГГ-ММ
+        (по умолчанию - только курсы по умолчанию)
+        :param default_rates: Словарь курсов по умолчанию в виде {валюта: курс}
+        """
+        default_rates = DEFAULT_RATES if default_rates is None else default_rates
+        if currency_df is None:
+            currency_df = pd.DataFrame(columns=['date'])
+        currency_df = currency_df.sort_values('date', kind='stable')
+        table_currencies = [currency for currency in currency_df.columns if currency != 'date']
+        self.currencies = pd.Index(list(default_rates) +
+                                   [currency for currency in table_currencies if currency not in default_rates])
+        self.default_rates = np.array([default_rates.get(currency, np.nan) for currency in self.currencies],
+                                      dtype=np.float64)
+        matrix = RateMatrix(currency_df, list(self.currencies.intersection(table_currencies, sort=False)))
+        self.months = matrix.months
+        self.rates = np.tile(self.default_rates, (max(len(self.months), 1), 1))
+        if len(matrix.currencies) > 0 and len(self.months) > 0:
+            columns = self.currencies.get_indexer(matrix.currencies)
+            table_rates = pd.DataFrame(matrix.rates).ffill().bfill().to_numpy()
+            self.rates[:, columns] = np.where(np.isnan(table_rates), self.rates[:, columns], table_rates)
+        if 'RUR' in self.currencies:
+            self.rates[:, self.currencies.get_loc('RUR')] = 1
+        self.rates.flags.writeable = False
+        self.default_rates.flags.writeable = False
+
+    @classmethod
+    def from_csv(cls, file_name: str):
+        """
+        Загружает курсы валют из .csv файла в формате date,BYR,EUR,...
+
+        :param file_name: Имя .csv файла с курсами валют
+        :return: Возвращает объект RateProvider
+        """
+        return cls(pd.read_csv(file_name))
+
+    @classmethod
+    def from_database(cls, db_name: str):
+        """
+        Загружает курсы валют из таблицы currency базы данных sqlite
+
+        :param db_name: Имя файла БД
+        :return: Возвращает объект RateProvider
+        """
+        connect = sqlite3.connect(db_name)
+        try:
+            return cls(read_rate_table(connect))
+        finally:
+            connect.close()
+
+    def lookup(self, months: Sequence[str], currencies: Sequence[str]) -> np.ndarray:
+        """
+        Определяет курсы валют для набора пар (месяц публикации, валюта) одной выборкой
+
+        :param months: Месяцы публикации в формате ГГГГ-ММ (допускается полная дата публикации)
+        :param currencies: Валюты
+        :return: Возвращает массив курсов валют той же длины
+        """
+        currency_codes = self.currencies.get_indexer(pd.Index(currencies, dtype=object))
+        if (currency_codes < 0).any():
+            raise KeyError(f'Нет курса валюты {currencies[int(np.argmax(currency_codes < 0))]}')
+        month_codes = self.months.searchsorted(pd.Index([month[:7] for month in months], dtype=object),
+                                               side='right') - 1
+        return self.rates[np.maximum(month_codes, 0), currency_codes]
+
+    def rate(self, month: str, currency: str) -> float:
+        """
+        Определяет курс одной валюты на месяц публикации
+
+        :param month: Месяц публикации в формате ГГГГ-ММ (допускается полная дата публикации)
+        :param currency: Валюта
+        :return: Возвращает курс валюты
+        """
+        return float(self.lookup([month], [currency])[0])
+
+
+@lru_cache(maxsize=None)
+def get_rate_provider(file_name: str = None) -> RateProvider:
+    """
+    Возвращает общий для модуля источник курсов валют, загружаемый один раз. По умолчанию используется первый
+    существующий файл из RATE_FILES (.csv или база данных sqlite), иначе - только курсы по умолчанию
+
+    :param file_name: Имя файла с курсами валют
+    :return: Возвращает объект RateProvider
+    """
+    if file_name is None:
+        file_name = next((path for path in RATE_FILES if os.path.exists(path)), None)
+        if file_name is None:
+            return RateProvider()
+    if file_name.endswith('.csv'):
+        return RateProvider.from_csv(file_name)
+    return RateProvider.from_database(file_name)
@@ -0,0 +1,103 @@
+import sqlite3
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from CurrencyRates import RateMatrix
+from CurrencyRates import published_month
+from CurrencyRates import write_rate_table
+from CurrencyRates import read_rate_table
+from CurrencyRates import RateProvider
+from CurrencyRates import profile_currencies
+
+
+CURRENCY = pd.DataFrame({'date': ['2022-01', '2022-02'],
+                         'BYR': [0.003, 0.003],
+                         'EUR': [87.0, None],
+                         'USD': [77.0, 78.0]})
+
+
+class RateMatrixTests(TestCase):
+    def setUp(self):
+        self.matrix = RateMatrix(CURRENCY, ['EUR', 'USD'])
+
+    def convert(self, salary_from, salary_to, salary_currency, published_at):
+        return self.matrix.convert(pd.Series(salary_from, dtype=float), pd.Series(salary_to, dtype=float),
+                                   pd.Series(salary_currency, dtype=object), pd.Series(published_at))
+
+    def test_convert_mean(self):
+        salary, valid = self.convert([100.0, np.nan], [200.0, 300.0], ['USD', 'RUR'],
+                                     ['2022-02-01T10:00:00+0300', '2022-01-01T10:00:00+0300'])
+        self.assertEqual(salary.tolist(), [150.0 * 78.0, 300.0])
+        self.assertEqual(valid.tolist(), [True, True])
+
+    def test_convert_invalid(self):
+        _, valid = self.convert([np.nan, 100.0], [np.nan, 200.0], ['RUR', None],
+                                ['2022-01-01T10:00:00+0300', '2022-01-01T10:00:00+0300'])
+        self.assertEqual(valid.tolist(), [False, False])
+
+    def test_convert_missing_rate(self):
+        salary, valid = self.convert([100.0, 100.0], [100.0, 100.0], ['EUR', 'USD'],
+                                     ['2022-02-01T10:00:00+0300', '2023-01-01T10:00:00+0300'])
+        self.assertTrue(np.isnan(salary).all())
+        self.assertEqual(valid.tolist(), [True, True])
+
+    def test_convert_unknown_currency(self):
+        salary, _ = self.convert([100.0], [100.0], ['BYR'], ['2022-01-01T10:00:00+0300'])
+        self.assertEqual(salary.tolist(), [100.0])
+
+    def test_published_month(self):
+        dates = pd.Series(pd.to_datetime(['2022-01-05', '2022-11-05']))
+        self.assertEqual(published_month(dates).tolist(), ['2022-01', '2022-11'])
+
+
+class RateTableTests(TestCase):
+    def test_rate_table_roundtrip(self):
+        connect = sqlite3.connect(':memory:')
+        write_rate_table(CURRENCY, connect)
+        self.assertEqual(connect.execute('SELECT COUNT(*) FROM currency').fetchone()[0], 5)
+        rates = read_rate_table(connect)
+        self.assertEqual(list(rates.columns), ['date', 'BYR', 'EUR', 'USD'])
+        self.assertTrue(np.isnan(rates.loc[1, 'EUR']))
+        self.assertEqual(rates.loc[1, 'USD'], 78.0)
+
+
+class RateProviderTests(TestCase):
+    def setUp(self):
+        self.provider = RateProvider(CURRENCY, {'RUR': 1, 'EUR': 60.0, 'USD': 61.0, 'KZT': 0.13})
+
+    def test_provider_lookup(self):
+        rates = self.provider.lookup(['2022-02-01T10:00:00+0300', '2022-02', '2021-12', '2022-01'],
+                                     ['USD', 'EUR', 'USD', 'KZT'])
+        self.assertEqual(rates.tolist(), [78.0, 87.0, 77.0, 0.13])
+
+    def test_provider_table_gap(self):
+        currency_df = pd.DataFrame({'date': ['2016-07', '2016-05', '2016-06'], 'BYR': [None, 0.0164, None]})
+        provider = RateProvider(currency_df, {'RUR': 1, 'BYR': 23.91, 'USD': 61.0})
+        rates = provider.lookup(['2016-04', '2016-06', '2016-07', '2017-01', '2017-01'],
+                                ['BYR', 'BYR', 'BYR', 'BYR', 'USD'])
+        self.assertEqual(rates.tolist(), [0.0164, 0.0164, 0.0164, 0.0164, 61.0])
+
+    def test_provider_defaults_only(self):
+        self.assertEqual(RateProvider(default_rates={'RUR': 1, 'USD': 61.0}).rate('2022-01', 'USD'), 61.0)
+
+    def test_provider_rur(self):
+        self.assertEqual(self.provider.rate('2022-01', 'RUR'), 1.0)
+
+    def test_provider_unknown_currency(self):
+        with self.assertRaises(KeyError):
+            self.provider.lookup(['2022-01'], ['AZN'])
+
+    def test_provider_immutable(self):
+        with self.assertRaises(ValueError):
+            self.provider.rates[0, 0] = 0
+
+
+class ProfileCurrenciesTests(TestCase):
+    def test_profile_currencies(self):
+        counts, dates = profile_currencies(pd.Series(['USD', 'RUR', None, 'USD']),
+                                           pd.Series(['2022-03-01T10:00:00+0300', '2022-01-01T10:00:00+0300',
+                                                      '2021-01-01T10:00:00+0300', '2022-02-01T10:00:00+0300']))
+        self.assertEqual(counts, {'USD': 2, 'RUR': 1})
+        self.assertEqual(dates['USD'], ('2022-02-01T10:00:00+0300', '2022-03-01T10:00:00+0300'))
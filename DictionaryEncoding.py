@@ -0,0 +1,170 @@
+import sys
+from array import array
+from typing import List, Dict, Iterable
+
+
+LOW_CARDINALITY_COLUMNS = ('area_name', 'salary_currency', 'experience_id', 'premium', 'salary_gross', 'employer_name')
+
+
+def intern_row(row: Dict[str, str], columns: Iterable[str] = LOW_CARDINALITY_COLUMNS) -> Dict[str, str]:
+    """
+    Заменяет значения столбцов с малым числом уникальных значений единственными экземплярами строк
+    без построения массивов кодов (для наборов данных, которые не фильтруются по кодам)
+
+    :param row: Словарь вакансии со всеми полями вакансии
+    :param columns: Названия столбцов, значения которых заменяются
+    :return: Возвращает словарь вакансии с общими для всех строк экземплярами значений
+    """
+    for name in columns:
+        if name in row:
+            row[name] = sys.intern(row[name])
+    return row
+
+
+class SymbolTable:
+    """
+    Класс для представления таблицы символов - взаимно однозначного соответствия строк и целочисленных кодов
+
+    Attributes:
+        symbols (List[str]): Список уникальных значений, индекс значения является его кодом
+        codes (Dict[str, int]): Словарь в виде {значение: код}
+    """
+
+    def __init__(self, symbols: Iterable[str] = ()):
+        """
+        Инициализирует объект SymbolTable
+
+        :param symbols: Начальный набор значений таблицы
+        """
+        self.symbols = []
+        self.codes = {}
+        for symbol in symbols:
+            self.encode(symbol)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def encode(self, value: str) -> int:
+        """
+        Возвращает код значения, добавляя значение в таблицу при его отсутствии
+
+        :param value: Строковое значение
+        :return: Возвращает целочисленный код значения
+        """
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.symbols)
+            self.symbols.append(value)
+            self.codes[value] = code
+        return code
+
+    def lookup(self, value: str) -> int:
+        """
+        Возвращает код значения без изменения таблицы
+
+        :param value: Строковое значение
+        :return: Возвращает код значения или -1, если значение в таблице отсутствует
+        """
+        return self.codes.get(value, -1)
+
+    def decode(self, code: int) -> str:
+        """
+        Возвращает значение по его коду
+
+        :param code: Целочисленный код значения
+        :return: Возвращает строковое значение
+        """
+        return self.symbols[code]
+
+
+class EncodedColumn:
+    """
+    Класс для представления столбца данных в словарной кодировке
+
+    Attributes:
+        symbol_table (SymbolTable): Таблица символов столбца
+        codes (array): Массив кодов значений столбца в порядке строк
+    """
+
+    def __init__(self):
+        """
+        Инициализирует объект EncodedColumn
+        """
+        self.symbol_table = SymbolTable()
+        self.codes = array('i')
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> str:
+        return self.symbol_table.symbols[self.codes[index]]
+
+    def append(self, value: str) -> str:
+        """
+        Добавляет значение в конец столбца
+
+        :param value: Строковое значение
+        :return: Возвращает единственный экземпляр строки из таблицы символов, равный значению
+        """
+        code = self.symbol_table.encode(value)
+        self.codes.append(code)
+        return self.symbol_table.symbols[code]
+
+    def equals(self, value: str) -> List[int]:
+        """
+        Выполняет фильтрацию строк столбца по равенству значению через сравнение целочисленных кодов
+
+        :param value: Искомое значение
+        :return: Возвращает список индексов строк, значение которых равно искомому
+        """
+        code = self.symbol_table.lookup(value)
+        if code == -1:
+            return []
+        return [index for index, row_code in enumerate(self.codes) if row_code == code]
+
+    def value_counts(self) -> Dict[str, int]:
+        """
+        Выполняет группировку строк столбца по значению через подсчет целочисленных кодов
+
+        :return: Возвращает словарь в виде {значение: количество строк}
+        """
+        counts = [0] * len(self.symbol_table)
+        for code in self.codes:
+            counts[code] += 1
+        return dict(zip(self.symbol_table.symbols, counts))
+
+
+class DictionaryEncoder:
+    """
+    Класс для словарного кодирования строк с малым числом уникальных значений
+
+    Attributes:
+        columns (Dict[str, EncodedColumn]): Словарь в виде {название столбца: закодированный столбец}
+    """
+
+    def __init__(self, list_naming: List[str], encoded_columns: Iterable[str] = LOW_CARDINALITY_COLUMNS):
+        """
+        Инициализирует объект DictionaryEncoder
+
+        :param list_naming: Заголовки файла
+        :param encoded_columns: Названия столбцов, подлежащих кодированию
+        """
+        self.columns = {name: EncodedColumn() for name in encoded_columns if name in list_naming}
+
+    def __contains__(self, column_name: str) -> bool:
+        return column_name in self.columns
+
+    def __getitem__(self, column_name: str) -> EncodedColumn:
+        return self.columns[column_name]
+
+    def encode_row(self, row: Dict[str, str]) -> Dict[str, str]:
+        """
+        Кодирует строку данных: сохраняет коды значений в столбцы и заменяет значения строки
+        единственными экземплярами строк из таблиц символов
+
+        :param row: Словарь вакансии со всеми полями вакансии
+        :return: Возвращает словарь вакансии с общими для всех строк экземплярами значений
+        """
+        for name, column in self.columns.items():
+            row[name] = column.append(row[name])
+        return row
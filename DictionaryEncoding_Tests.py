@@ -0,0 +1,67 @@
+from unittest import TestCase
+
+from DictionaryEncoding import SymbolTable
+from DictionaryEncoding import EncodedColumn
+from DictionaryEncoding import DictionaryEncoder
+from DictionaryEncoding import intern_row
+
+
+class SymbolTableTests(TestCase):
+    def test_symbol_table_encode(self):
+        table = SymbolTable()
+        self.assertEqual(table.encode('Москва'), 0)
+        self.assertEqual(table.encode('Казань'), 1)
+        self.assertEqual(table.encode('Москва'), 0)
+        self.assertEqual(len(table), 2)
+
+    def test_symbol_table_lookup(self):
+        table = SymbolTable(['RUR', 'USD'])
+        self.assertEqual(table.lookup('USD'), 1)
+        self.assertEqual(table.lookup('EUR'), -1)
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table.decode(0), 'RUR')
+
+
+class EncodedColumnTests(TestCase):
+    def test_encoded_column_append(self):
+        column = EncodedColumn()
+        first = column.append(''.join(['Моск', 'ва']))
+        second = column.append(''.join(['Мос', 'ква']))
+        self.assertIs(first, second)
+        self.assertEqual(list(column.codes), [0, 0])
+        self.assertEqual(column[1], 'Москва')
+
+    def test_encoded_column_equals(self):
+        column = EncodedColumn()
+        for value in ['RUR', 'USD', 'RUR', 'EUR']:
+            column.append(value)
+        self.assertEqual(column.equals('RUR'), [0, 2])
+        self.assertEqual(column.equals('KZT'), [])
+
+    def test_encoded_column_value_counts(self):
+        column = EncodedColumn()
+        for value in ['RUR', 'USD', 'RUR']:
+            column.append(value)
+        self.assertEqual(column.value_counts(), {'RUR': 2, 'USD': 1})
+
+
+class DictionaryEncoderTests(TestCase):
+    def test_encoder_columns(self):
+        encoder = DictionaryEncoder(['name', 'salary_currency', 'area_name'])
+        self.assertIn('area_name', encoder)
+        self.assertNotIn('name', encoder)
+        self.assertNotIn('premium', encoder)
+
+    def test_encoder_encode_row(self):
+        encoder = DictionaryEncoder(['name', 'area_name'])
+        row = encoder.encode_row({'name': 'Программист', 'area_name': 'Москва'})
+        self.assertEqual(row, {'name': 'Программист', 'area_name': 'Москва'})
+        self.assertEqual(list(encoder['area_name'].codes), [0])
+
+
+class InternRowTests(TestCase):
+    def test_intern_row(self):
+        first = intern_row({'name': 'Программист', 'area_name': ''.join(['Моск', 'ва'])})
+        second = intern_row({'name': 'Аналитик', 'area_name': ''.join(['Мос', 'ква'])})
+        self.assertIs(first['area_name'], second['area_name'])
+        self.assertEqual(first['name'], 'Программист')
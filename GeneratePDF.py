@@ -12,6 +12,9 @@ import doctest
 from jinja2 import Environment, PackageLoader, FileSystemLoader
 from typing import List, Dict, Tuple, Any
 from openpyxl.styles import NamedStyle, Border, Side, Font
+from DictionaryEncoding import intern_row
+from CurrencyRates import get_rate_provider, RATE_FILES
+from ResultCache import ResultCache, get_fingerprint
 
 
 class DataSet:
@@ -43,7 +46,12 @@ class DataSet:
         'Санктg-Петербург'
         """
         self.file_name = file_name
-        self.vacancies_objects = [Vacancy(vacancy) for vacancy in self.csv_filer(*self.csv_reader(file_name))]
+        list_naming, reader = self.csv_reader(file_name)
+        vacancies = self.csv_filer(list_naming, reader)
+        rates = get_rate_provider().lookup([vacancy['published_at'] for vacancy in vacancies],
+                                           [vacancy['salary_currency'] for vacancy in vacancies])
+        self.vacancies_objects = [Vacancy(intern_row(vacancy), rate)
+                                  for vacancy, rate in zip(vacancies, rates)]
 
     @staticmethod
     def __clean_html(raw_html: str) -> str:
@@ -95,18 +103,18 @@ class Vacancy:
     Класс для представления данных вакансии.
 
     Attributes:
-        __currency_to_rub (dict): Словарь перевода с валюты на рубли.
         name (str): Название вакансии.
         salary (int): Величина средней зарплаты по вакансии.
         area_name (str): Город вакансии.
         published_at (int): Год публикации вакансии.
     """
 
-    def __init__(self, vacancy: Dict):
+    def __init__(self, vacancy: Dict, rate: float = None):
         """
         Инициализирует объект Vacancy, выполняет преобразования полей.
 
         :param vacancy: Словарь вакансии со всеми полями вакансии.
+        :param rate: Курс валюты оклада на месяц публикации (по умолчанию определяется по общему источнику курсов).
 
         Tests
         -----
@@ -126,21 +134,10 @@ class Vacancy:
         >>>Vacancy(vacancies).published_at
         2012
         """
-        self.__currency_to_rub = {
-            "AZN": 35.68,
-            "BYR": 23.91,
-            "EUR": 59.90,
-            "GEL": 21.74,
-            "KGS": 0.76,
-            "KZT": 0.13,
-            "RUR": 1,
-            "UAH": 1.64,
-            "USD": 60.66,
-            "UZS": 0.0055
-        }
+        if rate is None:
+            rate = get_rate_provider().rate(vacancy['published_at'], vacancy['salary_currency'])
         self.name = vacancy['name']
-        self.salary = int((float(vacancy['salary_from']) + float(vacancy['salary_to'])) / 2 * self.__currency_to_rub[
-            vacancy['salary_currency']])
+        self.salary = int((float(vacancy['salary_from']) + float(vacancy['salary_to'])) / 2 * rate)
         self.area_name = vacancy['area_name']
         self.published_at = datetime_first_test(vacancy['published_at'])
 
@@ -361,6 +358,7 @@ class AnalysisResult:
     Attributes:
         dataset (DataSet): Набор данных по вакансиям
         profession_name (str): Название профессии
+        area_name (str): Название региона для статистики по профессии (None - без отбора по региону)
         year_salary (VacancySalaryDict): Словарь в виде {год: оклад}
         count_salary (VacancyCountDict): Словарь в виде {количество: оклад}
         job_year_salary (VacancySalaryDict): Словарь в виде {год: оклад} по указанной профессии
@@ -369,15 +367,17 @@ class AnalysisResult:
         city_count (VacancyCountDict): Словарь в виде {город: количество}
     """
 
-    def __init__(self, dataset: DataSet, profession_name: str):
+    def __init__(self, dataset: DataSet, profession_name: str, area_name: str = None):
         """
         Инициализирует объект AnalisysResult
 
         :param dataset: Набор данных по вакансиям
         :param profession_name: Название профессии
+        :param area_name: Название региона для статистики по профессии (None - без отбора по региону)
         """
         self.dataset = dataset
         self.profession_name = profession_name
+        self.area_name = area_name
         self.year_salary = VacancySalaryDict()
         self.count_salary = VacancyCountDict()
         self.job_year_salary = VacancySalaryDict()
@@ -396,7 +396,8 @@ class AnalysisResult:
             self.count_salary.add(key=vacancy.published_at)
             self.city_count.add(key=vacancy.area_name)
             self.city_salary.add(salary=vacancy.salary, year=vacancy.area_name)
-            if vacancy.name.__contains__(self.profession_name):
+            if vacancy.name.__contains__(self.profession_name) and \
+                    (self.area_name is None or vacancy.area_name == self.area_name):
                 self.job_count_salary.add(key=vacancy.published_at)
                 self.job_year_salary.add(salary=vacancy.salary, year=vacancy.published_at)
             else:
@@ -410,9 +411,9 @@ class AnalysisResult:
         self.city_salary.percent_add()
         return self
 
-    def print_result(self):
+    def get_report(self):
         """
-        Выполняет печать словарей
+        Формирует отчет по результатам анализа
 
         :return: Возвращает данные в виде объекта Report для дальнейшей конвертации в нужный формат представления данных
         """
@@ -424,12 +425,6 @@ class AnalysisResult:
             itertools.islice(sorted(self.city_salary.year_salary_dict.items(), key=lambda x: x[1], reverse=True), 10))
         city_count = tuple(
             itertools.islice(sorted(self.city_count.count_dict.items(), key=lambda x: x[1], reverse=True), 10))
-        print(f'Динамика уровня зарплат по годам: {year_salary}')
-        print(f'Динамика количества вакансий по годам: {count_salary}')
-        print(f'Динамика уровня зарплат по годам для выбранной профессии: {job_year_salary}')
-        print(f'Динамика количества вакансий по годам для выбранной профессии: {job_count_salary}')
-        print(f'Уровень зарплат по городам (в порядке убывания): {city_salary}')
-        print(f'Доля вакансий по городам (в порядке убывания): {dict(city_count)}')
         return Report(profession_name=self.profession_name,
                       year_salary=year_salary,
                       count_salary=count_salary,
@@ -438,6 +433,14 @@ class AnalysisResult:
                       city_salary=city_salary,
                       city_count=city_count)
 
+    def print_result(self):
+        """
+        Выполняет печать словарей
+
+        :return: Возвращает данные в виде объекта Report для дальнейшей конвертации в нужный формат представления данных
+        """
+        return self.get_report().print_result()
+
 
 class Report:
     """
@@ -481,6 +484,33 @@ class Report:
         self.city_salary = city_salary
         self.city_count = city_count
 
+    def print_result(self):
+        """
+        Выполняет печать словарей
+
+        :return: Возвращает объект Report
+        """
+        print(f'Динамика уровня зарплат по годам: {self.year_salary}')
+        print(f'Динамика количества вакансий по годам: {self.count_salary}')
+        print(f'Динамика уровня зарплат по годам для выбранной профессии: {self.job_year_salary}')
+        print(f'Динамика количества вакансий по годам для выбранной профессии: {self.job_count_salary}')
+        print(f'Уровень зарплат по городам (в порядке убывания): {self.city_salary}')
+        print(f'Доля вакансий по городам (в порядке убывания): {dict(self.city_count)}')
+        return self
+
+    def get_statistics(self) -> Dict[str, Dict]:
+        """
+        Собирает словари отчета под названиями статистик VacancyStatistics
+
+        :return: Возвращает словарь в виде {статистика: словарь}
+        """
+        return {'salary_by_year': self.year_salary,
+                'count_by_year': self.count_salary,
+                'selected_salary_by_year': self.job_year_salary,
+                'selected_count_by_year': self.job_count_salary,
+                'salary_by_area': self.city_salary,
+                'fraction_by_area': dict(self.city_count)}
+
     @staticmethod
     def __error_checker(file_name: str, file_type: str):
         """
@@ -664,8 +694,13 @@ def generate_pdf():
     Запускает генерацию PDF-файла
     """
     inputs = UserInput()
-    AnalysisResult(DataSet(inputs.file_name), inputs.profession_name).get_results().print_result() \
-        .generate_pdf(input('Введите название сохраняемого файла: '))
+    with ResultCache() as cache:
+        report = cache.get_or_compute(f'analysis_report:{os.path.abspath(inputs.file_name)}',
+                                      inputs.profession_name, None,
+                                      get_fingerprint(inputs.file_name, *RATE_FILES),
+                                      lambda: AnalysisResult(DataSet(inputs.file_name), inputs.profession_name)
+                                      .get_results().get_report())
+    report.print_result().generate_pdf(input('Введите название сохраняемого файла: '))
 
 if __name__ == '__main__':
     generate_pdf()
@@ -1,9 +1,15 @@
 import csv
 import re
 import datetime as DT
+from collections import OrderedDict
 from enum import Enum
 from prettytable import PrettyTable
 from typing import List, Dict, Tuple, Any
+from DictionaryEncoding import DictionaryEncoder
+from CurrencyRates import get_rate_provider
+
+
+FILTER_CACHE_SIZE = 32
 
 
 class FieldsTranslator(Enum):
@@ -47,6 +53,7 @@ class DataSet:
 
     Attributes:
         file_name (str): Название файла исходных данных
+        encoder (DictionaryEncoder): Словарная кодировка столбцов с малым числом уникальных значений
         vacancies_objects (List[Vacancy]): Список вакансий типа Vacancy
     """
     def __init__(self, file_name: str):
@@ -56,7 +63,23 @@ class DataSet:
         :param file_name: Название файла исходных данных
         """
         self.file_name = file_name
-        self.vacancies_objects = [Vacancy(vacancy) for vacancy in self.csv_filer(*self.csv_reader(file_name))]
+        list_naming, reader = self.csv_reader(file_name)
+        self.encoder = DictionaryEncoder(list_naming)
+        vacancies = self.csv_filer(list_naming, reader)
+        rates = get_rate_provider().lookup([vacancy['published_at'] for vacancy in vacancies],
+                                           [vacancy['salary_currency'] for vacancy in vacancies])
+        self.vacancies_objects = [Vacancy(self.encoder.encode_row(vacancy), rate)
+                                  for vacancy, rate in zip(vacancies, rates)]
+
+    def select(self, column_name: str, value: str) -> List['Vacancy']:
+        """
+        Выполняет фильтрацию вакансий по равенству значения закодированного столбца
+
+        :param column_name: Название столбца
+        :param value: Значение столбца в исходном виде
+        :return: Возвращает список вакансий, у которых значение столбца равно указанному
+        """
+        return [self.vacancies_objects[index] for index in self.encoder[column_name].equals(value)]
 
     @staticmethod
     def __clean_html(raw_html: str) -> str:
@@ -111,7 +134,7 @@ class Vacancy:
         area_name (str): Город вакансии
         published_at (str): Дата публикации вакансии
     """
-    def __init__(self, vacancy: Dict):
+    def __init__(self, vacancy: Dict, rate: float = None):
         self.name = vacancy['name']
         self.description = vacancy['description']
         self.key_skills = vacancy['key_skills']
@@ -121,7 +144,9 @@ class Vacancy:
         self.salary = Salary(salary_from=vacancy['salary_from'],
                              salary_to=vacancy['salary_to'],
                              salary_gross=vacancy['salary_gross'],
-                             salary_currency=vacancy['salary_currency'])
+                             salary_currency=vacancy['salary_currency'],
+                             rate=get_rate_provider().rate(vacancy['published_at'], vacancy['salary_currency'])
+                             if rate is None else rate)
         self.area_name = vacancy['area_name']
         self.published_at = vacancy['published_at']
 
@@ -135,43 +160,31 @@ class Salary:
         salary_to (str): Верхняя граница оклада
         salary_gross (str): Вычет налогов
         salary_currency (str): Идентификатор валюты оклада
+        rate (float): Курс валюты оклада на месяц публикации
     """
-    def __init__(self, salary_from: str, salary_to: str, salary_gross: str, salary_currency: str):
+    def __init__(self, salary_from: str, salary_to: str, salary_gross: str, salary_currency: str, rate: float):
         self.salary_from = salary_from
         self.salary_to = salary_to
         self.salary_gross = salary_gross
         self.salary_currency = salary_currency
+        self.rate = rate
 
     def rub_convert(self) -> Tuple[float, float]:
-        currency_to_rub = {
-            "AZN": 35.68,
-            "BYR": 23.91,
-            "EUR": 59.90,
-            "GEL": 21.74,
-            "KGS": 0.76,
-            "KZT": 0.13,
-            "RUR": 1,
-            "UAH": 1.64,
-            "USD": 60.66,
-            "UZS": 0.0055,
-        }
-        return float(self.salary_from) * currency_to_rub[self.salary_currency], \
-               float(self.salary_to) * currency_to_rub[self.salary_currency]
-
-
-def filter_premium(vacancies: List[Vacancy], value: str) -> List[Vacancy]:
+        return float(self.salary_from) * self.rate, float(self.salary_to) * self.rate
+
+
+def translate_filter_value(translator, value: str) -> str:
     """
-    Производит фильтрацию списка вакансий по параметру "Премиум-вакансия"
+    Переводит значение параметра фильтрации в исходное значение столбца
 
-    :param vacancies: Список вакансий
-    :param value: Значение параметра "Премиум-вакансия"
-    :return: Возвращает отфильтрованный по параметру "Премиум-вакансия" список вакансий
+    :param translator: Перечисление для перевода значений столбца
+    :param value: Значение параметра фильтрации
+    :return: Возвращает исходное значение столбца или пустую строку, если перевод отсутствует
     """
-    dict_translator = {
-        'Да': 'True',
-        'Нет': 'False'
-    }
-    return [vacancy for vacancy in vacancies if vacancy.premium == dict_translator[value]]
+    try:
+        return translator(value).name
+    except ValueError:
+        return ''
 
 
 filter_dict = {
@@ -179,20 +192,20 @@ filter_dict = {
     'Описание': lambda vacancies, value: [vacancy for vacancy in vacancies if vacancy.description == value],
     'Навыки': lambda vacancies, value: [vacancy for vacancy in vacancies
                                         if set(value.split(', ')).issubset(vacancy.key_skills.split('\n'))],
-    'Опыт работы': lambda vacancies, value: [vacancy for vacancy in vacancies
-                                             if ExperienceTranslator[vacancy.experience_id].value == value],
-    'Премиум-вакансия': filter_premium,
     'Оклад': lambda vacancies, value: [vacancy for vacancy in vacancies
                                        if int(vacancy.salary.salary_from) <= int(value) <= int(vacancy.salary.salary_to)],
-    'Идентификатор валюты оклада': lambda vacancies, value: [vacancy for vacancy in vacancies
-                                                             if ValuteTranslator[
-                                                                 vacancy.salary.salary_currency].value == value],
-    'Название региона': lambda vacancies, value: [vacancy for vacancy in vacancies if vacancy.area_name == value],
     'Дата публикации вакансии': lambda vacancies, value: [vacancy for vacancy in vacancies
                                                           if vacancy.published_at[0:10] ==
                                                           DT.datetime.strptime(value.replace('.', '-'), '%d-%m-%Y')
                                                               .date().strftime('%Y-%m-%d')],
-    'Компания': lambda vacancies, value: [vacancy for vacancy in vacancies if vacancy.employer_name == value]
+}
+
+encoded_filter_dict = {
+    'Опыт работы': ('experience_id', lambda value: translate_filter_value(ExperienceTranslator, value)),
+    'Премиум-вакансия': ('premium', lambda value: {'Да': 'True', 'Нет': 'False'}.get(value, '')),
+    'Идентификатор валюты оклада': ('salary_currency', lambda value: translate_filter_value(ValuteTranslator, value)),
+    'Название региона': ('area_name', lambda value: value),
+    'Компания': ('employer_name', lambda value: value)
 }
 
 
@@ -237,48 +250,67 @@ class InputConnect:
     Класс для представления методов для работы со списком вакансий
     """
     @staticmethod
-    def formatter(vacancies: List[Vacancy]) -> List[Vacancy]:
+    def format_vacancy(vacancy: Vacancy) -> List[str]:
         """
-        Производит форматирование списка вакансий
+        Форматирует значения вакансии для вывода, не изменяя саму вакансию
+
+        :param vacancy: Вакансия
+        :return: Возвращает значения столбцов таблицы в порядке полей вакансии
+        """
+        salary = vacancy.salary
+        salary_gross = 'С вычетом налогов' if salary.salary_gross == 'False' else 'Без вычета налогов'
+        published_at = DT.datetime.strptime(vacancy.published_at[0:10].replace('-', ''), '%Y%m%d').date()
+        return [vacancy.name,
+                vacancy.description,
+                vacancy.key_skills,
+                ExperienceTranslator[vacancy.experience_id].value,
+                'Нет' if vacancy.premium == 'False' else 'Да',
+                vacancy.employer_name,
+                f"{'{0:,}'.format(int(float(salary.salary_from))).replace(',', ' ')} - "
+                f"{'{0:,}'.format(int(float(salary.salary_to))).replace(',', ' ')} "
+                f"({ValuteTranslator[salary.salary_currency].value}) ({salary_gross})",
+                vacancy.area_name,
+                published_at.strftime('%d.%m.%Y')]
+
+    @staticmethod
+    def formatter(vacancies: List[Vacancy]) -> List[List[str]]:
+        """
+        Производит форматирование списка вакансий. Вакансии не изменяются, поэтому набор данных можно
+        выводить повторно
 
         :param vacancies: Список вакансий
-        :return: Возвращает отформатированный список вакансий
-        """
-        for vacancy in vacancies:
-            if vacancy.premium == 'False':
-                vacancy.premium = 'Нет'
-            else:
-                vacancy.premium = 'Да'
-            if vacancy.salary.salary_gross == 'False':
-                vacancy.salary.salary_gross = 'Нет'
-            else:
-                vacancy.salary.salary_gross = 'Да'
-            vacancy.salary.salary_currency = ValuteTranslator[vacancy.salary.salary_currency].value
-            vacancy.experience_id = ExperienceTranslator[vacancy.experience_id].value
-            datetime = DT.datetime.strptime(vacancy.published_at[0:10].replace('-', ''), '%Y%m%d').date()
-            vacancy.published_at = datetime.strftime('%d.%m.%Y')
-            if vacancy.salary.salary_gross == 'Да':
-                vacancy.salary.salary_gross = 'Без вычета налогов'
-            else:
-                vacancy.salary.salary_gross = 'С вычетом налогов'
-            vacancy.salary = f"{'{0:,}'.format(int(float(vacancy.salary.salary_from))).replace(',', ' ')} - " \
-                             f"{'{0:,}'.format(int(float(vacancy.salary.salary_to))).replace(',', ' ')} " \
-                             f"({vacancy.salary.salary_currency}) ({vacancy.salary.salary_gross})"
-        return vacancies
+        :return: Возвращает строки таблицы
+        """
+        return [InputConnect.format_vacancy(vacancy) for vacancy in vacancies]
 
     @staticmethod
-    def filtrate(string: str, vacancies: List[Vacancy]) -> List[Vacancy]:
+    def select(string: str, dataset: DataSet) -> List[Vacancy]:
         """
-        Производит фильтрацию по указанным параметрам
+        Отбирает вакансии по параметру фильтрации. Фильтрация по столбцам в словарной кодировке
+        выполняется сравнением целочисленных кодов
 
         :param string: Параметр фильтрации
-        :param vacancies: Список вакансий
-        :return: Возвращает отфильтрованный список вакансий
+        :param dataset: Набор данных по вакансиям
+        :return: Возвращает отфильтрованный список вакансий (возможно, пустой)
         """
         if string == '':
-            return vacancies
+            return dataset.vacancies_objects
         header, value = string.split(': ')
-        results = filter_dict[header](vacancies, value)
+        if header in encoded_filter_dict:
+            column_name, translate = encoded_filter_dict[header]
+            return dataset.select(column_name, translate(value))
+        return filter_dict[header](dataset.vacancies_objects, value)
+
+    @staticmethod
+    def filtrate(string: str, dataset: DataSet) -> List[Vacancy]:
+        """
+        Производит фильтрацию по указанным параметрам
+
+        :param string: Параметр фильтрации
+        :param dataset: Набор данных по вакансиям
+        :return: Возвращает отфильтрованный список вакансий
+        """
+        results = InputConnect.select(string, dataset)
         if len(results) == 0:
             custom_exit('Ничего не найдено')
         return results
@@ -326,13 +358,26 @@ class Table:
         """
         if len(data_vacancies) == 0:
             custom_exit('Нет данных')
-        for vacancy in InputConnect.formatter(data_vacancies):
-            row = []
-            for value in vacancy.__dict__.values():
-                row.append(value[:100] + '...') if len(value) > 100 else row.append(value)
-            self.table.add_row(row)
+        for row in InputConnect.formatter(data_vacancies):
+            self.table.add_row([value[:100] + '...' if len(value) > 100 else value for value in row])
         self.table.add_autoindex('№')
 
+    def get_string(self, vacancies: List[Vacancy], output_range: str, table_rows: str) -> str:
+        """
+        Формирует текст таблицы
+
+        :param vacancies: Список выводимых вакансий
+        :param output_range: Диапазон выводимых строк
+        :param table_rows: Выводимые столбцы таблицы
+        :return: Возвращает таблицу в виде строки
+        """
+        self.__make_table(vacancies)
+        distances = [1, len(self.table.rows) + 1] if len(output_range) == 0 else output_range.split(' ')
+        table_rows = self.table.field_names if len(table_rows) == 0 else ['№'] + table_rows.split(', ')
+        if len(distances) == 1:
+            distances.append(len(self.table.rows) + 1)
+        return self.table.get_string(start=int(distances[0]) - 1, end=int(distances[1]) - 1, fields=table_rows)
+
     def print_table(self, output_range: str, table_rows: str, sorting_param: str,
                     filter_param: str, reverse_sort_param: str, file_name: str) -> None:
         """
@@ -345,15 +390,10 @@ class Table:
         :param reverse_sort_param: Параметр обратной сортировки
         :param file_name: Имя файла исходных данных
         """
-        self.__make_table(InputConnect.sorting(sorting_param,
-                                               InputConnect.filtrate(filter_param,
-                                                                     DataSet(file_name).vacancies_objects),
-                                               reverse_sort_param))
-        distances = [1, len(self.table.rows) + 1] if len(output_range) == 0 else output_range.split(' ')
-        table_rows = self.table.field_names if len(table_rows) == 0 else ['№'] + table_rows.split(', ')
-        if len(distances) == 1:
-            distances.append(len(self.table.rows) + 1)
-        print(self.table.get_string(start=int(distances[0]) - 1, end=int(distances[1]) - 1, fields=table_rows))
+        print(self.get_string(InputConnect.sorting(sorting_param,
+                                                   InputConnect.filtrate(filter_param, DataSet(file_name)),
+                                                   reverse_sort_param),
+                              output_range, table_rows))
 
 
 def custom_exit(message: str) -> None:
@@ -405,21 +445,49 @@ class UserInput:
         Проверяет вводимые данные на корректность
         """
         try:
-            headers = next(csv.reader(open(self.file_name, 'r', encoding='utf-8-sig')))
+            headers = read_headers(self.file_name)
         except:
             custom_exit('Пустой файл')
-        if self.reverse_sort_param not in ['Да', 'Нет', '']:
-            custom_exit('Порядок сортировки задан некорректно')
-        if self.sorting_param not in [FieldsTranslator[header].value for header in headers] + ['']:
-            custom_exit('Параметр сортировки некорректен')
-        if self.filter_param == '':
-            return
-        try:
-            header, value = self.filter_param.split(': ')
-        except:
-            custom_exit('Формат ввода некорректен')
-        if header not in [FieldsTranslator[header].value for header in headers] + ['']:
-            custom_exit('Параметр поиска некорректен')
+        message = check_parameters(headers, self.filter_param, self.sorting_param, self.reverse_sort_param)
+        if message:
+            custom_exit(message)
+
+
+def read_headers(file_name: str) -> List[str]:
+    """
+    Читает заголовки файла исходных данных
+
+    :param file_name: Имя файла исходных данных
+    :return: Возвращает список заголовков
+    """
+    with open(file_name, 'r', encoding='utf-8-sig') as file:
+        return next(csv.reader(file))
+
+
+def check_parameters(headers: List[str], filter_param: str, sorting_param: str, reverse_sort_param: str) -> str:
+    """
+    Проверяет параметры фильтрации и сортировки на корректность
+
+    :param headers: Заголовки файла исходных данных
+    :param filter_param: Параметр фильтрации
+    :param sorting_param: Параметр сортировки
+    :param reverse_sort_param: Параметр обратной сортировки
+    :return: Возвращает сообщение об ошибке или пустую строку, если параметры корректны
+    """
+    fields = [FieldsTranslator[header].value for header in headers] + ['']
+    if reverse_sort_param not in ['Да', 'Нет', '']:
+        return 'Порядок сортировки задан некорректно'
+    if sorting_param not in fields:
+        return 'Параметр сортировки некорректен'
+    if filter_param == '':
+        return ''
+    try:
+        header, value = filter_param.split(': ')
+    except ValueError:
+        return 'Формат ввода некорректен'
+    if header not in fields or header not in filter_dict and header not in encoded_filter_dict:
+        return 'Параметр поиска некорректен'
+    return ''
 
 
 def generate_table():
@@ -433,3 +501,117 @@ def generate_table():
                         reverse_sort_param=inputs.reverse_sort_param,
                         output_range=inputs.output_range,
                         table_rows=inputs.table_rows)
+
+
+class QueryShell:
+    """
+    Класс для представления интерактивного режима запросов к таблице вакансий. Набор данных загружается
+    один раз, после чего команды фильтрации, сортировки, диапазона и столбцов выполняются над ним повторно.
+    Результаты последних фильтраций хранятся в памяти
+
+    Attributes:
+        dataset (DataSet): Набор данных по вакансиям
+        headers (List[str]): Заголовки файла исходных данных
+        parameters (Dict[str, str]): Текущие параметры вывода в виде {параметр print_table: значение}
+        cache_size (int): Количество хранимых результатов фильтрации
+        filter_cache (OrderedDict): Словарь в виде {параметр фильтрации: список вакансий}
+        в порядке последнего использования
+    """
+    commands = {
+        'фильтр': 'filter_param',
+        'сортировка': 'sorting_param',
+        'обратный': 'reverse_sort_param',
+        'диапазон': 'output_range',
+        'столбцы': 'table_rows'
+    }
+    help = 'Команды: фильтр <параметр: значение>, сортировка <параметр>, обратный <Да / Нет>, ' \
+           'диапазон <начало> [конец], столбцы <столбец, ...>, показать, выход. ' \
+           'Команда без значения сбрасывает параметр'
+
+    def __init__(self, file_name: str, cache_size: int = FILTER_CACHE_SIZE):
+        """
+        Инициализирует объект QueryShell, загружает набор данных
+
+        :param file_name: Имя файла исходных данных
+        :param cache_size: Количество хранимых результатов фильтрации
+        """
+        self.headers = read_headers(file_name)
+        self.dataset = DataSet(file_name)
+        self.parameters = {parameter: '' for parameter in self.commands.values()}
+        self.cache_size = cache_size
+        self.filter_cache = OrderedDict()
+
+    def filtrate(self, filter_param: str) -> List[Vacancy]:
+        """
+        Возвращает результат фильтрации из памяти или выполняет фильтрацию
+
+        :param filter_param: Параметр фильтрации
+        :return: Возвращает отфильтрованный список вакансий (возможно, пустой)
+        """
+        if filter_param in self.filter_cache:
+            self.filter_cache.move_to_end(filter_param)
+            return self.filter_cache[filter_param]
+        results = InputConnect.select(filter_param, self.dataset)
+        self.filter_cache[filter_param] = results
+        if len(self.filter_cache) > self.cache_size:
+            self.filter_cache.popitem(last=False)
+        return results
+
+    def execute(self, line: str) -> str:
+        """
+        Выполняет команду: изменяет параметр вывода и формирует таблицу по текущим параметрам
+
+        :param line: Строка команды
+        :return: Возвращает таблицу или сообщение об ошибке
+        """
+        command, _, value = line.strip().partition(' ')
+        if command != 'показать' and command not in self.commands:
+            return self.help
+        parameters = dict(self.parameters)
+        if command in self.commands:
+            parameters[self.commands[command]] = value.strip()
+        message = check_parameters(self.headers, parameters['filter_param'], parameters['sorting_param'],
+                                   parameters['reverse_sort_param'])
+        if message:
+            return message
+        table = Table()
+        columns = parameters['table_rows'].split(', ') if parameters['table_rows'] else []
+        if any(column not in table.table.field_names for column in columns):
+            return 'Столбцы заданы некорректно'
+        try:
+            vacancies = self.filtrate(parameters['filter_param'])
+            if len(vacancies) == 0:
+                return 'Ничего не найдено'
+            vacancies = InputConnect.sorting(parameters['sorting_param'], vacancies,
+                                             parameters['reverse_sort_param'])
+            result = table.get_string(vacancies, parameters['output_range'], parameters['table_rows'])
+        except ValueError:
+            return 'Формат ввода некорректен'
+        self.parameters = parameters
+        return result
+
+    def run(self) -> None:
+        """
+        Читает и выполняет команды до команды выход или конца ввода
+        """
+        print(self.help)
+        while True:
+            try:
+                line = input('> ')
+            except EOFError:
+                return
+            if line.strip() == 'выход':
+                return
+            print(self.execute(line))
+
+
+def query_shell():
+    """
+    Запускает интерактивный режим запросов к таблице вакансий
+    """
+    file_name = input('Введите название файла: ')
+    try:
+        read_headers(file_name)
+    except:
+        custom_exit('Пустой файл')
+    QueryShell(file_name).run()
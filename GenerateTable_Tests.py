@@ -0,0 +1,78 @@
+import csv
+import os
+import tempfile
+from unittest import TestCase
+
+from GenerateTable import InputConnect
+from GenerateTable import QueryShell
+
+
+HEADERS = ['name', 'description', 'key_skills', 'experience_id', 'premium', 'employer_name', 'salary_from',
+           'salary_to', 'salary_gross', 'salary_currency', 'area_name', 'published_at']
+ROWS = [
+    ['Программист', 'Разработка', 'Python\nSQL', 'between1And3', 'False', 'Рога и копыта', '50000.0', '70000.0',
+     'False', 'RUR', 'Москва', '2022-07-05T18:19:30+0300'],
+    ['Аналитик', 'Отчеты', 'SQL', 'noExperience', 'True', 'Копыта и рога', '40000.0', '45000.0', 'True', 'RUR',
+     'Казань', '2022-07-06T10:00:00+0300'],
+    ['Тестировщик', 'Тесты', 'Python', 'moreThan6', 'False', 'Рога и копыта', '60000.0', '90000.0', 'False', 'RUR',
+     'Москва', '2022-07-07T10:00:00+0300'],
+]
+
+
+class QueryShellTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        file_name = os.path.join(self.directory.name, 'vacancies.csv')
+        with open(file_name, mode='w', encoding='utf-8-sig', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(HEADERS)
+            writer.writerows(ROWS)
+        self.shell = QueryShell(file_name, cache_size=2)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_formatter_keeps_vacancies(self):
+        vacancy = self.shell.dataset.vacancies_objects[0]
+        row = InputConnect.format_vacancy(vacancy)
+        self.assertEqual(row[3:7], ['От 1 года до 3 лет', 'Нет', 'Рога и копыта',
+                                    '50 000 - 70 000 (Рубли) (С вычетом налогов)'])
+        self.assertEqual(row[8], '05.07.2022')
+        self.assertEqual(InputConnect.formatter([vacancy]), [row])
+        self.assertEqual((vacancy.premium, vacancy.experience_id, vacancy.salary.salary_currency),
+                         ('False', 'between1And3', 'RUR'))
+
+    def test_repeated_commands(self):
+        self.assertIn('Аналитик', self.shell.execute('показать'))
+        table = self.shell.execute('фильтр Название региона: Москва')
+        self.assertNotIn('Аналитик', table)
+        table = self.shell.execute('сортировка Оклад')
+        self.assertLess(table.index('Программист'), table.index('Тестировщик'))
+        table = self.shell.execute('обратный Да')
+        self.assertLess(table.index('Тестировщик'), table.index('Программист'))
+        table = self.shell.execute('диапазон 2')
+        self.assertNotIn('Тестировщик', table)
+        table = self.shell.execute('столбцы Название, Компания')
+        self.assertIn('Компания', table)
+        self.assertNotIn('Оклад', table)
+        self.assertIn('Аналитик', self.shell.execute('фильтр'))
+
+    def test_errors_keep_parameters(self):
+        self.shell.execute('фильтр Название региона: Москва')
+        self.assertEqual(self.shell.execute('фильтр Название региона: Пермь'), 'Ничего не найдено')
+        self.assertEqual(self.shell.execute('сортировка Зарплата'), 'Параметр сортировки некорректен')
+        self.assertEqual(self.shell.execute('фильтр Оклад: много'), 'Формат ввода некорректен')
+        self.assertEqual(self.shell.execute('фильтр Верхняя граница вилки оклада: 100'), 'Параметр поиска некорректен')
+        self.assertEqual(self.shell.execute('фильтр Оклад указан до вычета налогов: Да'), 'Параметр поиска некорректен')
+        self.assertEqual(self.shell.execute('столбцы Зарплата'), 'Столбцы заданы некорректно')
+        self.assertEqual(self.shell.execute('сброс'), QueryShell.help)
+        self.assertEqual(self.shell.parameters['filter_param'], 'Название региона: Москва')
+        self.assertNotIn('Аналитик', self.shell.execute('показать'))
+
+    def test_filter_cache(self):
+        first = self.shell.filtrate('Навыки: SQL')
+        self.assertIs(self.shell.filtrate('Навыки: SQL'), first)
+        self.shell.filtrate('Компания: Рога и копыта')
+        self.shell.filtrate('Навыки: SQL')
+        self.shell.filtrate('Название: Аналитик')
+        self.assertEqual(list(self.shell.filter_cache), ['Навыки: SQL', 'Название: Аналитик'])
@@ -0,0 +1,613 @@
+import asyncio
+import csv
+import json
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from array import array
+from datetime import datetime
+from typing import List, Dict, Any, Tuple, Optional
+
+import aiohttp
+
+from CurrencyRates import RateProvider, get_rate_provider
+from VacancyDatabase import insert_vacancies
+
+
+HH_URL = 'https://api.hh.ru/vacancies'
+DATE_FORMAT = '%Y-%m-%dT%H:%M:%S'
+PER_PAGE = 100
+MAX_ITEMS = 2000
+MAX_CONCURRENCY = 8
+RATE = 10
+RETRIES = 3
+TIMEOUT = 30
+BACKOFF = 0.5
+VACANCY_COLUMNS = ['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at']
+CHECKPOINT_TABLE = 'crawl_checkpoint'
+SEEN_IDS_TABLE = 'crawl_seen_ids'
+
+
+class TokenBucket:
+    """
+    Класс для представления ограничителя частоты запросов по алгоритму token bucket
+
+    Attributes:
+        rate (float): Скорость пополнения (запросов в секунду)
+        capacity (float): Емкость (максимальное число запросов подряд без ожидания)
+        tokens (float): Текущее число доступных запросов
+        updated_at (float): Время последнего пополнения по часам цикла событий
+    """
+    def __init__(self, rate: float, capacity: float = None):
+        """
+        Инициализирует объект TokenBucket
+
+        :param rate: Скорость пополнения (запросов в секунду)
+        :param capacity: Емкость (по умолчанию равна скорости пополнения)
+        """
+        self.rate = rate
+        self.capacity = rate if capacity is None else capacity
+        self.tokens = self.capacity
+        self.updated_at = None
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """
+        Ожидает, пока не станет доступен один запрос, и забирает его
+        """
+        async with self.lock:
+            loop = asyncio.get_running_loop()
+            while True:
+                now = loop.time()
+                if self.updated_at is not None:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def get_vacancy_record(vacancy: Dict[str, Any]) -> List[Any]:
+    """
+    Формирует запись вакансии из JSON API HeadHunter.ru.
+    Поля: Название, Нижняя граница оклада, Верхняя граница оклада, Идентификатор валюты, Город, Дата публикации
+
+    :param vacancy: Вакансия в формате JSON
+    :return: Возвращает запись вакансии в порядке VACANCY_COLUMNS
+    """
+    return [vacancy["name"],
+            vacancy["salary"]["from"],
+            vacancy["salary"]["to"],
+            vacancy["salary"]["currency"],
+            vacancy["area"]["name"],
+            vacancy["published_at"]]
+
+
+def split_window(date_from: str, date_to: str) -> List[Tuple[str, str]]:
+    """
+    Делит временной интервал пополам
+
+    :param date_from: Начало интервала в формате ГГГГ-ММ-ДДTчч:мм:сс
+    :param date_to: Конец интервала в формате ГГГГ-ММ-ДДTчч:мм:сс
+    :return: Возвращает два интервала или исходный интервал, если его длина не больше секунды
+    """
+    start, end = datetime.strptime(date_from, DATE_FORMAT), datetime.strptime(date_to, DATE_FORMAT)
+    if (end - start).total_seconds() <= 1:
+        return [(date_from, date_to)]
+    middle = (start + (end - start) / 2).replace(microsecond=0).strftime(DATE_FORMAT)
+    return [(date_from, middle), (middle, date_to)]
+
+
+class CrawlState:
+    """
+    Класс для представления состояния обхода API HeadHunter.ru на диске: журнал обработанных страниц
+    (checkpoint.jsonl) и множество идентификаторов записанных вакансий (seen_ids.bin, по 8 байт на идентификатор)
+
+    Attributes:
+        directory (str): Каталог состояния
+        pages (Dict[Tuple[str, str, int], int]): Обработанные страницы в виде {(начало, конец, страница): число страниц}
+        split_windows (Set[Tuple[str, str]]): Интервалы, разделенные пополам
+        seen_ids (Set[int]): Идентификаторы записанных вакансий
+    """
+    def __init__(self, directory: str):
+        """
+        Инициализирует объект CrawlState, загружает сохраненное состояние обхода
+
+        :param directory: Каталог состояния
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.pages = {}
+        self.split_windows = set()
+        self.seen_ids = set()
+        checkpoint_path = os.path.join(directory, 'checkpoint.jsonl')
+        if os.path.exists(checkpoint_path):
+            with open(checkpoint_path, encoding='utf-8') as file:
+                for line in file:
+                    if not line.endswith('\n'):
+                        break
+                    self.load_unit(json.loads(line))
+        ids_path = os.path.join(directory, 'seen_ids.bin')
+        if os.path.exists(ids_path):
+            ids = array('Q')
+            with open(ids_path, mode='rb') as file:
+                content = file.read()
+            ids.frombytes(content[:len(content) - len(content) % ids.itemsize])
+            self.seen_ids.update(ids)
+        self.checkpoint_file = open(checkpoint_path, mode='a', encoding='utf-8')
+        self.ids_file = open(ids_path, mode='ab')
+
+    def load_unit(self, unit: Dict[str, Any]) -> None:
+        if unit.get('split'):
+            self.split_windows.add((unit['date_from'], unit['date_to']))
+        else:
+            self.pages[(unit['date_from'], unit['date_to'], unit['page'])] = unit['pages']
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.pages and not self.split_windows
+
+    def is_done(self, date_from: str, date_to: str, page: int) -> bool:
+        return (date_from, date_to, page) in self.pages
+
+    def is_split(self, date_from: str, date_to: str) -> bool:
+        return (date_from, date_to) in self.split_windows
+
+    def get_pages(self, date_from: str, date_to: str) -> Optional[int]:
+        """
+        Возвращает число страниц интервала, если первая страница интервала уже обработана
+
+        :param date_from: Начало интервала
+        :param date_to: Конец интервала
+        :return: Возвращает число страниц или None
+        """
+        return self.pages.get((date_from, date_to, 0))
+
+    def write_checkpoint(self, unit: Dict[str, Any]) -> None:
+        self.checkpoint_file.write(json.dumps(unit, ensure_ascii=False) + '\n')
+        self.checkpoint_file.flush()
+
+    def write_ids(self, ids: array) -> None:
+        self.ids_file.write(ids.tobytes())
+        self.ids_file.flush()
+
+    def mark_split(self, date_from: str, date_to: str) -> None:
+        """
+        Отмечает интервал как разделенный пополам
+
+        :param date_from: Начало интервала
+        :param date_to: Конец интервала
+        """
+        self.split_windows.add((date_from, date_to))
+        self.write_checkpoint({'date_from': date_from, 'date_to': date_to, 'split': True})
+
+    def filter_new(self, vacancies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Отбирает вакансии, которые еще не были записаны
+
+        :param vacancies: Вакансии в формате JSON
+        :return: Возвращает список новых вакансий без повторов
+        """
+        new_vacancies = {}
+        for vacancy in vacancies:
+            vacancy_id = int(vacancy['id'])
+            if vacancy_id not in self.seen_ids:
+                new_vacancies.setdefault(vacancy_id, vacancy)
+        return list(new_vacancies.values())
+
+    def add_page(self, date_from: str, date_to: str, page: int, pages: int, vacancies: List[Dict[str, Any]]) -> None:
+        """
+        Запоминает идентификаторы вакансий страницы и отмечает страницу как обработанную. Вызывается до
+        записи вакансий в приемник, поэтому сбой между сохранением состояния и записью теряет записи страницы,
+        но не приводит к их повторной записи
+
+        :param date_from: Начало интервала
+        :param date_to: Конец интервала
+        :param page: Номер страницы
+        :param pages: Число страниц интервала
+        :param vacancies: Новые вакансии страницы в формате JSON
+        """
+        new_ids = array('Q', [int(vacancy['id']) for vacancy in vacancies])
+        self.seen_ids.update(new_ids)
+        self.write_ids(new_ids)
+        self.pages[(date_from, date_to, page)] = pages
+        self.write_checkpoint({'date_from': date_from, 'date_to': date_to, 'page': page, 'pages': pages})
+
+    def close(self) -> None:
+        self.checkpoint_file.close()
+        self.ids_file.close()
+
+
+class SqliteCrawlState(CrawlState):
+    """
+    Класс для представления состояния обхода в таблицах БД sqlite приемника SqliteSink. Отметка страницы
+    не фиксируется отдельно, а входит в транзакцию записи вакансий страницы приемником
+
+    Attributes:
+        connect (Connection): Подключение к БД sqlite приемника
+        pages (Dict[Tuple[str, str, int], int]): Обработанные страницы в виде {(начало, конец, страница): число страниц}
+        split_windows (Set[Tuple[str, str]]): Интервалы, разделенные пополам
+        seen_ids (Set[int]): Идентификаторы записанных вакансий
+    """
+    def __init__(self, connect: sqlite3.Connection):
+        """
+        Инициализирует объект SqliteCrawlState, создает таблицы состояния и загружает сохраненное состояние обхода
+
+        :param connect: Подключение к БД sqlite приемника
+        """
+        self.connect = connect
+        self.pages = {}
+        self.split_windows = set()
+        self.seen_ids = set()
+        connect.execute(f"CREATE TABLE IF NOT EXISTS {CHECKPOINT_TABLE} (unit TEXT NOT NULL)")
+        connect.execute(f"CREATE TABLE IF NOT EXISTS {SEEN_IDS_TABLE} (id INTEGER PRIMARY KEY)")
+        connect.commit()
+        for unit, in connect.execute(f"SELECT unit FROM {CHECKPOINT_TABLE} ORDER BY rowid"):
+            self.load_unit(json.loads(unit))
+        self.seen_ids.update(vacancy_id for vacancy_id, in connect.execute(f"SELECT id FROM {SEEN_IDS_TABLE}"))
+
+    def write_checkpoint(self, unit: Dict[str, Any]) -> None:
+        self.connect.execute(f"INSERT INTO {CHECKPOINT_TABLE} (unit) VALUES (?)",
+                             (json.dumps(unit, ensure_ascii=False),))
+
+    def write_ids(self, ids: array) -> None:
+        self.connect.executemany(f"INSERT OR IGNORE INTO {SEEN_IDS_TABLE} (id) VALUES (?)", ((int(i),) for i in ids))
+
+    def mark_split(self, date_from: str, date_to: str) -> None:
+        super().mark_split(date_from, date_to)
+        self.connect.commit()
+
+    def close(self) -> None:
+        pass
+
+
+def convert_records(records: List[List[Any]], provider: RateProvider) -> List[Tuple[str, float, str, str, str]]:
+    """
+    Переводит зарплаты записей вакансий в рубли по курсу валюты на месяц публикации. Записи без границ оклада
+    и с валютой без известного курса пропускаются
+
+    :param records: Записи вакансий в порядке VACANCY_COLUMNS
+    :param provider: Источник курсов валют
+    :return: Возвращает список кортежей (название, зарплата в рублях, исходная валюта, город, дата публикации)
+    """
+    records = [record for record in records
+               if record[3] in provider.currencies and (record[1] is not None or record[2] is not None)]
+    rates = provider.lookup([record[5] for record in records], [record[3] for record in records])
+    rows = []
+    for record, rate in zip(records, rates):
+        bounds = [bound for bound in record[1:3] if bound is not None]
+        rows.append((record[0], sum(bounds) / len(bounds) * float(rate), record[3], record[4], record[5]))
+    return rows
+
+
+class VacancySink(ABC):
+    """
+    Базовый класс приемника записей вакансий. Приемник получает записи каждой страницы сразу после ее загрузки
+    """
+    @abstractmethod
+    def write(self, records: List[List[Any]]) -> None:
+        """
+        Принимает записи вакансий одной страницы
+
+        :param records: Записи вакансий в порядке VACANCY_COLUMNS
+        """
+
+    def close(self) -> None:
+        pass
+
+
+class ListSink(VacancySink):
+    """
+    Класс для представления приемника, сохраняющего записи вакансий в памяти
+
+    Attributes:
+        records (List[List[Any]]): Полученные записи вакансий
+    """
+    def __init__(self):
+        self.records = []
+
+    def write(self, records: List[List[Any]]) -> None:
+        self.records.extend(records)
+
+
+class CsvSink(VacancySink):
+    """
+    Класс для представления приемника, записывающего записи вакансий в .csv файл
+
+    Attributes:
+        file_name (str): Имя .csv файла
+    """
+    def __init__(self, file_name: str, append: bool = True):
+        """
+        Инициализирует объект CsvSink, открывает файл на дозапись или перезапись. Заголовок пишется только
+        в новый или перезаписываемый файл
+
+        :param file_name: Имя .csv файла
+        :param append: Дописывать ли файл (при продолжении обхода) или перезаписать его (при новом обходе)
+        """
+        self.file_name = file_name
+        write_header = not append or not os.path.exists(file_name) or os.path.getsize(file_name) == 0
+        self.file = open(file_name, mode='a' if append else 'w', encoding='utf-8', newline='')
+        self.writer = csv.writer(self.file)
+        if write_header:
+            self.writer.writerow(VACANCY_COLUMNS)
+
+    def write(self, records: List[List[Any]]) -> None:
+        self.writer.writerows(records)
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class SqliteSink(VacancySink):
+    """
+    Класс для представления приемника, записывающего вакансии с зарплатой в рублях в таблицу vacancies БД sqlite
+
+    Attributes:
+        connect (Connection): Подключение к БД sqlite
+        provider (RateProvider): Источник курсов валют
+    """
+    def __init__(self, db_name: str, provider: RateProvider = None):
+        """
+        Инициализирует объект SqliteSink
+
+        :param db_name: Имя файла БД
+        :param provider: Источник курсов валют (по умолчанию - общий источник курсов)
+        """
+        self.connect = sqlite3.connect(db_name)
+        self.provider = provider or get_rate_provider()
+
+    def create_state(self) -> SqliteCrawlState:
+        """
+        Создает состояние обхода в той же БД, чтобы вакансии страницы и отметка страницы записывались одной
+        транзакцией
+
+        :return: Возвращает состояние обхода в БД приемника
+        """
+        return SqliteCrawlState(self.connect)
+
+    def write(self, records: List[List[Any]]) -> None:
+        insert_vacancies(self.connect, convert_records(records, self.provider))
+
+    def close(self) -> None:
+        self.connect.close()
+
+
+class AggregateSink(VacancySink):
+    """
+    Класс для представления приемника, накапливающего статистику по вакансиям без хранения самих вакансий
+
+    Attributes:
+        profession_name (str): Название профессии
+        provider (RateProvider): Источник курсов валют
+        vacancies_count (int): Количество учтенных вакансий
+        year_stats (Dict[int, List[float]]): Словарь в виде {год: [сумма зарплат, количество вакансий]}
+        profession_stats (Dict[int, List[float]]): То же для вакансий профессии
+        city_stats (Dict[str, List[float]]): Словарь в виде {город: [сумма зарплат, количество вакансий]}
+    """
+    def __init__(self, profession_name: str, provider: RateProvider = None):
+        """
+        Инициализирует объект AggregateSink
+
+        :param profession_name: Название профессии
+        :param provider: Источник курсов валют (по умолчанию - общий источник курсов)
+        """
+        self.profession_name = profession_name
+        self.provider = provider or get_rate_provider()
+        self.vacancies_count = 0
+        self.year_stats = {}
+        self.profession_stats = {}
+        self.city_stats = {}
+
+    @staticmethod
+    def add(stats: Dict[Any, List[float]], key: Any, salary: float) -> None:
+        values = stats.setdefault(key, [0.0, 0])
+        values[0] += salary
+        values[1] += 1
+
+    def write(self, records: List[List[Any]]) -> None:
+        for name, salary, _, area_name, published_at in convert_records(records, self.provider):
+            year = int(published_at[:4])
+            self.vacancies_count += 1
+            self.add(self.year_stats, year, salary)
+            self.add(self.city_stats, area_name, salary)
+            if self.profession_name in name:
+                self.add(self.profession_stats, year, salary)
+
+    def get_statistics(self) -> List[Dict[Any, Any]]:
+        """
+        Формирует статистику по накопленным вакансиям
+
+        :return: Возвращает словари: уровень зарплат и количество вакансий по годам, то же для профессии,
+        уровень зарплат и доля вакансий по городам (города с долей больше 1%, по 10 с наибольшим значением)
+        """
+        cities = {city: values for city, values in self.city_stats.items()
+                  if values[1] > 0.01 * self.vacancies_count}
+        city_salary = sorted(((city, int(total / count)) for city, (total, count) in cities.items()),
+                             key=lambda item: item[1], reverse=True)[:10]
+        city_share = sorted(((city, round(count / self.vacancies_count, 4)) for city, (_, count) in cities.items()),
+                            key=lambda item: item[1], reverse=True)[:10]
+        return [{year: int(total / count) for year, (total, count) in sorted(self.year_stats.items())},
+                {year: count for year, (_, count) in sorted(self.year_stats.items())},
+                {year: int(total / count) for year, (total, count) in sorted(self.profession_stats.items())},
+                {year: count for year, (_, count) in sorted(self.profession_stats.items())},
+                dict(city_salary),
+                dict(city_share)]
+
+
+class HeadHunterCrawler:
+    """
+    Класс для представления асинхронного обходчика API HeadHunter.ru. Временные интервалы, по которым найдено
+    больше вакансий, чем API отдает на один запрос (2000), рекурсивно делятся пополам, страницы запрашиваются
+    только до последней существующей. Записи вакансий каждой страницы сразу передаются в приемник
+
+    Attributes:
+        url (str): URL-адрес API HeadHunter.ru
+        params (Dict[str, Any]): Параметры поиска вакансий (кроме интервала дат и страницы)
+        max_concurrency (int): Максимальное число одновременных запросов
+        rate (float): Максимальное число запросов в секунду
+        retries (int): Количество попыток запроса
+        timeout (float): Время ожидания ответа на один запрос в секундах
+        sink (VacancySink): Приемник записей вакансий с указанной зарплатой
+        state (CrawlState): Состояние обхода на диске (без состояния повторы отсекаются в памяти)
+        seen_ids (Set[int]): Идентификаторы полученных вакансий (если состояние не задано)
+        requests_count (int): Количество выполненных запросов
+    """
+    def __init__(self,
+                 url: str = HH_URL,
+                 params: Dict[str, Any] = None,
+                 max_concurrency: int = MAX_CONCURRENCY,
+                 rate: float = RATE,
+                 retries: int = RETRIES,
+                 timeout: float = TIMEOUT,
+                 sink: VacancySink = None,
+                 state: CrawlState = None):
+        """
+        Инициализирует объект HeadHunterCrawler
+
+        :param url: URL-адрес API HeadHunter.ru
+        :param params: Параметры поиска вакансий (кроме интервала дат и страницы)
+        :param max_concurrency: Максимальное число одновременных запросов
+        :param rate: Максимальное число запросов в секунду
+        :param retries: Количество попыток запроса
+        :param timeout: Время ожидания ответа на один запрос в секундах
+        :param sink: Приемник записей вакансий (по умолчанию - записи сохраняются в памяти)
+        :param state: Состояние обхода на диске для продолжения обхода после сбоя
+        """
+        self.url = url
+        self.params = params or {}
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        self.retries = retries
+        self.timeout = timeout
+        self.sink = sink or ListSink()
+        self.state = state
+        self.seen_ids = set()
+        self.requests_count = 0
+
+    async def fetch_page(self,
+                         session: aiohttp.ClientSession,
+                         semaphore: asyncio.Semaphore,
+                         bucket: TokenBucket,
+                         date_from: str,
+                         date_to: str,
+                         page: int) -> Dict[str, Any]:
+        """
+        Запрашивает одну страницу вакансий с ограничением числа одновременных запросов и частоты запросов.
+        При ошибках сети, превышении времени ожидания и ответах 429 и 5xx запрос повторяется
+
+        :param session: Сессия aiohttp с общим пулом соединений
+        :param semaphore: Семафор, ограничивающий число одновременных запросов
+        :param bucket: Ограничитель частоты запросов
+        :param date_from: Начало интервала
+        :param date_to: Конец интервала
+        :param page: Номер страницы
+        :return: Возвращает ответ API в формате JSON
+        """
+        params = {**self.params, 'date_from': date_from, 'date_to': date_to, 'per_page': PER_PAGE, 'page': page}
+        for attempt in range(self.retries):
+            try:
+                async with semaphore:
+                    await bucket.acquire()
+                    self.requests_count += 1
+                    async with session.get(self.url, params=params) as response:
+                        if response.status != 429 and response.status < 500:
+                            response.raise_for_status()
+                            return await response.json()
+                        error = aiohttp.ClientResponseError(response.request_info, response.history,
+                                                            status=response.status)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as exception:
+                error = exception
+            if attempt < self.retries - 1:
+                await asyncio.sleep(BACKOFF * 2 ** attempt)
+        raise error
+
+    def handle_page(self, date_from: str, date_to: str, page: int, pages: int, items: List[Dict[str, Any]]) -> None:
+        """
+        Обрабатывает полученную страницу вакансий: передает в приемник записи вакансий с указанной зарплатой,
+        пропуская вакансии, полученные ранее (интервалы могут пересекаться на границах). Состояние обхода
+        сохраняется до записи в приемник
+
+        :param date_from: Начало интервала
+        :param date_to: Конец интервала
+        :param page: Номер страницы
+        :param pages: Число страниц интервала
+        :param items: Вакансии страницы в формате JSON
+        """
+        vacancies = [vacancy for vacancy in items if vacancy["salary"]]
+        if self.state is not None:
+            vacancies = self.state.filter_new(vacancies)
+        else:
+            vacancies = list({int(vacancy['id']): vacancy for vacancy in vacancies
+                              if int(vacancy['id']) not in self.seen_ids}.values())
+            self.seen_ids.update(int(vacancy['id']) for vacancy in vacancies)
+        if self.state is not None:
+            self.state.add_page(date_from, date_to, page, pages, vacancies)
+        self.sink.write([get_vacancy_record(vacancy) for vacancy in vacancies])
+
+    async def crawl_window(self,
+                           session: aiohttp.ClientSession,
+                           semaphore: asyncio.Semaphore,
+                           bucket: TokenBucket,
+                           date_from: str,
+                           date_to: str) -> None:
+        """
+        Обходит временной интервал. Первая страница определяет число найденных вакансий: если их больше 2000,
+        интервал делится пополам, иначе остальные страницы запрашиваются параллельно.
+        Страницы, обработанные до сбоя, повторно не запрашиваются
+
+        :param session: Сессия aiohttp с общим пулом соединений
+        :param semaphore: Семафор, ограничивающий число одновременных запросов
+        :param bucket: Ограничитель частоты запросов
+        :param date_from: Начало интервала
+        :param date_to: Конец интервала
+        """
+        windows = split_window(date_from, date_to)
+        if self.state is not None and self.state.is_split(date_from, date_to):
+            await asyncio.gather(*[self.crawl_window(session, semaphore, bucket, *window) for window in windows])
+            return
+        pages = self.state.get_pages(date_from, date_to) if self.state is not None else None
+        if pages is None:
+            first_page = await self.fetch_page(session, semaphore, bucket, date_from, date_to, 0)
+            if first_page['found'] > MAX_ITEMS and len(windows) > 1:
+                if self.state is not None:
+                    self.state.mark_split(date_from, date_to)
+                await asyncio.gather(*[self.crawl_window(session, semaphore, bucket, *window)
+                                       for window in windows])
+                return
+            pages = min(first_page['pages'], MAX_ITEMS // PER_PAGE)
+            self.handle_page(date_from, date_to, 0, pages, first_page['items'])
+
+        async def crawl_page(page: int) -> None:
+            response = await self.fetch_page(session, semaphore, bucket, date_from, date_to, page)
+            self.handle_page(date_from, date_to, page, pages, response['items'])
+
+        await asyncio.gather(*[crawl_page(page) for page in range(1, pages)
+                               if self.state is None or not self.state.is_done(date_from, date_to, page)])
+
+    async def crawl_async(self, date_from: str, date_to: str) -> None:
+        """
+        Обходит временной интервал в одной сессии aiohttp
+
+        :param date_from: Начало интервала в формате ГГГГ-ММ-ДДTчч:мм:сс
+        :param date_to: Конец интервала в формате ГГГГ-ММ-ДДTчч:мм:сс
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        bucket = TokenBucket(self.rate)
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+        async with aiohttp.ClientSession(connector=connector,
+                                         timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
+            await self.crawl_window(session, semaphore, bucket, date_from, date_to)
+
+    def crawl(self, date_from: str, date_to: str) -> VacancySink:
+        """
+        Получает вакансии с указанной зарплатой, опубликованные в интервале
+
+        :param date_from: Начало интервала в формате ГГГГ-ММ-ДДTчч:мм:сс
+        :param date_to: Конец интервала в формате ГГГГ-ММ-ДДTчч:мм:сс
+        :return: Возвращает приемник записей вакансий
+        """
+        asyncio.run(self.crawl_async(date_from, date_to))
+        return self.sink
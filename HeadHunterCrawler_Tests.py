@@ -0,0 +1,229 @@
+import asyncio
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from unittest import TestCase
+from urllib.parse import urlparse, parse_qs
+
+from HeadHunterCrawler import HeadHunterCrawler
+from HeadHunterCrawler import TokenBucket
+from HeadHunterCrawler import CrawlState
+from HeadHunterCrawler import CsvSink
+from HeadHunterCrawler import ListSink
+from HeadHunterCrawler import SqliteSink
+from HeadHunterCrawler import SqliteCrawlState
+from HeadHunterCrawler import AggregateSink
+from CurrencyRates import RateProvider
+from HeadHunterCrawler import VacancySink
+from HeadHunterCrawler import split_window
+from HeadHunterCrawler import DATE_FORMAT
+
+
+START = datetime(2022, 12, 29)
+
+
+def make_vacancies(count: int, hours: int = 24):
+    step = timedelta(hours=hours) / count
+    return [{'id': str(index),
+             'name': f'Вакансия {index}',
+             'salary': {'from': 1000 + index, 'to': None, 'currency': 'RUR'} if index % 5 else None,
+             'area': {'name': 'Москва'},
+             'published_at': (START + step * index).strftime(DATE_FORMAT) + '+0300'}
+            for index in range(count)]
+
+
+class MockApiHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        query = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        self.server.requests.append(query)
+        if self.server.failures and int(query['page']) in self.server.failures:
+            self.server.failures.remove(int(query['page']))
+            self.send_response(404)
+            self.end_headers()
+            return
+        found = [vacancy for vacancy in self.server.vacancies
+                 if query['date_from'] <= vacancy['published_at'][:19] < query['date_to']]
+        per_page, page = int(query['per_page']), int(query['page'])
+        available = min(len(found), 2000)
+        content = json.dumps({'found': len(found),
+                              'pages': math.ceil(available / per_page),
+                              'page': page,
+                              'items': found[:available][page * per_page:(page + 1) * per_page]}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class FailingSink(ListSink):
+    def write(self, records):
+        raise RuntimeError
+
+
+class FailingSqliteSink(SqliteSink):
+    def write(self, records):
+        raise RuntimeError
+
+
+class HeadHunterCrawlerTests(TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), MockApiHandler)
+        self.server.requests = []
+        self.server.vacancies = []
+        self.server.failures = set()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_port}/vacancies'
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def crawl(self, vacancies, state=None, sink=None):
+        self.server.vacancies = vacancies
+        crawler = HeadHunterCrawler(self.url, dict(specialization=1), rate=1000, sink=sink, state=state)
+        return crawler.crawl('2022-12-29T00:00:00', '2022-12-30T00:00:00')
+
+    def test_crawl_stops_paging(self):
+        records = self.crawl(make_vacancies(250)).records
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(len(records), 200)
+
+    def test_crawl_splits_window(self):
+        vacancies = make_vacancies(4500)
+        records = self.crawl(vacancies).records
+        self.assertEqual(sorted(record[0] for record in records),
+                         sorted(vacancy['name'] for vacancy in vacancies if vacancy['salary']))
+        self.assertTrue(all(int(request['page']) < 20 for request in self.server.requests))
+        self.assertTrue(any(request['date_from'] != '2022-12-29T00:00:00' for request in self.server.requests))
+
+    def test_split_window(self):
+        self.assertEqual(split_window('2022-12-29T00:00:00', '2022-12-30T00:00:00'),
+                         [('2022-12-29T00:00:00', '2022-12-29T12:00:00'),
+                          ('2022-12-29T12:00:00', '2022-12-30T00:00:00')])
+        self.assertEqual(split_window('2022-12-29T00:00:00', '2022-12-29T00:00:01'),
+                         [('2022-12-29T00:00:00', '2022-12-29T00:00:01')])
+
+    def test_token_bucket(self):
+        async def acquire_all():
+            bucket = TokenBucket(rate=20, capacity=1)
+            for _ in range(5):
+                await bucket.acquire()
+
+        start = time.perf_counter()
+        asyncio.run(acquire_all())
+        self.assertGreaterEqual(time.perf_counter() - start, 0.19)
+
+    def test_crawl_resume(self):
+        vacancies = make_vacancies(500)
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'vacancies.csv')
+            self.server.failures = {3}
+            state, sink = CrawlState(directory), CsvSink(file_name)
+            with self.assertRaises(Exception):
+                self.crawl(vacancies, state, sink)
+            state.close()
+            sink.close()
+            requests_count = len(self.server.requests)
+            state, sink = CrawlState(directory), CsvSink(file_name)
+            missing_pages = [page for page in range(5)
+                             if not state.is_done('2022-12-29T00:00:00', '2022-12-30T00:00:00', page)]
+            self.assertIn(3, missing_pages)
+            self.crawl(vacancies, state, sink)
+            state.close()
+            sink.close()
+            self.assertEqual(len(self.server.requests) - requests_count, len(missing_pages))
+            with open(file_name, encoding='utf-8') as file:
+                lines = file.read().splitlines()
+            self.assertEqual(len(lines), 1 + 400)
+            self.assertEqual(len(set(lines)), len(lines))
+
+    def test_crawl_deduplicates(self):
+        vacancies = make_vacancies(100)
+        with tempfile.TemporaryDirectory() as directory:
+            state = CrawlState(directory)
+            self.crawl(vacancies, state)
+            state.close()
+            state = CrawlState(directory)
+            self.assertEqual(state.filter_new(vacancies[1:3] + [{'id': '1000'}, {'id': '1000'}]), [{'id': '1000'}])
+            self.assertEqual(len(state.seen_ids), 80)
+            state.close()
+
+    def test_crawl_sqlite_sink(self):
+        with tempfile.TemporaryDirectory() as directory:
+            db_name = os.path.join(directory, 'vacancies.sqlite')
+            sink = SqliteSink(db_name, RateProvider())
+            self.crawl(make_vacancies(10), sink=sink)
+            rows = sink.connect.execute('SELECT name, salary FROM vacancies ORDER BY salary').fetchall()
+            sink.close()
+        self.assertEqual(rows[0], ('Вакансия 1', 1001.0))
+        self.assertEqual(len(rows), 8)
+
+    def test_crawl_aggregate_sink(self):
+        sink = self.crawl(make_vacancies(10), sink=AggregateSink('Вакансия 1', RateProvider()))
+        statistics = sink.get_statistics()
+        self.assertEqual(statistics[1], {2022: 8})
+        self.assertEqual(statistics[3], {2022: 1})
+        self.assertEqual(statistics[5], {'Москва': 1.0})
+
+    def test_sink_is_abstract(self):
+        with self.assertRaises(TypeError):
+            VacancySink()
+
+    def test_state_before_sink(self):
+        with tempfile.TemporaryDirectory() as directory:
+            state = CrawlState(directory)
+            with self.assertRaises(RuntimeError):
+                self.crawl(make_vacancies(10), state, FailingSink())
+            state.close()
+            state = CrawlState(directory)
+            self.assertTrue(state.is_done('2022-12-29T00:00:00', '2022-12-30T00:00:00', 0))
+            self.assertEqual(len(state.seen_ids), 8)
+            state.close()
+
+    def test_csv_sink_rewrite(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'vacancies.csv')
+            for append in [True, False]:
+                state = CrawlState(os.path.join(directory, f'{append}.crawl'))
+                self.assertTrue(state.is_empty)
+                sink = CsvSink(file_name, append=append)
+                self.crawl(make_vacancies(10), state, sink)
+                self.assertFalse(state.is_empty)
+                state.close()
+                sink.close()
+            with open(file_name, encoding='utf-8') as file:
+                lines = file.read().splitlines()
+        self.assertEqual(len(lines), 1 + 8)
+
+    def test_crawl_sqlite_state(self):
+        vacancies = make_vacancies(500)
+        with tempfile.TemporaryDirectory() as directory:
+            db_name = os.path.join(directory, 'vacancies.sqlite')
+            sink = FailingSqliteSink(db_name, RateProvider())
+            with self.assertRaises(RuntimeError):
+                self.crawl(vacancies, sink.create_state(), sink)
+            sink.close()
+            sink = SqliteSink(db_name, RateProvider())
+            self.assertTrue(sink.create_state().is_empty)
+            self.server.failures = {3}
+            with self.assertRaises(Exception):
+                self.crawl(vacancies, sink.create_state(), sink)
+            sink.close()
+            sink = SqliteSink(db_name, RateProvider())
+            state = sink.create_state()
+            self.assertFalse(state.is_done('2022-12-29T00:00:00', '2022-12-30T00:00:00', 3))
+            self.assertEqual(len(state.seen_ids), sink.connect.execute('SELECT COUNT(*) FROM vacancies').fetchone()[0])
+            self.crawl(vacancies, state, sink)
+            rows = sink.connect.execute('SELECT name FROM vacancies').fetchall()
+            sink.close()
+        self.assertEqual(len(rows), 400)
+        self.assertEqual(len(set(rows)), len(rows))
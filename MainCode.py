@@ -6,9 +6,11 @@ def main():
     """
     Точка входа в программу. Начинает анализ данных по вакансиям и вывод отчета в формате таблицы или PDF-файла
     """
-    report = input("Введите команду (Вакансии или Статистика): ")
+    report = input("Введите команду (Вакансии, Запросы или Статистика): ")
     if report == "Вакансии":
         GenerateTable.generate_table()
+    elif report == "Запросы":
+        GenerateTable.query_shell()
     elif report == "Статистика":
         GeneratePDF.generate_pdf()
     else:
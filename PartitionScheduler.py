@@ -0,0 +1,70 @@
+import os
+import time
+from concurrent import futures
+from typing import List, Tuple, Any, Callable
+
+
+def get_partition_size(path: str) -> int:
+    """
+    Определяет размер партиции на диске
+
+    :param path: Путь к файлу партиции или к каталогу партиции в колоночном формате
+    :return: Возвращает размер партиции в байтах
+    """
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, file_name)) for file_name in os.listdir(path))
+    return os.path.getsize(path)
+
+
+def run_chunk(func: Callable, chunk: List[Tuple[str, tuple]]) -> List[Tuple[str, Any, float]]:
+    """
+    Выполняет обработку группы партиций в одном процессе с замером времени обработки каждой партиции
+
+    :param func: Функция обработки партиции
+    :param chunk: Список задач в виде (путь к партиции, аргументы функции)
+    :return: Возвращает список в виде (путь к партиции, результат, время обработки в секундах)
+    """
+    results = []
+    for path, args in chunk:
+        start = time.perf_counter()
+        result = func(*args)
+        results.append((path, result, time.perf_counter() - start))
+    return results
+
+
+def schedule_partitions(func: Callable,
+                        tasks: List[Tuple[str, tuple]],
+                        max_workers: int = None,
+                        chunk_size: int = 1) -> List[Tuple[str, Any, float]]:
+    """
+    Выполняет параллельную обработку партиций в пуле процессов. Все задачи отправляются в пул сразу,
+    начиная с самых больших партиций, чтобы самая долгая задача не оказалась последней.
+    Результаты собираются по мере готовности
+
+    :param func: Функция обработки партиции (должна быть доступна для pickle)
+    :param tasks: Список задач в виде (путь к партиции, аргументы функции)
+    :param max_workers: Количество процессов (по умолчанию - количество процессоров)
+    :param chunk_size: Количество партиций, обрабатываемых одним процессом за одну задачу
+    :return: Возвращает список в виде (путь к партиции, результат, время обработки в секундах)
+    в порядке завершения обработки
+    """
+    if chunk_size < 1:
+        raise ValueError('Размер группы партиций должен быть положительным')
+    tasks = sorted(tasks, key=lambda task: get_partition_size(task[0]), reverse=True)
+    chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+    results = []
+    with futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending = [executor.submit(run_chunk, func, chunk) for chunk in chunks]
+        for future in futures.as_completed(pending):
+            results.extend(future.result())
+    return results
+
+
+def print_timings(results: List[Tuple[str, Any, float]]) -> None:
+    """
+    Выполняет печать времени обработки партиций
+
+    :param results: Список в виде (путь к партиции, результат, время обработки в секундах)
+    """
+    for path, _, elapsed in sorted(results, key=lambda result: result[2], reverse=True):
+        print(f'{path}: {elapsed:.3f} с')
@@ -0,0 +1,66 @@
+import io
+import os
+import tempfile
+from concurrent import futures
+from contextlib import redirect_stdout
+from unittest import TestCase, mock
+
+import PartitionScheduler
+from PartitionScheduler import schedule_partitions
+from PartitionScheduler import print_timings
+from PartitionScheduler import run_chunk
+
+
+def double(path: str, value: int) -> tuple:
+    return os.path.basename(path), value * 2
+
+
+class PartitionSchedulerTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.tasks = []
+        for name, size in [('small.csv', 10), ('large.csv', 1000), ('medium.csv', 100)]:
+            path = os.path.join(self.directory.name, name)
+            with open(path, mode='w') as file:
+                file.write('x' * size)
+            self.tasks.append((path, (path, size)))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_largest_first(self):
+        results = schedule_partitions(double, self.tasks, max_workers=1)
+        self.assertEqual([os.path.basename(path) for path, _, _ in results], ['large.csv', 'medium.csv', 'small.csv'])
+
+    def test_results_merged(self):
+        results = schedule_partitions(double, self.tasks, max_workers=2, chunk_size=2)
+        self.assertEqual(sorted(result for _, result, _ in results),
+                         [('large.csv', 2000), ('medium.csv', 200), ('small.csv', 20)])
+        for path, result, elapsed in results:
+            self.assertEqual(os.path.basename(path), result[0])
+            self.assertIsInstance(elapsed, float)
+            self.assertGreaterEqual(elapsed, 0)
+
+    def test_chunks(self):
+        chunks = []
+
+        def record_chunk(func, chunk):
+            chunks.append([os.path.basename(path) for path, _ in chunk])
+            return run_chunk(func, chunk)
+
+        with mock.patch.object(PartitionScheduler.futures, 'ProcessPoolExecutor', futures.ThreadPoolExecutor), \
+                mock.patch.object(PartitionScheduler, 'run_chunk', record_chunk):
+            results = schedule_partitions(double, self.tasks, max_workers=1, chunk_size=2)
+        self.assertEqual(chunks, [['large.csv', 'medium.csv'], ['small.csv']])
+        self.assertEqual(len(results), 3)
+
+    def test_chunk_size(self):
+        with self.assertRaises(ValueError):
+            schedule_partitions(double, self.tasks, chunk_size=0)
+
+    def test_print_timings(self):
+        results = [('a.csv', None, 0.25), ('b.csv', None, 1.5)]
+        output = io.StringIO()
+        with redirect_stdout(output):
+            print_timings(results)
+        self.assertEqual(output.getvalue().splitlines(), ['b.csv: 1.500 с', 'a.csv: 0.250 с'])
@@ -0,0 +1,95 @@
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, Dict, Iterable, Any
+
+import pandas as pd
+
+from VacancyStatistics import get_statistics, AREAS_LIMIT
+
+
+POOL_SIZE = 4
+CACHED_STATEMENTS = 256
+
+
+class QueryPool:
+    """
+    Класс для представления пула потоков с подключениями к БД sqlite только для чтения. Каждый поток держит
+    свое подключение с кэшем подготовленных запросов, поэтому запросы разных потоков выполняются параллельно
+    (sqlite освобождает GIL на время выполнения запроса). Параллельное чтение вместе с записью требует
+    журнала WAL, который включает загрузка вакансий
+
+    Attributes:
+        db_name (str): Имя файла БД
+        executor (ThreadPoolExecutor): Пул потоков
+        connections (List[Connection]): Открытые подключения потоков
+    """
+    def __init__(self, db_name: str, size: int = POOL_SIZE, cached_statements: int = CACHED_STATEMENTS):
+        """
+        Инициализирует объект QueryPool
+
+        :param db_name: Имя файла БД
+        :param size: Количество потоков и подключений
+        :param cached_statements: Количество подготовленных запросов в кэше каждого подключения
+        """
+        self.db_name = db_name
+        self.cached_statements = cached_statements
+        self.connections = []
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix='query-pool',
+                                           initializer=self.connect)
+
+    def connect(self) -> None:
+        """
+        Открывает подключение только для чтения для текущего потока
+        """
+        connect = sqlite3.connect(f'file:{self.db_name}?mode=ro', uri=True, check_same_thread=False,
+                                  cached_statements=self.cached_statements)
+        connect.execute('PRAGMA query_only = ON')
+        self.local.connect = connect
+        with self.lock:
+            self.connections.append(connect)
+
+    def run(self, function: Callable[..., Any], *args, **kwargs) -> Any:
+        return function(self.local.connect, *args, **kwargs)
+
+    def submit(self, function: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Выполняет функцию в одном из потоков пула
+
+        :param function: Функция, первым аргументом которой передается подключение потока
+        :param args: Остальные аргументы функции
+        :return: Возвращает Future с результатом функции
+        """
+        return self.executor.submit(self.run, function, *args, **kwargs)
+
+    def get_statistics(self,
+                       vacancy_names: Iterable[str],
+                       limit: int = AREAS_LIMIT,
+                       rollup: bool = False) -> Dict[str, Dict[str, pd.DataFrame]]:
+        """
+        Рассчитывает статистику для нескольких профессий параллельно
+
+        :param vacancy_names: Названия профессий
+        :param limit: Количество городов в статистиках по городам
+        :param rollup: Считать ли статистику по сверткам (их нужно предварительно обновить через refresh_rollups)
+        :return: Возвращает словарь в виде {профессия: {статистика: фрейм}}
+        """
+        futures = {name: self.submit(get_statistics, name, limit, rollup) for name in vacancy_names}
+        return {name: future.result() for name, future in futures.items()}
+
+    def close(self) -> None:
+        """
+        Дожидается завершения запросов и закрывает подключения
+        """
+        self.executor.shutdown(wait=True)
+        for connect in self.connections:
+            connect.close()
+        self.connections = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
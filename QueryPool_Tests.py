@@ -0,0 +1,66 @@
+import os
+import sqlite3
+import tempfile
+import threading
+from unittest import TestCase
+
+import pandas as pd
+
+from QueryPool import QueryPool
+from VacancyDatabase import load_vacancies
+from VacancyDatabase import insert_vacancies
+from VacancyStatistics import get_statistics
+
+
+VACANCIES = pd.DataFrame({'name': ['Python программист', 'Java developer', 'Аналитик', 'python dev'] * 50,
+                          'salary': [100000.0, 80000.0, None, 60000.0] * 50,
+                          'salary_currency': 'RUR',
+                          'area_name': ['Москва', 'Казань', 'Москва', 'Пермь'] * 50,
+                          'published_at': [f'{2010 + index % 12}-01-01T10:00:00+0300' for index in range(200)]})
+
+
+class QueryPoolTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db_name = os.path.join(self.directory.name, 'vacancies.db')
+        load_vacancies(self.db_name, VACANCIES)
+        self.pool = QueryPool(self.db_name, size=3)
+
+    def tearDown(self):
+        self.pool.close()
+        self.directory.cleanup()
+
+    def test_statistics_match_single_connection(self):
+        names = ['python', 'java', 'аналитик', 'py']
+        statistics = self.pool.get_statistics(names)
+        connect = sqlite3.connect(self.db_name)
+        for name in names:
+            for statistic, df in get_statistics(connect, name).items():
+                self.assertTrue(df.equals(statistics[name][statistic]), (name, statistic))
+        connect.close()
+
+    def test_read_only(self):
+        future = self.pool.submit(lambda connect: connect.execute('DELETE FROM vacancies'))
+        with self.assertRaises(sqlite3.OperationalError):
+            future.result()
+
+    def test_threads_own_connections(self):
+        barrier = threading.Barrier(3)
+
+        def get_connection(connect):
+            barrier.wait(timeout=5)
+            return id(connect), threading.current_thread().name
+
+        results = [future.result() for future in [self.pool.submit(get_connection) for _ in range(3)]]
+        self.assertEqual(len({connection for connection, _ in results}), 3)
+        self.assertEqual(len({name for _, name in results}), 3)
+
+    def test_reads_during_write(self):
+        writer = sqlite3.connect(self.db_name)
+        insert_vacancies(writer, [('Python developer', 1.0, 'RUR', 'Москва', '2022-01-01T10:00:00+0300')])
+        writer.execute('BEGIN IMMEDIATE')
+        writer.execute("DELETE FROM vacancies WHERE name = 'Аналитик'")
+        count = self.pool.submit(lambda connect: connect.execute('SELECT COUNT(*) FROM vacancies').fetchone()[0])
+        self.assertEqual(count.result(timeout=5), 201)
+        writer.rollback()
+        writer.close()
@@ -0,0 +1,168 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import time
+from typing import Any, Callable, Optional
+
+
+RESULT_CACHE = 'result_cache.sqlite'
+MAX_BYTES = 64 * 1024 * 1024
+
+
+def get_fingerprint(*paths: str) -> str:
+    """
+    Вычисляет отпечаток набора данных по размеру и времени изменения файлов. Каталоги (например, каталоги
+    партиций) обходятся рекурсивно, отсутствующие файлы тоже учитываются
+
+    :param paths: Пути к файлам и каталогам набора данных
+    :return: Возвращает шестнадцатеричный хэш sha256
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        files = [path]
+        if os.path.isdir(path):
+            files = sorted(os.path.join(directory, file_name)
+                           for directory, _, file_names in os.walk(path) for file_name in file_names)
+        for file_name in files:
+            try:
+                stat = os.stat(file_name)
+                digest.update(f'{file_name}\0{stat.st_size}\0{stat.st_mtime_ns}\n'.encode())
+            except FileNotFoundError:
+                digest.update(f'{file_name}\0missing\n'.encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Класс для представления дискового кэша результатов отчетов в БД sqlite. Результат хранится по ключу
+    (статистика, профессия, регион) вместе с отпечатком набора данных: результат для другого отпечатка
+    считается устаревшим и удаляется при обращении. При превышении размера кэша удаляются давно
+    не использованные результаты
+
+    Attributes:
+        file_name (str): Имя файла кэша
+        max_bytes (int): Наибольший суммарный размер результатов в байтах
+        connect (Connection): Подключение к БД кэша
+    """
+    def __init__(self, file_name: str = RESULT_CACHE, max_bytes: int = MAX_BYTES):
+        """
+        Инициализирует объект ResultCache, создает таблицу кэша, если ее нет
+
+        :param file_name: Имя файла кэша
+        :param max_bytes: Наибольший суммарный размер результатов в байтах
+        """
+        self.file_name = file_name
+        self.max_bytes = max_bytes
+        self.connect = sqlite3.connect(file_name, timeout=30)
+        self.connect.execute('PRAGMA journal_mode = WAL')
+        self.connect.execute('CREATE TABLE IF NOT EXISTS results ('
+                             'statistic TEXT NOT NULL, '
+                             'profession TEXT NOT NULL, '
+                             'region TEXT NOT NULL, '
+                             'fingerprint TEXT NOT NULL, '
+                             'value BLOB NOT NULL, '
+                             'size INTEGER NOT NULL, '
+                             'accessed REAL NOT NULL, '
+                             'PRIMARY KEY (statistic, profession, region))')
+        self.connect.execute('CREATE INDEX IF NOT EXISTS idx_results_accessed ON results (accessed)')
+        self.connect.commit()
+
+    @staticmethod
+    def get_key(statistic: str, profession: Optional[str], region: Optional[str]) -> tuple:
+        return statistic, profession or '', region or ''
+
+    def get(self,
+            statistic: str,
+            profession: Optional[str],
+            region: Optional[str],
+            fingerprint: str,
+            default: Any = None) -> Any:
+        """
+        Возвращает сохраненный результат и отмечает его как использованный
+
+        :param statistic: Название статистики
+        :param profession: Название профессии (None - без отбора по профессии)
+        :param region: Название региона (None - без отбора по региону)
+        :param fingerprint: Отпечаток текущего набора данных
+        :param default: Значение, возвращаемое при отсутствии актуального результата
+        :return: Возвращает результат или default
+        """
+        key = self.get_key(statistic, profession, region)
+        row = self.connect.execute('SELECT fingerprint, value FROM results '
+                                   'WHERE statistic = ? AND profession = ? AND region = ?', key).fetchone()
+        if row is None:
+            return default
+        if row[0] != fingerprint:
+            self.connect.execute('DELETE FROM results WHERE statistic = ? AND profession = ? AND region = ?', key)
+            self.connect.commit()
+            return default
+        self.connect.execute('UPDATE results SET accessed = ? WHERE statistic = ? AND profession = ? AND region = ?',
+                             (time.time(),) + key)
+        self.connect.commit()
+        return pickle.loads(row[1])
+
+    def put(self,
+            statistic: str,
+            profession: Optional[str],
+            region: Optional[str],
+            fingerprint: str,
+            value: Any) -> None:
+        """
+        Сохраняет результат, заменяя прежний результат с тем же ключом, и удаляет давно не использованные
+        результаты сверх размера кэша
+
+        :param statistic: Название статистики
+        :param profession: Название профессии (None - без отбора по профессии)
+        :param region: Название региона (None - без отбора по региону)
+        :param fingerprint: Отпечаток набора данных, по которому получен результат
+        :param value: Результат (объект, сериализуемый pickle)
+        """
+        content = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(content) > self.max_bytes:
+            return
+        self.connect.execute('INSERT OR REPLACE INTO results '
+                             '(statistic, profession, region, fingerprint, value, size, accessed) '
+                             'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                             self.get_key(statistic, profession, region) + (fingerprint, content, len(content),
+                                                                             time.time()))
+        self.connect.execute('DELETE FROM results WHERE rowid IN ('
+                             'SELECT rowid FROM (SELECT rowid, SUM(size) OVER (ORDER BY accessed DESC) AS total '
+                             'FROM results) WHERE total > ?)', (self.max_bytes,))
+        self.connect.commit()
+
+    def get_or_compute(self,
+                       statistic: str,
+                       profession: Optional[str],
+                       region: Optional[str],
+                       fingerprint: str,
+                       compute: Callable[[], Any]) -> Any:
+        """
+        Возвращает сохраненный результат или рассчитывает и сохраняет его
+
+        :param statistic: Название статистики
+        :param profession: Название профессии (None - без отбора по профессии)
+        :param region: Название региона (None - без отбора по региону)
+        :param fingerprint: Отпечаток текущего набора данных
+        :param compute: Функция расчета результата
+        :return: Возвращает результат
+        """
+        missing = object()
+        value = self.get(statistic, profession, region, fingerprint, missing)
+        if value is missing:
+            value = compute()
+            self.put(statistic, profession, region, fingerprint, value)
+        return value
+
+    def clear(self) -> None:
+        self.connect.execute('DELETE FROM results')
+        self.connect.commit()
+
+    def close(self) -> None:
+        self.connect.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
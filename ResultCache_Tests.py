@@ -0,0 +1,76 @@
+import os
+import tempfile
+import time
+from unittest import TestCase
+
+import pandas as pd
+
+from ResultCache import ResultCache
+from ResultCache import get_fingerprint
+
+
+class ResultCacheTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, 'cache.sqlite')
+        self.cache = ResultCache(self.file_name, max_bytes=4096)
+
+    def tearDown(self):
+        self.cache.close()
+        self.directory.cleanup()
+
+    def test_put_get(self):
+        df = pd.DataFrame({'Year': [2022], 'avg_salary': [100.0]})
+        self.cache.put('statistics', 'Программист', 'Москва', 'a', {'salary_by_year': df})
+        self.assertTrue(self.cache.get('statistics', 'Программист', 'Москва', 'a')['salary_by_year'].equals(df))
+        self.assertIsNone(self.cache.get('statistics', 'Программист', None, 'a'))
+
+    def test_persistent(self):
+        self.cache.put('statistics', 'Программист', None, 'a', [1, 2])
+        self.cache.close()
+        self.cache = ResultCache(self.file_name)
+        self.assertEqual(self.cache.get('statistics', 'Программист', None, 'a'), [1, 2])
+
+    def test_stale_fingerprint(self):
+        self.cache.put('statistics', 'Программист', None, 'a', [1])
+        self.assertEqual(self.cache.get('statistics', 'Программист', None, 'b', 'missing'), 'missing')
+        self.assertEqual(self.cache.get('statistics', 'Программист', None, 'a', 'missing'), 'missing')
+
+    def test_get_or_compute(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return None
+
+        self.assertIsNone(self.cache.get_or_compute('statistics', 'Программист', None, 'a', compute))
+        self.assertIsNone(self.cache.get_or_compute('statistics', 'Программист', None, 'a', compute))
+        self.assertEqual(len(calls), 1)
+
+    def test_lru_eviction(self):
+        for name in ['a', 'b', 'c']:
+            self.cache.put('statistics', name, None, 'a', b'x' * 1200)
+            time.sleep(0.01)
+        self.cache.get('statistics', 'a', None, 'a')
+        time.sleep(0.01)
+        self.cache.put('statistics', 'd', None, 'a', b'x' * 1200)
+        self.assertIsNotNone(self.cache.get('statistics', 'a', None, 'a'))
+        self.assertIsNone(self.cache.get('statistics', 'b', None, 'a'))
+        self.assertIsNotNone(self.cache.get('statistics', 'd', None, 'a'))
+        self.cache.put('statistics', 'e', None, 'a', b'x' * 5000)
+        self.assertIsNone(self.cache.get('statistics', 'e', None, 'a'))
+
+
+class FingerprintTests(TestCase):
+    def test_fingerprint_changes_with_data(self):
+        with tempfile.TemporaryDirectory() as directory:
+            partitions = os.path.join(directory, 'partitions')
+            os.makedirs(partitions)
+            file_name = os.path.join(partitions, '2022.csv')
+            with open(file_name, mode='w') as file:
+                file.write('name\n')
+            fingerprint = get_fingerprint(partitions, os.path.join(directory, 'currency.csv'))
+            self.assertEqual(get_fingerprint(partitions, os.path.join(directory, 'currency.csv')), fingerprint)
+            with open(file_name, mode='a') as file:
+                file.write('Программист\n')
+            self.assertNotEqual(get_fingerprint(partitions, os.path.join(directory, 'currency.csv')), fingerprint)
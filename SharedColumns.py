@@ -0,0 +1,93 @@
+from multiprocessing import shared_memory, resource_tracker
+from typing import Dict, Any
+
+import numpy as np
+
+
+ALIGNMENT = 64
+
+
+class SharedColumns:
+    """
+    Класс для передачи столбцов NumPy между процессами через один блок разделяемой памяти.
+    Процесс-обработчик копирует столбцы в блок и передает родителю только небольшое описание блока,
+    родитель получает столбцы в виде представлений NumPy без копирования и без pickle
+
+    Attributes:
+        memory (SharedMemory): Блок разделяемой памяти
+        layout (Dict[str, Dict[str, Any]]): Словарь в виде {столбец: {dtype, shape, offset}}
+        columns (Dict[str, np.ndarray]): Словарь в виде {столбец: массив NumPy в разделяемой памяти}
+    """
+
+    def __init__(self, memory: shared_memory.SharedMemory, layout: Dict[str, Dict[str, Any]]):
+        """
+        Инициализирует объект SharedColumns
+
+        :param memory: Блок разделяемой памяти
+        :param layout: Расположение столбцов в блоке
+        """
+        self.memory = memory
+        self.layout = layout
+        self.columns = {name: np.ndarray(tuple(column['shape']), dtype=np.dtype(column['dtype']),
+                                         buffer=memory.buf, offset=column['offset'])
+                        for name, column in layout.items()}
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    @classmethod
+    def create(cls, columns: Dict[str, np.ndarray]):
+        """
+        Создает блок разделяемой памяти и копирует в него столбцы. Владельцем блока становится процесс,
+        который подключится к нему через attach и вызовет unlink
+
+        :param columns: Словарь в виде {столбец: массив NumPy}
+        :return: Возвращает объект SharedColumns
+        """
+        layout = {}
+        size = 0
+        for name, array in columns.items():
+            array = np.asarray(array)
+            if array.dtype.hasobject:
+                raise TypeError(f'Столбец {name} содержит объекты Python и не может быть передан без pickle')
+            layout[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': size}
+            size += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+        memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        resource_tracker.unregister(memory._name, 'shared_memory')
+        shared = cls(memory, layout)
+        for name, array in columns.items():
+            shared.columns[name][...] = array
+        return shared
+
+    @property
+    def descriptor(self) -> Dict[str, Any]:
+        """
+        Описание блока для передачи в другой процесс
+
+        :return: Возвращает словарь с именем блока и расположением столбцов
+        """
+        return {'name': self.memory.name, 'layout': self.layout}
+
+    @classmethod
+    def attach(cls, descriptor: Dict[str, Any]):
+        """
+        Подключается к блоку разделяемой памяти, созданному другим процессом
+
+        :param descriptor: Описание блока
+        :return: Возвращает объект SharedColumns
+        """
+        return cls(shared_memory.SharedMemory(name=descriptor['name']), descriptor['layout'])
+
+    def close(self) -> None:
+        """
+        Закрывает доступ к блоку в текущем процессе. Полученные ранее массивы становятся недействительными
+        """
+        self.columns = {}
+        self.memory.close()
+
+    def unlink(self) -> None:
+        """
+        Закрывает и удаляет блок разделяемой памяти
+        """
+        self.close()
+        self.memory.unlink()
@@ -0,0 +1,62 @@
+import argparse
+import multiprocessing
+import time
+
+import numpy as np
+
+from SharedColumns import SharedColumns
+
+
+def make_columns(rows: int) -> dict:
+    """
+    Формирует столбцы, похожие на результаты обработки партиции
+
+    :param rows: Количество строк
+    :return: Возвращает словарь в виде {столбец: массив NumPy}
+    """
+    rng = np.random.default_rng(0)
+    return {'year': rng.integers(2003, 2023, rows),
+            'salary': rng.random(rows) * 100000,
+            'count': rng.integers(0, 1000, rows)}
+
+
+def put_pickled(rows: int, queue: multiprocessing.Queue) -> None:
+    queue.put(make_columns(rows))
+
+
+def put_shared(rows: int, queue: multiprocessing.Queue) -> None:
+    shared = SharedColumns.create(make_columns(rows))
+    queue.put(shared.descriptor)
+    shared.close()
+
+
+def measure(target, rows: int) -> float:
+    """
+    Замеряет время передачи столбцов из процесса-обработчика в родительский процесс
+
+    :param target: Функция процесса-обработчика
+    :param rows: Количество строк
+    :return: Возвращает время от запуска процесса до получения суммы зарплат родителем в секундах
+    """
+    queue = multiprocessing.Queue()
+    start = time.perf_counter()
+    process = multiprocessing.Process(target=target, args=(rows, queue))
+    process.start()
+    result = queue.get()
+    if target is put_shared:
+        shared = SharedColumns.attach(result)
+        shared['salary'].sum()
+        shared.unlink()
+    else:
+        result['salary'].sum()
+    process.join()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Сравнение передачи столбцов через pickle и разделяемую память')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10 ** 5, 10 ** 6, 10 ** 7])
+    args = parser.parse_args()
+    for rows in args.rows:
+        print(f'{rows} строк: pickle {measure(put_pickled, rows):.3f} с, '
+              f'разделяемая память {measure(put_shared, rows):.3f} с')
@@ -0,0 +1,37 @@
+import multiprocessing
+from unittest import TestCase
+
+import numpy as np
+
+from SharedColumns import SharedColumns
+
+
+def put_columns(queue: multiprocessing.Queue) -> None:
+    shared = SharedColumns.create({'year': np.arange(2007, 2023, dtype=np.int64),
+                                   'city': np.array(['Москва', 'Казань'])})
+    queue.put(shared.descriptor)
+    shared.close()
+
+
+class SharedColumnsTests(TestCase):
+    def test_shared_columns_attach(self):
+        shared = SharedColumns.create({'salary': np.array([1.5, np.nan]), 'count': np.array([3, 4])})
+        attached = SharedColumns.attach(shared.descriptor)
+        self.assertEqual(attached['count'].tolist(), [3, 4])
+        self.assertTrue(np.isnan(attached['salary'][1]))
+        attached.close()
+        shared.unlink()
+
+    def test_shared_columns_process(self):
+        queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=put_columns, args=(queue,))
+        process.start()
+        shared = SharedColumns.attach(queue.get())
+        process.join()
+        self.assertEqual(shared['year'][-1], 2022)
+        self.assertEqual(shared['city'].tolist(), ['Москва', 'Казань'])
+        shared.unlink()
+
+    def test_shared_columns_object(self):
+        with self.assertRaises(TypeError):
+            SharedColumns.create({'city': np.array(['Москва', None], dtype=object)})
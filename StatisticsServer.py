@@ -0,0 +1,186 @@
+import argparse
+import asyncio
+import json
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, Optional, Tuple
+
+from aiohttp import web
+
+from GeneratePDF import DataSet, AnalysisResult
+
+
+HOST = '127.0.0.1'
+PORT = 8080
+WORKERS = os.cpu_count() or 1
+CACHE_SIZE = 256
+STATISTICS = ('salary_by_year', 'count_by_year', 'selected_salary_by_year', 'selected_count_by_year',
+              'salary_by_area', 'fraction_by_area')
+
+dataset = None
+
+
+def load_dataset(file_name: str) -> None:
+    """
+    Загружает набор данных в процессе-обработчике один раз при его запуске
+
+    :param file_name: Название файла исходных данных
+    """
+    global dataset
+    dataset = DataSet(file_name)
+
+
+def get_dataset_size() -> int:
+    return len(dataset.vacancies_objects)
+
+
+def get_statistics(profession_name: str, area_name: Optional[str]) -> Dict[str, Dict]:
+    """
+    Рассчитывает статистику по загруженному в процесс набору данных
+
+    :param profession_name: Название профессии
+    :param area_name: Название региона для статистики по профессии (None - без отбора по региону)
+    :return: Возвращает словарь в виде {статистика: словарь}
+    """
+    return AnalysisResult(dataset, profession_name, area_name).get_results().get_report().get_statistics()
+
+
+def json_response(data: Dict) -> web.Response:
+    return web.json_response(data, dumps=partial(json.dumps, ensure_ascii=False))
+
+
+class StatisticsServer:
+    """
+    Класс для представления локального HTTP-сервиса статистики. Набор данных загружается один раз в каждом
+    процессе пула, цикл asyncio только принимает запросы и передает расчеты в пул. Последние результаты
+    хранятся в памяти, одинаковые одновременные запросы ожидают один общий расчет
+
+    Attributes:
+        file_name (str): Название файла исходных данных
+        workers (int): Количество процессов-обработчиков
+        cache_size (int): Количество результатов, хранимых в памяти
+        cache (OrderedDict): Словарь в виде {(профессия, регион): статистика} в порядке последнего использования
+        pending (Dict[Tuple, Future]): Расчеты, которые выполняются сейчас
+        executor (ProcessPoolExecutor): Пул процессов-обработчиков
+        vacancies (int): Количество загруженных вакансий
+    """
+    def __init__(self, file_name: str, workers: int = WORKERS, cache_size: int = CACHE_SIZE):
+        """
+        Инициализирует объект StatisticsServer
+
+        :param file_name: Название файла исходных данных
+        :param workers: Количество процессов-обработчиков
+        :param cache_size: Количество результатов, хранимых в памяти
+        """
+        self.file_name = file_name
+        self.workers = workers
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.pending = {}
+        self.executor = None
+        self.vacancies = 0
+
+    async def start(self, app: web.Application) -> None:
+        """
+        Запускает пул процессов и дожидается загрузки набора данных в каждом из них
+
+        :param app: Приложение aiohttp
+        """
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=load_dataset,
+                                            initargs=(self.file_name,))
+        loop = asyncio.get_running_loop()
+        sizes = await asyncio.gather(*[loop.run_in_executor(self.executor, get_dataset_size)
+                                       for _ in range(self.workers)])
+        self.vacancies = sizes[0]
+
+    async def stop(self, app: web.Application) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    async def get_statistics(self, profession_name: str, area_name: Optional[str]) -> Dict[str, Dict]:
+        """
+        Возвращает статистику из памяти или рассчитывает ее в пуле процессов
+
+        :param profession_name: Название профессии
+        :param area_name: Название региона для статистики по профессии (None - без отбора по региону)
+        :return: Возвращает словарь в виде {статистика: словарь}
+        """
+        key = (profession_name, area_name)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        if key not in self.pending:
+            future = asyncio.get_running_loop().run_in_executor(self.executor, get_statistics, *key)
+            future.add_done_callback(partial(self.finish, key))
+            self.pending[key] = future
+        return await asyncio.shield(self.pending[key])
+
+    def finish(self, key: Tuple[str, Optional[str]], future: asyncio.Future) -> None:
+        """
+        Сохраняет в памяти завершенный расчет и удаляет давно не использованные результаты
+
+        :param key: Профессия и регион
+        :param future: Завершенный расчет
+        """
+        self.pending.pop(key, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        self.cache[key] = future.result()
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    @staticmethod
+    def get_parameters(request: web.Request) -> Tuple[str, Optional[str]]:
+        """
+        Извлекает параметры запроса
+
+        :param request: Запрос
+        :return: Возвращает название профессии и региона (None - без отбора по региону)
+        """
+        profession_name = request.query.get('profession', '').strip()
+        if not profession_name:
+            raise web.HTTPBadRequest(text='Не указан параметр profession')
+        return profession_name, request.query.get('region', '').strip() or None
+
+    async def handle_statistics(self, request: web.Request) -> web.Response:
+        profession_name, area_name = self.get_parameters(request)
+        statistics = await self.get_statistics(profession_name, area_name)
+        return json_response({'profession': profession_name, 'region': area_name, 'statistics': statistics})
+
+    async def handle_statistic(self, request: web.Request) -> web.Response:
+        statistic = request.match_info['statistic']
+        if statistic not in STATISTICS:
+            raise web.HTTPNotFound(text=f'Неизвестная статистика: {statistic}')
+        profession_name, area_name = self.get_parameters(request)
+        statistics = await self.get_statistics(profession_name, area_name)
+        return json_response({'profession': profession_name, 'region': area_name, statistic: statistics[statistic]})
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        return json_response({'vacancies': self.vacancies, 'cached': len(self.cache)})
+
+    def make_app(self) -> web.Application:
+        """
+        Создает приложение aiohttp с маршрутами сервиса
+
+        :return: Возвращает приложение aiohttp
+        """
+        app = web.Application()
+        app.router.add_get('/health', self.handle_health)
+        app.router.add_get('/statistics', self.handle_statistics)
+        app.router.add_get('/statistics/{statistic}', self.handle_statistic)
+        app.on_startup.append(self.start)
+        app.on_cleanup.append(self.stop)
+        return app
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Локальный HTTP-сервис статистики по вакансиям')
+    parser.add_argument('file_name', help='Название файла исходных данных')
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--workers', type=int, default=WORKERS)
+    parser.add_argument('--cache-size', type=int, default=CACHE_SIZE)
+    args = parser.parse_args()
+    web.run_app(StatisticsServer(args.file_name, args.workers, args.cache_size).make_app(),
+                host=args.host, port=args.port)
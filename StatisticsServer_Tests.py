@@ -0,0 +1,55 @@
+import asyncio
+import json
+
+from aiohttp.test_utils import AioHTTPTestCase
+
+from GeneratePDF import DataSet, AnalysisResult
+from StatisticsServer import StatisticsServer
+
+
+class StatisticsServerTests(AioHTTPTestCase):
+    dataset = DataSet('vaca.csv')
+
+    async def get_application(self):
+        self.statistics_server = StatisticsServer('vaca.csv', workers=1, cache_size=2)
+        return self.statistics_server.make_app()
+
+    def get_expected(self, profession_name, area_name=None):
+        statistics = AnalysisResult(self.dataset, profession_name, area_name).get_results().get_report()
+        return json.loads(json.dumps(statistics.get_statistics()))
+
+    async def test_statistics(self):
+        async with self.client.get('/statistics', params={'profession': 'Программист'}) as response:
+            self.assertEqual(response.status, 200)
+            data = await response.json()
+        self.assertIsNone(data['region'])
+        self.assertEqual(data['statistics'], self.get_expected('Программист'))
+
+    async def test_region(self):
+        area_name = self.dataset.vacancies_objects[0].area_name
+        params = {'profession': 'Специалист', 'region': area_name}
+        async with self.client.get('/statistics', params=params) as response:
+            data = (await response.json())['statistics']
+        self.assertEqual(data, self.get_expected('Специалист', area_name))
+        self.assertEqual(sum(data['count_by_year'].values()), len(self.dataset.vacancies_objects))
+        self.assertEqual(data['fraction_by_area'], self.get_expected('Специалист')['fraction_by_area'])
+        self.assertEqual(sum(data['selected_count_by_year'].values()),
+                         sum(vacancy.area_name == area_name and 'Специалист' in vacancy.name
+                             for vacancy in self.dataset.vacancies_objects))
+
+    async def test_bad_requests(self):
+        async with self.client.get('/statistics') as response:
+            self.assertEqual(response.status, 400)
+        async with self.client.get('/statistics/unknown', params={'profession': 'Программист'}) as response:
+            self.assertEqual(response.status, 404)
+
+    async def test_cache(self):
+        responses = await asyncio.gather(*[self.client.get('/statistics', params={'profession': 'Менеджер'})
+                                           for _ in range(5)])
+        self.assertEqual({response.status for response in responses}, {200})
+        self.assertEqual(list(self.statistics_server.cache), [('Менеджер', None)])
+        for name in ['Аналитик', 'Программист', 'Аналитик']:
+            await self.statistics_server.get_statistics(name, None)
+        self.assertEqual(list(self.statistics_server.cache), [('Программист', None), ('Аналитик', None)])
+        async with self.client.get('/health') as response:
+            self.assertEqual(await response.json(), {'vacancies': len(self.dataset.vacancies_objects), 'cached': 2})
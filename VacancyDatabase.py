@@ -0,0 +1,388 @@
+import sqlite3
+from contextlib import contextmanager
+from itertools import islice
+from typing import Tuple, Iterable, Iterator, Any
+
+import pandas as pd
+
+from CurrencyRates import CURRENCY_TABLE, create_rate_table, insert_rates
+
+
+VACANCY_TABLE = 'vacancies'
+VACANCY_COLUMNS = ('name', 'salary', 'salary_currency', 'area_name', 'published_at')
+YEAR_EXPRESSION = 'CAST(substr(published_at, 1, 4) AS INTEGER)'
+VACANCY_INDEXES = {
+    'idx_vacancies_published_at': f'{VACANCY_TABLE} (published_at)',
+    'idx_vacancies_area_name': f'{VACANCY_TABLE} (area_name)',
+    'idx_vacancies_salary_currency': f'{VACANCY_TABLE} (salary_currency)',
+    'idx_vacancies_year_area': f'{VACANCY_TABLE} (year, area_name, salary)'
+}
+NAME_INDEX_TABLE = 'vacancies_fts'
+NAME_INDEX_TRIGGERS = {
+    'trg_vacancies_fts_insert': f'AFTER INSERT ON {VACANCY_TABLE} BEGIN '
+                                f'INSERT INTO {NAME_INDEX_TABLE} (rowid, name) VALUES (NEW.rowid, NEW.name); END',
+    'trg_vacancies_fts_delete': f'AFTER DELETE ON {VACANCY_TABLE} BEGIN '
+                                f'INSERT INTO {NAME_INDEX_TABLE} ({NAME_INDEX_TABLE}, rowid, name) '
+                                f"VALUES ('delete', OLD.rowid, OLD.name); END",
+    'trg_vacancies_fts_update': f'AFTER UPDATE OF name ON {VACANCY_TABLE} BEGIN '
+                                f'INSERT INTO {NAME_INDEX_TABLE} ({NAME_INDEX_TABLE}, rowid, name) '
+                                f"VALUES ('delete', OLD.rowid, OLD.name); "
+                                f'INSERT INTO {NAME_INDEX_TABLE} (rowid, name) VALUES (NEW.rowid, NEW.name); END'
+}
+TRIGRAM_LENGTH = 3
+ROLLUP_TABLE = 'vacancy_rollup'
+PROFESSION_ROLLUP_TABLE = 'profession_rollup'
+ROLLUP_STATE_TABLE = 'rollup_state'
+ROLLUP_NAME = 'vacancies'
+STALE_WATERMARK = -1
+ROLLUP_TRIGGERS = {
+    'trg_vacancies_rollup_delete': f'AFTER DELETE ON {VACANCY_TABLE} '
+                                   f'WHEN OLD.rowid <= (SELECT MAX(watermark) FROM {ROLLUP_STATE_TABLE}) BEGIN '
+                                   f'UPDATE {ROLLUP_STATE_TABLE} SET watermark = {STALE_WATERMARK}; END',
+    'trg_vacancies_rollup_update': f'AFTER UPDATE OF name, salary, salary_currency, area_name, year '
+                                   f'ON {VACANCY_TABLE} '
+                                   f'WHEN OLD.rowid <= (SELECT MAX(watermark) FROM {ROLLUP_STATE_TABLE}) BEGIN '
+                                   f'UPDATE {ROLLUP_STATE_TABLE} SET watermark = {STALE_WATERMARK}; END'
+}
+CURRENCY_INDEXES = {
+    'idx_currency_code': f'{CURRENCY_TABLE} (code)'
+}
+VACANCY_INSERT = (f'INSERT INTO {VACANCY_TABLE} (name, salary, salary_currency, area_name, published_at, year) '
+                  f'VALUES (?1, ?2, ?3, ?4, ?5, CAST(substr(?5, 1, 4) AS INTEGER))')
+BATCH_SIZE = 50000
+
+
+def create_vacancy_table(connect: sqlite3.Connection) -> None:
+    """
+    Создает таблицу вакансий с зарплатой в рублях, если ее нет. Год публикации хранится в обычном столбце year,
+    который заполняет запрос VACANCY_INSERT: индекс с вычисляемым столбцом sqlite не считает покрывающим
+
+    :param connect: Подключение к БД sqlite
+    """
+    connect.execute(f'CREATE TABLE IF NOT EXISTS {VACANCY_TABLE} ('
+                    f'id INTEGER PRIMARY KEY, '
+                    f'name TEXT NOT NULL, '
+                    f'salary REAL, '
+                    f'salary_currency TEXT, '
+                    f'area_name TEXT, '
+                    f'published_at TEXT NOT NULL, '
+                    f'year INTEGER)')
+    create_name_index(connect)
+
+
+def add_year_column(connect: sqlite3.Connection) -> None:
+    """
+    Добавляет столбец year в таблицу вакансий, созданную без него (например, через DataFrame.to_sql),
+    и заполняет год у вакансий, добавленных не через VACANCY_INSERT
+
+    :param connect: Подключение к БД sqlite
+    """
+    columns = [row[1] for row in connect.execute(f'PRAGMA table_info({VACANCY_TABLE})')]
+    if 'year' not in columns:
+        connect.execute(f'ALTER TABLE {VACANCY_TABLE} ADD COLUMN year INTEGER')
+    connect.execute(f'UPDATE {VACANCY_TABLE} SET year = {YEAR_EXPRESSION} WHERE year IS NULL')
+
+
+def insert_vacancies(connect: sqlite3.Connection, rows: Iterable[Tuple[Any, ...]]) -> None:
+    """
+    Добавляет вакансии в таблицу вакансий одним параметризованным запросом
+
+    :param connect: Подключение к БД sqlite
+    :param rows: Вакансии в виде кортежей в порядке VACANCY_COLUMNS
+    """
+    create_vacancy_table(connect)
+    connect.executemany(VACANCY_INSERT, rows)
+    connect.commit()
+
+
+def create_indexes(connect: sqlite3.Connection, indexes: dict) -> None:
+    """
+    Создает индексы, если их нет
+
+    :param connect: Подключение к БД sqlite
+    :param indexes: Словарь в виде {название индекса: таблица (столбцы)}
+    """
+    for name, definition in indexes.items():
+        connect.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {definition}')
+
+
+def drop_indexes(connect: sqlite3.Connection, indexes: dict) -> None:
+    """
+    Удаляет индексы, чтобы при массовой загрузке они не обновлялись на каждую строку
+
+    :param connect: Подключение к БД sqlite
+    :param indexes: Словарь в виде {название индекса: таблица (столбцы)}
+    """
+    for name in indexes:
+        connect.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+def create_triggers(connect: sqlite3.Connection, triggers: dict) -> None:
+    """
+    Создает триггеры, если их нет
+
+    :param connect: Подключение к БД sqlite
+    :param triggers: Словарь в виде {название триггера: определение триггера}
+    """
+    for name, definition in triggers.items():
+        connect.execute(f'CREATE TRIGGER IF NOT EXISTS {name} {definition}')
+
+
+def drop_triggers(connect: sqlite3.Connection, triggers: dict) -> None:
+    """
+    Удаляет триггеры, чтобы при массовой загрузке они не срабатывали на каждую строку
+
+    :param connect: Подключение к БД sqlite
+    :param triggers: Словарь в виде {название триггера: определение триггера}
+    """
+    for name in triggers:
+        connect.execute(f'DROP TRIGGER IF EXISTS {name}')
+
+
+def create_name_index(connect: sqlite3.Connection) -> None:
+    """
+    Создает полнотекстовый индекс FTS5 с токенизатором trigram по названиям вакансий, если его нет.
+    Индекс хранит только триграммы, сами названия берутся из таблицы вакансий. Триггеры поддерживают индекс
+    при добавлении, изменении и удалении вакансий
+
+    :param connect: Подключение к БД sqlite
+    """
+    exists = connect.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (NAME_INDEX_TABLE,)).fetchone()
+    if not exists:
+        connect.execute(f"CREATE VIRTUAL TABLE {NAME_INDEX_TABLE} "
+                        f"USING fts5(name, content='{VACANCY_TABLE}', tokenize='trigram')")
+        rebuild_name_index(connect)
+    create_triggers(connect, NAME_INDEX_TRIGGERS)
+
+
+def rebuild_name_index(connect: sqlite3.Connection) -> None:
+    """
+    Перестраивает полнотекстовый индекс по всем вакансиям таблицы
+
+    :param connect: Подключение к БД sqlite
+    """
+    connect.execute(f"INSERT INTO {NAME_INDEX_TABLE} ({NAME_INDEX_TABLE}) VALUES ('rebuild')")
+
+
+def get_name_pattern(vacancy_name: str) -> str:
+    """
+    Формирует шаблон LIKE для поиска профессии в названии вакансии. Символы % и _ из названия профессии
+    не считаются подстановочными
+
+    :param vacancy_name: Название профессии
+    :return: Возвращает шаблон для LIKE с ESCAPE '\\'
+    """
+    name = vacancy_name.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{name}%'
+
+
+def get_name_match(vacancy_name: str) -> Tuple[str, str]:
+    """
+    Формирует запрос идентификаторов вакансий, в названии которых встречается профессия. Названия из трех
+    и более символов ищутся по триграммам индекса без учета регистра (в том числе для кириллицы),
+    более короткие - перебором названий через LIKE, который не учитывает регистр только для латиницы
+
+    :param vacancy_name: Название профессии
+    :return: Возвращает запрос с параметром :name, возвращающий столбец id, и значение параметра
+    """
+    if len(vacancy_name) >= TRIGRAM_LENGTH:
+        return (f'SELECT rowid AS id FROM {NAME_INDEX_TABLE} WHERE {NAME_INDEX_TABLE} MATCH :name',
+                '"' + vacancy_name.replace('"', '""') + '"')
+    return (f"SELECT rowid AS id FROM {NAME_INDEX_TABLE} WHERE name LIKE :name ESCAPE '\\'",
+            get_name_pattern(vacancy_name))
+
+
+def create_rollup_tables(connect: sqlite3.Connection) -> None:
+    """
+    Создает таблицы предварительно рассчитанных сумм, если их нет: по всем вакансиям и по вакансиям профессий
+    в разрезе (год, город, валюта). Пустые город и валюта хранятся как ''. В таблице состояния для каждой свертки
+    хранится наибольший учтенный rowid вакансии. Изменение или удаление учтенных вакансий сбрасывает его
+    в STALE_WATERMARK, и при следующем обновлении свертки пересчитываются полностью
+
+    :param connect: Подключение к БД sqlite
+    """
+    connect.execute(f'CREATE TABLE IF NOT EXISTS {ROLLUP_STATE_TABLE} ('
+                    f'name TEXT PRIMARY KEY, '
+                    f'watermark INTEGER NOT NULL)')
+    connect.execute(f'CREATE TABLE IF NOT EXISTS {ROLLUP_TABLE} ('
+                    f'year INTEGER NOT NULL, '
+                    f'area_name TEXT NOT NULL, '
+                    f'salary_currency TEXT NOT NULL, '
+                    f'count INTEGER NOT NULL, '
+                    f'salary_count INTEGER NOT NULL, '
+                    f'salary_sum REAL NOT NULL, '
+                    f'PRIMARY KEY (year, area_name, salary_currency)) WITHOUT ROWID')
+    connect.execute(f'CREATE TABLE IF NOT EXISTS {PROFESSION_ROLLUP_TABLE} ('
+                    f'profession TEXT NOT NULL, '
+                    f'year INTEGER NOT NULL, '
+                    f'area_name TEXT NOT NULL, '
+                    f'salary_currency TEXT NOT NULL, '
+                    f'count INTEGER NOT NULL, '
+                    f'salary_count INTEGER NOT NULL, '
+                    f'salary_sum REAL NOT NULL, '
+                    f'PRIMARY KEY (profession, year, area_name, salary_currency)) WITHOUT ROWID')
+    create_triggers(connect, ROLLUP_TRIGGERS)
+
+
+def clear_rollups(connect: sqlite3.Connection) -> None:
+    """
+    Обнуляет свертки, сохраняя список профессий, для которых они ведутся
+
+    :param connect: Подключение к БД sqlite
+    """
+    create_rollup_tables(connect)
+    connect.execute(f'UPDATE {ROLLUP_STATE_TABLE} SET watermark = {STALE_WATERMARK}')
+    connect.execute(f'DELETE FROM {ROLLUP_TABLE}')
+    connect.execute(f'DELETE FROM {PROFESSION_ROLLUP_TABLE}')
+
+
+def get_rollup_upsert(table: str, key_columns: str, select: str) -> str:
+    """
+    Формирует запрос, добавляющий суммы новых вакансий к строкам свертки
+
+    :param table: Таблица свертки
+    :param key_columns: Столбцы первичного ключа свертки через запятую
+    :param select: Запрос, возвращающий ключ и суммы (count, salary_count, salary_sum)
+    :return: Возвращает текст запроса
+    """
+    return (f'INSERT INTO {table} ({key_columns}, count, salary_count, salary_sum) {select} '
+            f'ON CONFLICT ({key_columns}) DO UPDATE SET count = count + excluded.count, '
+            f'salary_count = salary_count + excluded.salary_count, salary_sum = salary_sum + excluded.salary_sum')
+
+
+def refresh_rollups(connect: sqlite3.Connection, professions: Iterable[str] = ()) -> int:
+    """
+    Добавляет к сверткам вакансии, появившиеся после прошлого обновления (с rowid больше сохраненного).
+    Обновляются свертка по всем вакансиям, свертки уже учтенных профессий и свертки новых профессий.
+    Если новых вакансий нет, БД не изменяется, и отпечаток файла БД для кэша результатов остается прежним
+
+    :param connect: Подключение к БД sqlite
+    :param professions: Профессии, для которых нужно начать вести свертку
+    :return: Возвращает количество обновленных сверток
+    """
+    create_rollup_tables(connect)
+    connect.executemany(f'INSERT OR IGNORE INTO {ROLLUP_STATE_TABLE} (name, watermark) VALUES (?, ?)',
+                        [(ROLLUP_NAME, STALE_WATERMARK)] +
+                        [(f'profession:{profession}', STALE_WATERMARK) for profession in professions])
+    max_rowid = connect.execute(f'SELECT IFNULL(MAX(rowid), 0) FROM {VACANCY_TABLE}').fetchone()[0]
+    states = connect.execute(f'SELECT name, watermark FROM {ROLLUP_STATE_TABLE} WHERE watermark < ?',
+                             (max_rowid,)).fetchall()
+    for name, watermark in states:
+        parameters = {'watermark': watermark, 'max_rowid': max_rowid}
+        if name == ROLLUP_NAME:
+            if watermark <= 0:
+                connect.execute(f'DELETE FROM {ROLLUP_TABLE}')
+            connect.execute(get_rollup_upsert(
+                ROLLUP_TABLE, 'year, area_name, salary_currency',
+                f"SELECT year, IFNULL(area_name, ''), IFNULL(salary_currency, ''), "
+                f'COUNT(*), COUNT(salary), TOTAL(salary) FROM {VACANCY_TABLE} '
+                f'WHERE rowid > :watermark AND rowid <= :max_rowid GROUP BY 1, 2, 3'), parameters)
+        else:
+            parameters['profession'] = name.partition(':')[2]
+            if watermark <= 0:
+                connect.execute(f'DELETE FROM {PROFESSION_ROLLUP_TABLE} WHERE profession = :profession', parameters)
+            name_match, parameters['name'] = get_name_match(parameters['profession'])
+            connect.execute(get_rollup_upsert(
+                PROFESSION_ROLLUP_TABLE, 'profession, year, area_name, salary_currency',
+                f"SELECT :profession, vacancy.year, IFNULL(vacancy.area_name, ''), "
+                f"IFNULL(vacancy.salary_currency, ''), COUNT(*), COUNT(vacancy.salary), TOTAL(vacancy.salary) "
+                f'FROM ({name_match}) AS selected JOIN {VACANCY_TABLE} AS vacancy ON vacancy.rowid = selected.id '
+                f'WHERE selected.id > :watermark AND selected.id <= :max_rowid GROUP BY 2, 3, 4'), parameters)
+        connect.execute(f'UPDATE {ROLLUP_STATE_TABLE} SET watermark = ? WHERE name = ?', (max_rowid, name))
+    connect.commit()
+    return len(states)
+
+
+@contextmanager
+def bulk_load(connect: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """
+    Выполняет массовую загрузку в одной транзакции с настройками БД для загрузки: журнал WAL,
+    без синхронизации с диском на время загрузки, временные данные в памяти. При ошибке транзакция откатывается
+
+    :param connect: Подключение к БД sqlite
+    :return: Возвращает подключение к БД с открытой транзакцией
+    """
+    connect.execute('PRAGMA journal_mode = WAL')
+    connect.execute('PRAGMA synchronous = OFF')
+    connect.execute('PRAGMA temp_store = MEMORY')
+    connect.execute('PRAGMA cache_size = -65536')
+    try:
+        connect.execute('BEGIN')
+        yield connect
+        connect.execute('COMMIT')
+    except BaseException:
+        connect.execute('ROLLBACK')
+        raise
+    finally:
+        connect.execute('PRAGMA synchronous = NORMAL')
+
+
+def get_batches(rows: Iterable[Tuple[Any, ...]], batch_size: int = BATCH_SIZE) -> Iterator[list]:
+    """
+    Делит строки на пакеты фиксированного размера
+
+    :param rows: Строки для загрузки
+    :param batch_size: Размер пакета
+    :return: Возвращает итератор по пакетам строк
+    """
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_size)):
+        yield batch
+
+
+def load_vacancies(db_name: str, df: pd.DataFrame, replace: bool = True, batch_size: int = BATCH_SIZE) -> int:
+    """
+    Загружает вакансии в таблицу vacancies: пакетами executemany в одной транзакции, индексы по дате публикации,
+    городу и валюте и полнотекстовый индекс по названиям строятся после загрузки
+
+    :param db_name: Имя файла БД
+    :param df: Фрейм вакансий со столбцами VACANCY_COLUMNS (отсутствующие столбцы и значения NaN загружаются как NULL)
+    :param replace: Удалить ли прежние вакансии перед загрузкой
+    :param batch_size: Количество строк в одном executemany
+    :return: Возвращает количество загруженных вакансий
+    """
+    connect = sqlite3.connect(db_name, isolation_level=None)
+    try:
+        with bulk_load(connect):
+            create_vacancy_table(connect)
+            drop_indexes(connect, VACANCY_INDEXES)
+            drop_triggers(connect, NAME_INDEX_TRIGGERS)
+            drop_triggers(connect, ROLLUP_TRIGGERS)
+            if replace:
+                connect.execute(f'DELETE FROM {VACANCY_TABLE}')
+                clear_rollups(connect)
+            rows = zip(*[column.tolist() for _, column in df.reindex(columns=list(VACANCY_COLUMNS)).items()])
+            for batch in get_batches(rows, batch_size):
+                connect.executemany(VACANCY_INSERT, batch)
+            rebuild_name_index(connect)
+            create_triggers(connect, NAME_INDEX_TRIGGERS)
+            create_rollup_tables(connect)
+            create_indexes(connect, VACANCY_INDEXES)
+        connect.execute('ANALYZE')
+    finally:
+        connect.close()
+    return len(df)
+
+
+def load_currency(db_name: str, currency_df: pd.DataFrame, replace: bool = True) -> int:
+    """
+    Загружает курсы валют в нормализованную таблицу currency (месяц, валюта, курс) в одной транзакции,
+    индекс по валюте строится после загрузки
+
+    :param db_name: Имя файла БД
+    :param currency_df: Фрейм с курсами валют, в столбце date - месяц в формате ГГГГ-ММ, в остальных - валюты
+    :param replace: Удалить ли прежние курсы перед загрузкой
+    :return: Возвращает количество загруженных курсов
+    """
+    connect = sqlite3.connect(db_name, isolation_level=None)
+    try:
+        with bulk_load(connect):
+            create_rate_table(connect)
+            drop_indexes(connect, CURRENCY_INDEXES)
+            if replace:
+                connect.execute(f'DELETE FROM {CURRENCY_TABLE}')
+            count = insert_rates(currency_df, connect)
+            create_indexes(connect, CURRENCY_INDEXES)
+    finally:
+        connect.close()
+    return count
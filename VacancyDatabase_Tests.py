@@ -0,0 +1,121 @@
+import os
+import sqlite3
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from VacancyDatabase import load_vacancies
+from VacancyDatabase import load_currency
+from VacancyDatabase import get_batches
+from VacancyDatabase import VACANCY_INDEXES
+from VacancyDatabase import create_vacancy_table
+from VacancyDatabase import insert_vacancies
+from VacancyDatabase import get_name_match
+
+
+VACANCIES = pd.DataFrame({'name': ['Программист', 'Аналитик', 'Тестировщик'],
+                          'salary': [100000.0, np.nan, 50000.0],
+                          'salary_currency': ['RUR', 'USD', None],
+                          'area_name': ['Москва', 'Казань', np.nan],
+                          'published_at': ['2022-01-01T10:00:00+0300', '2022-02-01T10:00:00+0300',
+                                           '2021-03-01T10:00:00+0300']})
+CURRENCY = pd.DataFrame({'date': ['2022-01', '2022-02'],
+                         'EUR': [87.0, None],
+                         'USD': [77.0, 78.0]})
+
+
+class LoadTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db_name = os.path.join(self.directory.name, 'vacancies.db')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def query(self, sql):
+        connect = sqlite3.connect(self.db_name)
+        try:
+            return connect.execute(sql).fetchall()
+        finally:
+            connect.close()
+
+    def test_load_vacancies(self):
+        self.assertEqual(load_vacancies(self.db_name, VACANCIES, batch_size=2), 3)
+        self.assertEqual(self.query('SELECT name, salary, salary_currency, area_name FROM vacancies ORDER BY id'),
+                         [('Программист', 100000.0, 'RUR', 'Москва'), ('Аналитик', None, 'USD', 'Казань'),
+                          ('Тестировщик', 50000.0, None, None)])
+
+    def test_load_vacancies_replace(self):
+        load_vacancies(self.db_name, VACANCIES)
+        load_vacancies(self.db_name, VACANCIES.drop(columns='salary_currency'))
+        self.assertEqual(self.query('SELECT COUNT(*), COUNT(salary_currency) FROM vacancies'), [(3, 0)])
+        load_vacancies(self.db_name, VACANCIES, replace=False)
+        self.assertEqual(self.query('SELECT COUNT(*) FROM vacancies'), [(6,)])
+
+    def test_load_vacancies_indexes(self):
+        load_vacancies(self.db_name, VACANCIES)
+        indexes = {row[0] for row in self.query("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertTrue(set(VACANCY_INDEXES) <= indexes)
+        self.assertEqual(self.query('PRAGMA journal_mode'), [('wal',)])
+
+    def test_load_vacancies_rollback(self):
+        load_vacancies(self.db_name, VACANCIES)
+        with self.assertRaises(sqlite3.IntegrityError):
+            load_vacancies(self.db_name, VACANCIES.assign(name=['Программист', None, 'Аналитик']))
+        self.assertEqual(self.query('SELECT COUNT(*) FROM vacancies'), [(3,)])
+
+    def test_load_currency(self):
+        self.assertEqual(load_currency(self.db_name, CURRENCY), 3)
+        self.assertEqual(self.query('SELECT date, code, rate FROM currency ORDER BY date, code'),
+                         [('2022-01', 'EUR', 87.0), ('2022-01', 'USD', 77.0), ('2022-02', 'USD', 78.0)])
+        load_currency(self.db_name, CURRENCY.drop(columns='EUR'))
+        self.assertEqual(self.query('SELECT COUNT(*) FROM currency'), [(2,)])
+
+
+class NameIndexTests(TestCase):
+    def setUp(self):
+        self.connect = sqlite3.connect(':memory:')
+        create_vacancy_table(self.connect)
+        insert_vacancies(self.connect, [('Программист Python', 100.0, 'RUR', 'Москва', '2022-01-01T10:00:00+0300'),
+                                        ('Java developer', 200.0, 'RUR', 'Казань', '2022-01-01T10:00:00+0300')])
+
+    def tearDown(self):
+        self.connect.close()
+
+    def match(self, vacancy_name):
+        query, name = get_name_match(vacancy_name)
+        return [row[0] for row in self.connect.execute(f'{query} ORDER BY id', {'name': name})]
+
+    def test_match_ignores_case(self):
+        self.assertEqual(self.match('программист'), [1])
+        self.assertEqual(self.match('PYTHON'), [1])
+        self.assertEqual(self.match('"dev'), [])
+
+    def test_match_short_name(self):
+        self.assertEqual(self.match('ja'), [2])
+        self.assertEqual(self.match('_'), [])
+
+    def test_triggers_sync_index(self):
+        self.connect.execute("UPDATE vacancies SET name = 'Python developer' WHERE id = 2")
+        self.connect.execute('DELETE FROM vacancies WHERE id = 1')
+        self.assertEqual(self.match('python'), [2])
+        self.assertEqual(self.match('программист'), [])
+
+    def test_load_rebuilds_index(self):
+        with tempfile.TemporaryDirectory() as directory:
+            db_name = os.path.join(directory, 'vacancies.db')
+            load_vacancies(db_name, VACANCIES)
+            load_vacancies(db_name, VACANCIES.iloc[1:], replace=False)
+            connect = sqlite3.connect(db_name)
+            query, name = get_name_match('аналитик')
+            self.assertEqual(len(connect.execute(query, {'name': name}).fetchall()), 2)
+            connect.execute("INSERT INTO vacancies_fts (vacancies_fts) VALUES ('integrity-check')")
+            connect.close()
+
+
+class BatchTests(TestCase):
+    def test_get_batches(self):
+        self.assertEqual(list(get_batches(range(5), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(get_batches([], 2)), [])
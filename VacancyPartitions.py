@@ -0,0 +1,652 @@
+import base64
+import csv
+import json
+import math
+import os
+import zlib
+from collections import OrderedDict
+from typing import List, Dict, Tuple, Any, TextIO
+
+import numpy as np
+import pandas as pd
+
+from DictionaryEncoding import SymbolTable
+
+
+MANIFEST_NAME = 'manifest.json'
+GRANULARITIES = ('year', 'month')
+FILE_FORMATS = ('csv', 'npy')
+NUMERIC_COLUMNS = ('salary_from', 'salary_to', 'salary')
+DATE_COLUMNS = ('published_at',)
+MAX_DISTINCT_AREAS = 256
+NGRAM_SIZE = 3
+
+
+def get_partition_key(published_at: str, granularity: str) -> Tuple[str, ...]:
+    """
+    Определяет ключ партиции вакансии по дате публикации
+
+    :param published_at: Дата публикации вакансии в формате ISO 8601
+    :param granularity: Гранулярность деления ('year' или 'month')
+    :return: Возвращает ключ партиции в виде (год,) или (год, месяц)
+    """
+    if granularity == 'year':
+        return published_at[:4],
+    return published_at[:4], published_at[5:7]
+
+
+def get_partition_dir(key: Tuple[str, ...]) -> str:
+    """
+    Формирует относительный путь каталога партиции в формате hive (year=2007/month=12)
+
+    :param key: Ключ партиции
+    :return: Возвращает относительный путь каталога партиции
+    """
+    return os.path.join(*[f'{name}={value}' for name, value in zip(GRANULARITIES, key)])
+
+
+class WriterPool:
+    """
+    Класс для представления ограниченного набора открытых csv-файлов партиций.
+    При превышении лимита закрывается файл, который дольше всех не использовался
+
+    Attributes:
+        output_dir (str): Каталог для сохранения партиций
+        list_naming (List[str]): Заголовки файла
+        max_open_files (int): Максимальное количество одновременно открытых файлов
+        handles (OrderedDict): Открытые файлы в порядке последнего использования
+        counts (Dict[Tuple[str, ...], int]): Словарь в виде {ключ партиции: количество строк}
+    """
+
+    def __init__(self, output_dir: str, list_naming: List[str], max_open_files: int = 32):
+        """
+        Инициализирует объект WriterPool
+
+        :param output_dir: Каталог для сохранения партиций
+        :param list_naming: Заголовки файла
+        :param max_open_files: Максимальное количество одновременно открытых файлов
+        """
+        if max_open_files < 1:
+            raise ValueError('Количество открытых файлов должно быть положительным')
+        self.output_dir = output_dir
+        self.list_naming = list_naming
+        self.max_open_files = max_open_files
+        self.handles = OrderedDict()
+        self.counts = {}
+
+    @staticmethod
+    def get_relative_path(key: Tuple[str, ...]) -> str:
+        """
+        Формирует путь к файлу партиции относительно каталога партиций
+
+        :param key: Ключ партиции
+        :return: Возвращает относительный путь к файлу партиции
+        """
+        return os.path.join(get_partition_dir(key), 'part.csv')
+
+    def get_path(self, key: Tuple[str, ...]) -> str:
+        """
+        Формирует путь к файлу партиции
+
+        :param key: Ключ партиции
+        :return: Возвращает путь к файлу партиции
+        """
+        return os.path.join(self.output_dir, self.get_relative_path(key))
+
+    def __open(self, key: Tuple[str, ...]) -> Tuple[TextIO, Any]:
+        """
+        Открывает файл партиции: новый файл создается с заголовками, ранее закрытый дописывается
+
+        :param key: Ключ партиции
+        :return: Возвращает открытый файл и объект записи csv
+        """
+        if len(self.handles) >= self.max_open_files:
+            self.handles.popitem(last=False)[1][0].close()
+        path = self.get_path(key)
+        if key in self.counts:
+            file = open(path, mode='a', encoding='utf-8', newline='')
+            writer = csv.writer(file, lineterminator='\n')
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            file = open(path, mode='w', encoding='utf-8', newline='')
+            writer = csv.writer(file, lineterminator='\n')
+            writer.writerow(self.list_naming)
+            self.counts[key] = 0
+        self.handles[key] = (file, writer)
+        return file, writer
+
+    def write(self, key: Tuple[str, ...], row: List[str]) -> None:
+        """
+        Записывает строку в файл партиции
+
+        :param key: Ключ партиции
+        :param row: Строка данных
+        """
+        handle = self.handles.get(key)
+        if handle is None:
+            handle = self.__open(key)
+        else:
+            self.handles.move_to_end(key)
+        handle[1].writerow(row)
+        self.counts[key] += 1
+
+    def close(self) -> None:
+        """
+        Закрывает все открытые файлы партиций
+        """
+        while self.handles:
+            self.handles.popitem()[1][0].close()
+
+
+def get_column_type(column_name: str) -> str:
+    """
+    Определяет тип хранения столбца в колоночном формате
+
+    :param column_name: Название столбца
+    :return: Возвращает тип столбца ('float64', 'datetime64[s]' или 'string')
+    """
+    if column_name in NUMERIC_COLUMNS:
+        return 'float64'
+    if column_name in DATE_COLUMNS:
+        return 'datetime64[s]'
+    return 'string'
+
+
+class ColumnarWriter:
+    """
+    Класс для записи партиций в колоночном формате: каждый столбец партиции хранится в отдельном .npy файле.
+    Строковые столбцы хранятся в словарной кодировке: коды в [столбец].codes.npy, значения в [столбец].symbols.json.
+    Строки накапливаются в буфере партиции и дописываются в промежуточные файлы, поэтому одновременно
+    открыт не более чем один файл
+
+    Attributes:
+        output_dir (str): Каталог для сохранения партиций
+        list_naming (List[str]): Заголовки файла
+        flush_rows (int): Количество строк в буфере партиции, при котором буфер записывается на диск
+        buffers (Dict[Tuple[str, ...], List[List[str]]]): Буферы строк партиций
+        symbol_tables (Dict[Tuple[str, ...], Dict[str, SymbolTable]]): Таблицы символов строковых столбцов партиций
+        counts (Dict[Tuple[str, ...], int]): Словарь в виде {ключ партиции: количество строк}
+    """
+
+    def __init__(self, output_dir: str, list_naming: List[str], flush_rows: int = 65536):
+        """
+        Инициализирует объект ColumnarWriter
+
+        :param output_dir: Каталог для сохранения партиций
+        :param list_naming: Заголовки файла
+        :param flush_rows: Количество строк в буфере партиции, при котором буфер записывается на диск
+        """
+        self.output_dir = output_dir
+        self.list_naming = list_naming
+        self.flush_rows = flush_rows
+        self.buffers = {}
+        self.symbol_tables = {}
+        self.counts = {}
+
+    @staticmethod
+    def get_relative_path(key: Tuple[str, ...]) -> str:
+        """
+        Формирует путь к каталогу партиции относительно каталога партиций
+
+        :param key: Ключ партиции
+        :return: Возвращает относительный путь к каталогу партиции
+        """
+        return get_partition_dir(key)
+
+    def write(self, key: Tuple[str, ...], row: List[str]) -> None:
+        """
+        Добавляет строку в буфер партиции
+
+        :param key: Ключ партиции
+        :param row: Строка данных
+        """
+        buffer = self.buffers.get(key)
+        if buffer is None:
+            buffer = self.buffers[key] = []
+            self.symbol_tables[key] = {name: SymbolTable() for name in self.list_naming
+                                       if get_column_type(name) == 'string'}
+            self.counts[key] = 0
+            partition_dir = os.path.join(self.output_dir, get_partition_dir(key))
+            os.makedirs(partition_dir, exist_ok=True)
+            for name in self.list_naming:
+                if os.path.exists(os.path.join(partition_dir, f'{name}.bin')):
+                    os.remove(os.path.join(partition_dir, f'{name}.bin'))
+        buffer.append(row)
+        self.counts[key] += 1
+        if len(buffer) >= self.flush_rows:
+            self.__flush(key)
+
+    def __flush(self, key: Tuple[str, ...]) -> None:
+        """
+        Дописывает буфер партиции в промежуточные файлы столбцов
+
+        :param key: Ключ партиции
+        """
+        rows = self.buffers[key]
+        if len(rows) == 0:
+            return
+        partition_dir = os.path.join(self.output_dir, get_partition_dir(key))
+        for index, name in enumerate(self.list_naming):
+            values = [row[index] for row in rows]
+            column_type = get_column_type(name)
+            if column_type == 'string':
+                symbol_table = self.symbol_tables[key][name]
+                data = np.fromiter((symbol_table.encode(value) for value in values), dtype=np.int32, count=len(rows))
+            elif column_type == 'float64':
+                data = np.fromiter((float(value) if value else np.nan for value in values),
+                                   dtype=np.float64, count=len(rows))
+            else:
+                data = np.array([value[:19] for value in values], dtype='datetime64[s]')
+            with open(os.path.join(partition_dir, f'{name}.bin'), mode='ab') as file:
+                data.tofile(file)
+        self.buffers[key] = []
+
+    def close(self) -> None:
+        """
+        Записывает остатки буферов и преобразует промежуточные файлы столбцов в .npy файлы
+        """
+        for key in self.buffers:
+            self.__flush(key)
+            partition_dir = os.path.join(self.output_dir, get_partition_dir(key))
+            for name in self.list_naming:
+                column_type = get_column_type(name)
+                dtype = np.int32 if column_type == 'string' else np.dtype(column_type)
+                raw_path = os.path.join(partition_dir, f'{name}.bin')
+                file_name = f'{name}.codes.npy' if column_type == 'string' else f'{name}.npy'
+                column = np.lib.format.open_memmap(os.path.join(partition_dir, file_name),
+                                                   mode='w+', dtype=dtype, shape=(self.counts[key],))
+                column[:] = np.fromfile(raw_path, dtype=dtype)
+                column.flush()
+                del column
+                os.remove(raw_path)
+                if column_type == 'string':
+                    with open(os.path.join(partition_dir, f'{name}.symbols.json'), mode='w', encoding='utf-8') as file:
+                        json.dump(self.symbol_tables[key][name].symbols, file, ensure_ascii=False)
+        self.buffers = {}
+
+
+class BloomFilter:
+    """
+    Класс для представления фильтра Блума - вероятностного множества без ложноотрицательных ответов.
+    Хеши вычисляются функциями crc32 и adler32, поэтому фильтр одинаково работает в любом процессе
+
+    Attributes:
+        num_bits (int): Размер битового массива
+        num_hashes (int): Количество хеш-функций
+        bits (bytearray): Битовый массив
+    """
+
+    def __init__(self, num_bits: int, num_hashes: int, bits: bytearray = None):
+        """
+        Инициализирует объект BloomFilter
+
+        :param num_bits: Размер битового массива
+        :param num_hashes: Количество хеш-функций
+        :param bits: Битовый массив (по умолчанию - пустой)
+        """
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bytearray((num_bits + 7) // 8) if bits is None else bits
+
+    @classmethod
+    def from_values(cls, values: List[str] or set, error_rate: float = 0.01):
+        """
+        Создает фильтр Блума, размер которого рассчитан на количество значений и допустимую долю ложных ответов
+
+        :param values: Добавляемые значения
+        :param error_rate: Допустимая доля ложноположительных ответов
+        :return: Возвращает объект BloomFilter
+        """
+        num_bits = max(64, int(-len(values) * math.log(error_rate) / math.log(2) ** 2))
+        num_hashes = max(1, round(num_bits / max(len(values), 1) * math.log(2)))
+        bloom_filter = cls(num_bits, num_hashes)
+        for value in values:
+            bloom_filter.add(value)
+        return bloom_filter
+
+    def __positions(self, value: str) -> List[int]:
+        data = value.encode('utf-8')
+        first, second = zlib.crc32(data), zlib.adler32(data) | 1
+        return [(first + i * second) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, value: str) -> None:
+        """
+        Добавляет значение в фильтр
+
+        :param value: Строковое значение
+        """
+        for position in self.__positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self.__positions(value))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Преобразует фильтр в словарь для сохранения в манифест
+
+        :return: Возвращает словарь с параметрами и битовым массивом фильтра в base64
+        """
+        return {'num_bits': self.num_bits,
+                'num_hashes': self.num_hashes,
+                'bits': base64.b64encode(bytes(self.bits)).decode('ascii')}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]):
+        """
+        Восстанавливает фильтр из словаря манифеста
+
+        :param data: Словарь с параметрами и битовым массивом фильтра
+        :return: Возвращает объект BloomFilter
+        """
+        return cls(data['num_bits'], data['num_hashes'], bytearray(base64.b64decode(data['bits'])))
+
+
+def get_ngrams(text: str) -> set:
+    """
+    Разбивает строку на множество подстрок длиной NGRAM_SIZE
+
+    :param text: Исходная строка
+    :return: Возвращает множество подстрок
+    """
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class PartitionStats:
+    """
+    Класс для сбора статистики партиции (zone map), по которой партицию можно пропустить при запросе
+
+    Attributes:
+        rows (int): Количество строк
+        min_date (str): Самая ранняя дата публикации
+        max_date (str): Самая поздняя дата публикации
+        areas (set): Множество названий регионов
+        name_ngrams (set): Множество подстрок названий вакансий длиной NGRAM_SIZE
+    """
+
+    def __init__(self):
+        """
+        Инициализирует объект PartitionStats
+        """
+        self.rows = 0
+        self.min_date = None
+        self.max_date = None
+        self.areas = set()
+        self.name_ngrams = set()
+
+    def add(self, name: str, area_name: str, published_at: str) -> None:
+        """
+        Учитывает строку в статистике партиции
+
+        :param name: Название вакансии
+        :param area_name: Название региона
+        :param published_at: Дата публикации вакансии
+        """
+        self.rows += 1
+        date = published_at[:19]
+        if self.min_date is None or date < self.min_date:
+            self.min_date = date
+        if self.max_date is None or date > self.max_date:
+            self.max_date = date
+        self.areas.add(area_name)
+        self.name_ngrams.update(get_ngrams(name))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Преобразует статистику в словарь для сохранения в манифест. Регионы сохраняются списком, если их не больше
+        MAX_DISTINCT_AREAS, иначе - фильтром Блума
+
+        :return: Возвращает словарь статистики
+        """
+        stats = {'rows': self.rows, 'min_date': self.min_date, 'max_date': self.max_date}
+        if len(self.areas) <= MAX_DISTINCT_AREAS:
+            stats['areas'] = sorted(self.areas)
+        else:
+            stats['areas_bloom'] = BloomFilter.from_values(self.areas).to_dict()
+        stats['name_bloom'] = BloomFilter.from_values(self.name_ngrams).to_dict()
+        return stats
+
+
+def partition_vacancies(file_name: str,
+                        output_dir: str,
+                        granularity: str = 'year',
+                        columns: List[str] = None,
+                        max_open_files: int = 32,
+                        file_format: str = 'csv') -> Dict[str, Any]:
+    """
+    Выполняет разделение csv-файла вакансий на партиции за один проход по файлу.
+    Партиции сохраняются в каталоги формата hive, сведения о партициях - в файл manifest.json
+
+    :param file_name: Название исходного csv-файла
+    :param output_dir: Каталог для сохранения партиций
+    :param granularity: Гранулярность деления ('year' или 'month')
+    :param columns: Сохраняемые столбцы (по умолчанию - все столбцы файла)
+    :param max_open_files: Максимальное количество одновременно открытых файлов (для формата csv)
+    :param file_format: Формат партиций ('csv' или колоночный 'npy')
+    :return: Возвращает содержимое манифеста
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError('Гранулярность задана некорректно')
+    if file_format not in FILE_FORMATS:
+        raise ValueError('Формат партиций задан некорректно')
+    with open(file_name, encoding='utf-8-sig', newline='') as file:
+        reader = csv.reader(file)
+        list_naming = next(reader, None)
+        if not list_naming:
+            raise ValueError('Пустой файл')
+        columns = list_naming if columns is None else columns
+        indexes = [list_naming.index(column) for column in columns]
+        date_index = list_naming.index('published_at')
+        name_index = list_naming.index('name') if 'name' in list_naming else None
+        area_index = list_naming.index('area_name') if 'area_name' in list_naming else None
+        stats = {}
+
+        if file_format == 'csv':
+            pool = WriterPool(output_dir, columns, max_open_files)
+        else:
+            pool = ColumnarWriter(output_dir, columns)
+        skipped_rows = 0
+        try:
+            for row in reader:
+                if len(row) != len(list_naming) or len(row[date_index]) < 7:
+                    skipped_rows += 1
+                    continue
+                key = get_partition_key(row[date_index], granularity)
+                pool.write(key, [row[i] for i in indexes])
+                partition_stats = stats.get(key)
+                if partition_stats is None:
+                    partition_stats = stats[key] = PartitionStats()
+                partition_stats.add(row[name_index] if name_index is not None else '',
+                                    row[area_index] if area_index is not None else '',
+                                    row[date_index])
+        finally:
+            pool.close()
+
+    manifest = {
+        'source': os.path.abspath(file_name),
+        'granularity': granularity,
+        'format': file_format,
+        'columns': columns,
+        'schema': {column: 'string' if file_format == 'csv' else get_column_type(column) for column in columns},
+        'total_rows': sum(pool.counts.values()),
+        'skipped_rows': skipped_rows,
+        'partitions': [dict(zip(GRANULARITIES, map(int, key)),
+                            path=pool.get_relative_path(key),
+                            rows=rows,
+                            stats=stats[key].to_dict())
+                       for key, rows in sorted(pool.counts.items())]
+    }
+    with open(os.path.join(output_dir, MANIFEST_NAME), mode='w', encoding='utf-8') as file:
+        json.dump(manifest, file, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def read_manifest(directory_name: str) -> Dict[str, Any] or None:
+    """
+    Читает манифест каталога партиций
+
+    :param directory_name: Каталог партиций
+    :return: Возвращает содержимое манифеста или None, если манифест отсутствует
+    """
+    path = os.path.join(directory_name, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def list_partitions(directory_name: str) -> List[str]:
+    """
+    Возвращает пути к файлам партиций. Для каталогов без манифеста (старый формат part_[year].csv или
+    [year].csv) возвращаются все csv-файлы каталога
+
+    :param directory_name: Каталог партиций
+    :return: Возвращает список путей к файлам партиций
+    """
+    manifest = read_manifest(directory_name)
+    if manifest is None:
+        return [os.path.join(directory_name, file_name) for file_name in sorted(os.listdir(directory_name))
+                if file_name.endswith('.csv')]
+    return [os.path.join(directory_name, partition['path']) for partition in manifest['partitions']]
+
+
+def read_partition(path: str, columns: List[str] = None, mmap_mode: str = 'r') -> pd.DataFrame:
+    """
+    Читает партицию в DataFrame. Для колоночного формата отображает в память только запрошенные столбцы,
+    строковые столбцы возвращаются в виде Categorical без декодирования кодов
+
+    :param path: Путь к файлу партиции (.csv) или к каталогу партиции в колоночном формате
+    :param columns: Читаемые столбцы (по умолчанию - все столбцы партиции)
+    :param mmap_mode: Режим отображения .npy файлов в память
+    :return: Возвращает фрейм данных партиции
+    """
+    if not os.path.isdir(path):
+        return pd.read_csv(path, usecols=columns)
+    if columns is None:
+        columns = sorted({file_name.split('.')[0] for file_name in os.listdir(path) if file_name.endswith('.npy')})
+    data = {}
+    for name in columns:
+        column_path = os.path.join(path, f'{name}.npy')
+        if os.path.exists(column_path):
+            data[name] = np.load(column_path, mmap_mode=mmap_mode)
+            continue
+        with open(os.path.join(path, f'{name}.symbols.json'), encoding='utf-8') as file:
+            symbols = json.load(file)
+        codes = np.load(os.path.join(path, f'{name}.codes.npy'), mmap_mode=mmap_mode)
+        data[name] = pd.Categorical.from_codes(codes, categories=symbols)
+    return pd.DataFrame(data, columns=columns)
+
+
+def published_year(published_at: pd.Series) -> pd.Series:
+    """
+    Извлекает год публикации вакансий из столбца дат в строковом (csv) или datetime (npy) представлении
+
+    :param published_at: Столбец дат публикации
+    :return: Возвращает столбец годов публикации
+    """
+    if pd.api.types.is_datetime64_any_dtype(published_at):
+        return published_at.dt.year
+    return published_at.astype(str).str[:4].astype(int)
+
+
+def get_year_partials(df: pd.DataFrame) -> Dict[int, Tuple[float, int, int, float, int, int]]:
+    """
+    Формирует частичные данные по годам для одной партиции. Один год может быть разбит на несколько партиций
+    (например, помесячных), поэтому средние считаются только после объединения частичных данных всех партиций
+
+    :param df: Фрейм данных партиции со столбцами salary, published_at (год) и vacancy (признак профессии)
+    :return: Возвращает словарь в виде {год: (сумма зарплат, количество зарплат, количество вакансий,
+    сумма зарплат профессии, количество зарплат профессии, количество вакансий профессии)}
+    """
+    df = df.assign(vacancy_salary=df['salary'].where(df['vacancy']))
+    grouped = df.groupby('published_at').agg(salary_sum=('salary', 'sum'),
+                                             salary_count=('salary', 'count'),
+                                             size=('salary', 'size'),
+                                             vacancy_salary_sum=('vacancy_salary', 'sum'),
+                                             vacancy_salary_count=('vacancy_salary', 'count'),
+                                             vacancy_size=('vacancy', 'sum'))
+    return {int(year): (float(row['salary_sum']), int(row['salary_count']), int(row['size']),
+                        float(row['vacancy_salary_sum']), int(row['vacancy_salary_count']), int(row['vacancy_size']))
+            for year, row in grouped.iterrows()}
+
+
+def merge_year_partials(year_partials: List[Dict[int, Tuple[float, int, int, float, int, int]]]) -> List[Dict]:
+    """
+    Объединяет частичные данные по годам всех партиций
+
+    :param year_partials: Список частичных данных по годам каждой партиции
+    :return: Возвращает словари по годам в порядке возрастания года: уровень зарплат, количество вакансий,
+    уровень зарплат и количество вакансий для выбранной профессии
+    """
+    years = {}
+    for partials in year_partials:
+        for year, values in partials.items():
+            total = years.setdefault(year, [0.0, 0, 0, 0.0, 0, 0])
+            for index, value in enumerate(values):
+                total[index] += value
+    year_salary, count_salary, job_year_salary, job_count_salary = {}, {}, {}, {}
+    for year, (salary_sum, salary_count, size, vacancy_salary_sum, vacancy_salary_count, vacancy_size) \
+            in sorted(years.items()):
+        year_salary[year] = int(salary_sum / salary_count) if salary_count > 0 else 0
+        count_salary[year] = size
+        job_year_salary[year] = int(vacancy_salary_sum / vacancy_salary_count) if vacancy_salary_count > 0 else 0
+        job_count_salary[year] = vacancy_size
+    return [year_salary, count_salary, job_year_salary, job_count_salary]
+
+
+def partition_may_match(partition: Dict[str, Any],
+                        profession_name: str = None,
+                        area_name: str = None,
+                        year_from: int = None,
+                        year_to: int = None) -> bool:
+    """
+    Проверяет по статистике партиции, могут ли в ней быть вакансии, подходящие под условия запроса.
+    Ложноотрицательных ответов не бывает: партиция, для которой возвращено False, точно не содержит таких вакансий
+
+    :param partition: Описание партиции из манифеста
+    :param profession_name: Подстрока названия вакансии (буквальное сравнение с учетом регистра,
+    как в str.contains(regex=False))
+    :param area_name: Точное название региона
+    :param year_from: Начальный год выборки
+    :param year_to: Конечный год выборки
+    :return: Возвращает False, если партицию можно пропустить
+    """
+    stats = partition.get('stats')
+    if stats is None:
+        return True
+    if year_from is not None and int(stats['max_date'][:4]) < year_from:
+        return False
+    if year_to is not None and int(stats['min_date'][:4]) > year_to:
+        return False
+    if area_name is not None:
+        if 'areas' in stats and area_name not in stats['areas']:
+            return False
+        if 'areas_bloom' in stats and area_name not in BloomFilter.from_dict(stats['areas_bloom']):
+            return False
+    if profession_name and len(profession_name) >= NGRAM_SIZE:
+        name_bloom = BloomFilter.from_dict(stats['name_bloom'])
+        if not all(ngram in name_bloom for ngram in get_ngrams(profession_name)):
+            return False
+    return True
+
+
+def prune_partitions(directory_name: str,
+                     profession_name: str = None,
+                     area_name: str = None,
+                     year_from: int = None,
+                     year_to: int = None) -> List[str]:
+    """
+    Возвращает пути к партициям, которые могут содержать вакансии, подходящие под условия запроса
+
+    :param directory_name: Каталог партиций
+    :param profession_name: Подстрока названия вакансии
+    :param area_name: Точное название региона
+    :param year_from: Начальный год выборки
+    :param year_to: Конечный год выборки
+    :return: Возвращает список путей к партициям
+    """
+    manifest = read_manifest(directory_name)
+    if manifest is None:
+        return list_partitions(directory_name)
+    return [os.path.join(directory_name, partition['path']) for partition in manifest['partitions']
+            if partition_may_match(partition, profession_name, area_name, year_from, year_to)]
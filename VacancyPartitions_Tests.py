@@ -0,0 +1,111 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from VacancyPartitions import partition_vacancies
+from VacancyPartitions import list_partitions
+from VacancyPartitions import read_partition
+from VacancyPartitions import published_year
+from VacancyPartitions import prune_partitions
+from VacancyPartitions import BloomFilter
+from VacancyPartitions import get_year_partials
+from VacancyPartitions import merge_year_partials
+
+
+VACANCIES = """name,salary_from,salary_to,salary_currency,area_name,published_at
+Программист,40000.0,55000.0,RUR,Москва,2012-04-09T13:49:00+0400
+Аналитик,,41500.0,RUR,Казань,2012-05-16T12:47:10+0400
+Менеджер,80000.0,100000.0,USD,Москва,2013-01-14T11:18:11+0400
+Java Dev.,90000.0,120000.0,RUR,Москва,2013-02-14T11:18:11+0400
+"""
+
+
+class PartitionTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, 'vacancies.csv')
+        with open(self.file_name, mode='w', encoding='utf-8-sig') as file:
+            file.write(VACANCIES)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_partition_years(self):
+        output_dir = os.path.join(self.directory.name, 'years')
+        manifest = partition_vacancies(self.file_name, output_dir, max_open_files=1)
+        self.assertEqual(manifest['total_rows'], 4)
+        self.assertEqual([(partition['year'], partition['rows']) for partition in manifest['partitions']],
+                         [(2012, 2), (2013, 2)])
+        self.assertEqual(list_partitions(output_dir),
+                         [os.path.join(output_dir, 'year=2012', 'part.csv'),
+                          os.path.join(output_dir, 'year=2013', 'part.csv')])
+        self.assertEqual(list(read_partition(list_partitions(output_dir)[0])['name']), ['Программист', 'Аналитик'])
+
+    def test_partition_months(self):
+        output_dir = os.path.join(self.directory.name, 'months')
+        manifest = partition_vacancies(self.file_name, output_dir, granularity='month')
+        self.assertEqual([partition['path'] for partition in manifest['partitions']],
+                         [os.path.join('year=2012', 'month=04', 'part.csv'),
+                          os.path.join('year=2012', 'month=05', 'part.csv'),
+                          os.path.join('year=2013', 'month=01', 'part.csv'),
+                          os.path.join('year=2013', 'month=02', 'part.csv')])
+
+    def test_partition_columnar(self):
+        output_dir = os.path.join(self.directory.name, 'columnar')
+        manifest = partition_vacancies(self.file_name, output_dir, file_format='npy')
+        self.assertEqual(manifest['schema']['area_name'], 'string')
+        df = read_partition(list_partitions(output_dir)[0], columns=['area_name', 'salary_from', 'published_at'])
+        self.assertEqual(list(df['area_name']), ['Москва', 'Казань'])
+        self.assertEqual(df['salary_from'].isna().tolist(), [False, True])
+        self.assertEqual(list(published_year(df['published_at'])), [2012, 2012])
+
+    def test_partition_stats(self):
+        output_dir = os.path.join(self.directory.name, 'stats')
+        manifest = partition_vacancies(self.file_name, output_dir)
+        stats = manifest['partitions'][0]['stats']
+        self.assertEqual(stats['rows'], 2)
+        self.assertEqual(stats['min_date'], '2012-04-09T13:49:00')
+        self.assertEqual(stats['max_date'], '2012-05-16T12:47:10')
+        self.assertEqual(stats['areas'], ['Казань', 'Москва'])
+
+    def test_prune_partitions(self):
+        output_dir = os.path.join(self.directory.name, 'prune')
+        partition_vacancies(self.file_name, output_dir)
+        first, second = list_partitions(output_dir)
+        self.assertEqual(prune_partitions(output_dir, profession_name='Менеджер'), [second])
+        self.assertEqual(prune_partitions(output_dir, profession_name='грам'), [first])
+        self.assertEqual(prune_partitions(output_dir, area_name='Казань'), [first])
+        self.assertEqual(prune_partitions(output_dir, year_from=2013), [second])
+        self.assertEqual(prune_partitions(output_dir, profession_name='Менеджер', area_name='Казань'), [])
+        self.assertEqual(prune_partitions(output_dir, profession_name='Java Dev.'), [second])
+        self.assertEqual(prune_partitions(output_dir, profession_name='Аналитик.*'), [])
+
+    def test_bloom_filter(self):
+        bloom_filter = BloomFilter.from_values({'Москва', 'Казань'})
+        restored = BloomFilter.from_dict(bloom_filter.to_dict())
+        self.assertIn('Москва', restored)
+        self.assertIn('Казань', restored)
+
+    def test_partition_empty_file(self):
+        empty_file = os.path.join(self.directory.name, 'empty.csv')
+        open(empty_file, mode='w').close()
+        with self.assertRaises(ValueError):
+            partition_vacancies(empty_file, os.path.join(self.directory.name, 'empty'))
+
+    def test_merge_year_partials(self):
+        with open(self.file_name, mode='w', encoding='utf-8-sig') as file:
+            file.write('name,salary_from,salary_to,salary_currency,area_name,published_at\n'
+                       'Программист,100.0,,RUR,Москва,2020-01-10T10:00:00+0300\n'
+                       'Программист,300.0,,RUR,Москва,2020-02-10T10:00:00+0300\n'
+                       'Аналитик,500.0,,RUR,Казань,2020-02-11T10:00:00+0300\n')
+        output_dir = os.path.join(self.directory.name, 'merge')
+        partition_vacancies(self.file_name, output_dir, granularity='month')
+        year_partials = []
+        for path in list_partitions(output_dir):
+            df = read_partition(path)
+            df['salary'] = df[['salary_from', 'salary_to']].mean(axis=1)
+            df['published_at'] = published_year(df['published_at'])
+            df['vacancy'] = df['name'].str.contains('Программист', regex=False)
+            year_partials.append(get_year_partials(df))
+        self.assertEqual(len(year_partials), 2)
+        self.assertEqual(merge_year_partials(year_partials), [{2020: 300}, {2020: 3}, {2020: 200}, {2020: 2}])
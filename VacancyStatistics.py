@@ -0,0 +1,166 @@
+import sqlite3
+from typing import Dict, List, Tuple, Any
+
+import pandas as pd
+
+from VacancyDatabase import VACANCY_TABLE, VACANCY_INDEXES, ROLLUP_TABLE, PROFESSION_ROLLUP_TABLE, add_year_column, \
+    create_indexes, create_name_index, get_name_match
+
+
+STATISTICS = {
+    'salary_by_year': ('Year', 'avg_salary'),
+    'count_by_year': ('Year', 'count_vacancies'),
+    'selected_salary_by_year': ('Year', 'avg_salary_for_selected'),
+    'selected_count_by_year': ('Year', 'count_vacancies_for_selected'),
+    'salary_by_area': ('area_name', 'avg_salary'),
+    'fraction_by_area': ('area_name', 'fraction_vacancies')
+}
+STATISTICS_INDEXES = {name: VACANCY_INDEXES[name] for name in ['idx_vacancies_year_area']}
+AREAS_LIMIT = 10
+
+RAW_PARTS = f'''
+    SELECT year, area_name, COUNT(*) AS count, COUNT(salary) AS salary_count, TOTAL(salary) AS salary_sum
+    FROM {VACANCY_TABLE}
+    GROUP BY year, area_name'''
+RAW_SELECTED_YEARS = f'''
+    SELECT vacancy.year, COUNT(*) AS selected_count, COUNT(vacancy.salary) AS selected_salary_count,
+           TOTAL(vacancy.salary) AS selected_salary_sum
+    FROM ({{name_match}}) AS selected JOIN {VACANCY_TABLE} AS vacancy ON vacancy.rowid = selected.id
+    GROUP BY vacancy.year'''
+ROLLUP_PARTS = f'''
+    SELECT year, NULLIF(area_name, '') AS area_name, SUM(count) AS count, SUM(salary_count) AS salary_count,
+           TOTAL(salary_sum) AS salary_sum
+    FROM {ROLLUP_TABLE}
+    GROUP BY year, area_name'''
+ROLLUP_SELECTED_YEARS = f'''
+    SELECT year, SUM(count) AS selected_count, SUM(salary_count) AS selected_salary_count,
+           TOTAL(salary_sum) AS selected_salary_sum
+    FROM {PROFESSION_ROLLUP_TABLE}
+    WHERE profession = :profession
+    GROUP BY year'''
+
+STATISTICS_QUERY = '''
+WITH parts AS MATERIALIZED ({parts}
+),
+selected_years AS MATERIALIZED ({selected_years}
+),
+years AS (
+    SELECT year, SUM(count) AS count, SUM(salary_count) AS salary_count, TOTAL(salary_sum) AS salary_sum
+    FROM parts
+    GROUP BY year
+),
+areas AS (
+    SELECT area_name, SUM(count) AS count, SUM(salary_count) AS salary_count, TOTAL(salary_sum) AS salary_sum,
+           (SELECT SUM(salary_count) FROM parts) AS total
+    FROM parts
+    GROUP BY area_name
+),
+salary_areas AS (
+    SELECT area_name, ROUND(salary_sum / salary_count) AS value,
+           ROW_NUMBER() OVER (ORDER BY ROUND(salary_sum / salary_count) DESC, area_name) AS position
+    FROM areas
+    WHERE salary_count > 0 AND salary_count >= total / 100
+),
+fraction_areas AS (
+    SELECT area_name, ROUND(salary_count / CAST(total AS REAL), 3) AS value,
+           ROW_NUMBER() OVER (ORDER BY ROUND(salary_count / CAST(total AS REAL), 3) DESC, area_name)
+               AS position
+    FROM areas
+    WHERE count >= total / 100
+)
+SELECT 'salary_by_year', year, ROUND(salary_sum / salary_count), year FROM years WHERE salary_count > 0
+UNION ALL
+SELECT 'count_by_year', year, count, year FROM years
+UNION ALL
+SELECT 'selected_salary_by_year', year, ROUND(selected_salary_sum / selected_salary_count), year
+FROM selected_years WHERE selected_salary_count > 0
+UNION ALL
+SELECT 'selected_count_by_year', year, selected_count, year FROM selected_years
+UNION ALL
+SELECT 'salary_by_area', area_name, value, position FROM salary_areas WHERE position <= :limit
+UNION ALL
+SELECT 'fraction_by_area', area_name, value, position FROM fraction_areas WHERE position <= :limit
+ORDER BY 1, 4
+'''
+
+
+def prepare_statistics(connect: sqlite3.Connection) -> None:
+    """
+    Подготавливает таблицу вакансий к расчету статистики: добавляет столбец года публикации, если его нет,
+    покрывающий индекс (год, город, зарплата), по которому статистика считается без чтения таблицы,
+    и полнотекстовый индекс по названиям для отбора вакансий профессии
+
+    :param connect: Подключение к БД sqlite
+    """
+    add_year_column(connect)
+    create_indexes(connect, STATISTICS_INDEXES)
+    create_name_index(connect)
+    connect.commit()
+
+
+def get_statistics_query(vacancy_name: str, rollup: bool = False) -> Tuple[str, Dict[str, Any]]:
+    """
+    Формирует запрос статистики по таблице вакансий (вакансии профессии отбираются через полнотекстовый индекс)
+    или по сверткам
+
+    :param vacancy_name: Название профессии
+    :param rollup: Считать ли статистику по сверткам
+    :return: Возвращает текст запроса и его параметры (кроме :limit)
+    """
+    if rollup:
+        return STATISTICS_QUERY.format(parts=ROLLUP_PARTS, selected_years=ROLLUP_SELECTED_YEARS), \
+            {'profession': vacancy_name}
+    name_match, name = get_name_match(vacancy_name)
+    return STATISTICS_QUERY.format(parts=RAW_PARTS, selected_years=RAW_SELECTED_YEARS.format(name_match=name_match)), \
+        {'name': name}
+
+
+def get_statistics_rows(connect: sqlite3.Connection,
+                        vacancy_name: str,
+                        limit: int = AREAS_LIMIT,
+                        rollup: bool = False) -> List[tuple]:
+    """
+    Рассчитывает все шесть статистик одним запросом
+
+    :param connect: Подключение к БД sqlite
+    :param vacancy_name: Название профессии
+    :param limit: Количество городов в статистиках по городам
+    :param rollup: Считать ли статистику по сверткам (их нужно предварительно обновить через refresh_rollups)
+    :return: Возвращает строки (статистика, год или город, значение, порядковый номер)
+    """
+    query, parameters = get_statistics_query(vacancy_name, rollup)
+    return connect.execute(query, dict(parameters, limit=limit)).fetchall()
+
+
+def get_statistics(connect: sqlite3.Connection,
+                   vacancy_name: str,
+                   limit: int = AREAS_LIMIT,
+                   rollup: bool = False) -> Dict[str, pd.DataFrame]:
+    """
+    Рассчитывает статистику по вакансиям одним запросом: уровень зарплат и количество вакансий по годам,
+    то же для выбранной профессии, уровень зарплат и доля вакансий по городам
+
+    :param connect: Подключение к БД sqlite
+    :param vacancy_name: Название профессии
+    :param limit: Количество городов в статистиках по городам
+    :param rollup: Считать ли статистику по сверткам (их нужно предварительно обновить через refresh_rollups)
+    :return: Возвращает словарь в виде {статистика: фрейм}, порядок статистик совпадает с STATISTICS
+    """
+    rows = {statistic: [] for statistic in STATISTICS}
+    for statistic, key, value, _ in get_statistics_rows(connect, vacancy_name, limit, rollup):
+        rows[statistic].append((key, value))
+    return {statistic: pd.DataFrame(rows[statistic], columns=list(columns))
+            for statistic, columns in STATISTICS.items()}
+
+
+def explain_statistics(connect: sqlite3.Connection, vacancy_name: str = '', rollup: bool = False) -> List[str]:
+    """
+    Получает план выполнения запроса статистики
+
+    :param connect: Подключение к БД sqlite
+    :param vacancy_name: Название профессии
+    :param rollup: Считать ли статистику по сверткам
+    :return: Возвращает строки плана EXPLAIN QUERY PLAN
+    """
+    query, parameters = get_statistics_query(vacancy_name, rollup)
+    return [row[3] for row in connect.execute(f'EXPLAIN QUERY PLAN {query}', dict(parameters, limit=AREAS_LIMIT))]
@@ -0,0 +1,162 @@
+import sqlite3
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from VacancyDatabase import create_vacancy_table
+from VacancyDatabase import insert_vacancies
+from VacancyDatabase import create_indexes
+from VacancyDatabase import VACANCY_INDEXES
+from VacancyStatistics import prepare_statistics
+from VacancyStatistics import get_statistics
+from VacancyStatistics import explain_statistics
+from VacancyDatabase import get_name_pattern
+from VacancyDatabase import refresh_rollups
+
+
+def make_vacancies(count: int = 3000):
+    rng = np.random.default_rng(1)
+    names = ['Python программист', 'Java developer', 'Аналитик', 'python dev', 'Тестировщик']
+    areas = [f'Город {index}' for index in range(150)] + ['Москва'] * 80 + ['Казань'] * 20
+    return [(str(rng.choice(names)), None if rng.random() < 0.2 else float(rng.integers(10000, 200000)), 'RUR',
+             str(rng.choice(areas)), f'{rng.integers(2007, 2023)}-0{rng.integers(1, 10)}-01T10:00:00+0300')
+            for _ in range(count)]
+
+
+def get_reference(connect: sqlite3.Connection, vacancy_name: str):
+    """
+    Шесть отдельных запросов в том виде, в каком их выполнял 3.5.3.py
+    """
+    pattern = f'%{vacancy_name.lower()}%'
+    year = 'CAST(substr(published_at, 1, 4) AS INTEGER)'
+    total = connect.execute('SELECT COUNT(*) FROM vacancies WHERE salary IS NOT NULL').fetchone()[0]
+    queries = [
+        (f'SELECT {year}, ROUND(AVG(salary)) FROM vacancies WHERE salary IS NOT NULL GROUP BY 1', ()),
+        (f'SELECT {year}, COUNT(name) FROM vacancies GROUP BY 1', ()),
+        (f'SELECT {year}, ROUND(AVG(salary)) FROM vacancies WHERE salary IS NOT NULL AND LOWER(name) LIKE ? '
+         f'GROUP BY 1', (pattern,)),
+        (f'SELECT {year}, COUNT(name) FROM vacancies WHERE LOWER(name) LIKE ? GROUP BY 1', (pattern,)),
+        (f'SELECT area_name, ROUND(AVG(salary)) AS value FROM vacancies WHERE salary IS NOT NULL GROUP BY area_name '
+         f'HAVING COUNT(name) >= {total // 100} ORDER BY value DESC, area_name LIMIT 10', ()),
+        (f'SELECT area_name, ROUND(COUNT(salary) / {total}.0, 3) AS value FROM vacancies GROUP BY area_name '
+         f'HAVING COUNT(name) >= {total // 100} ORDER BY value DESC, area_name LIMIT 10', ())
+    ]
+    return [connect.execute(query, parameters).fetchall() for query, parameters in queries]
+
+
+class StatisticsTests(TestCase):
+    def setUp(self):
+        self.connect = sqlite3.connect(':memory:')
+        insert_vacancies(self.connect, make_vacancies())
+        create_indexes(self.connect, VACANCY_INDEXES)
+
+    def tearDown(self):
+        self.connect.close()
+
+    def assert_reference(self, vacancy_name):
+        statistics = get_statistics(self.connect, vacancy_name)
+        for df, reference in zip(statistics.values(), get_reference(self.connect, vacancy_name)):
+            self.assertEqual(list(df.itertuples(index=False, name=None)), reference)
+
+    def test_statistics_match_separate_queries(self):
+        self.assert_reference('python')
+
+    def test_statistics_columns(self):
+        statistics = get_statistics(self.connect, 'python')
+        self.assertEqual(list(statistics['count_by_year'].columns), ['Year', 'count_vacancies'])
+        self.assertEqual(list(statistics['fraction_by_area'].columns), ['area_name', 'fraction_vacancies'])
+        self.assertEqual(len(statistics['salary_by_area']), 2)
+
+    def test_statistics_unknown_profession(self):
+        statistics = get_statistics(self.connect, 'повар')
+        self.assertTrue(statistics['selected_count_by_year'].empty)
+        self.assertFalse(statistics['count_by_year'].empty)
+
+    def test_name_pattern_escape(self):
+        self.assertEqual(get_name_pattern('C_%'), '%c\\_\\%%')
+        self.assertTrue(get_statistics(self.connect, '%')['selected_count_by_year'].empty)
+
+    def test_plan_uses_indexes(self):
+        plan = explain_statistics(self.connect, 'python')
+        self.assertIn('SCAN vacancies USING COVERING INDEX idx_vacancies_year_area', plan)
+        self.assertEqual(plan.count('SCAN vacancies_fts VIRTUAL TABLE INDEX 0:M1'), 1)
+        self.assertIn('SEARCH vacancy USING INTEGER PRIMARY KEY (rowid=?)', plan)
+        self.assertNotIn('SCAN vacancies', plan)
+
+    def test_statistics_short_name(self):
+        self.assert_reference('py')
+
+
+class PrepareStatisticsTests(TestCase):
+    def test_prepare_table_without_year(self):
+        connect = sqlite3.connect(':memory:')
+        pd.DataFrame(make_vacancies(500), columns=['name', 'salary', 'salary_currency', 'area_name', 'published_at']
+                     ).to_sql('vacancies', connect, index=False)
+        prepare_statistics(connect)
+        self.assertEqual(connect.execute('SELECT COUNT(*) FROM vacancies WHERE year IS NULL').fetchone(), (0,))
+        self.assertIn('SCAN vacancies USING COVERING INDEX idx_vacancies_year_area', explain_statistics(connect))
+        statistics = get_statistics(connect, 'python')
+        for df, reference in zip(statistics.values(), get_reference(connect, 'python')):
+            self.assertEqual(list(df.itertuples(index=False, name=None)), reference)
+        connect.close()
+
+    def test_year_column(self):
+        connect = sqlite3.connect(':memory:')
+        create_vacancy_table(connect)
+        insert_vacancies(connect, [('Программист', 1000.0, 'RUR', 'Москва', '2022-07-01T10:00:00+0300')])
+        self.assertEqual(connect.execute('SELECT year FROM vacancies').fetchone(), (2022,))
+        connect.close()
+
+
+class RollupTests(TestCase):
+    def setUp(self):
+        self.connect = sqlite3.connect(':memory:')
+        self.vacancies = make_vacancies(2000)
+        insert_vacancies(self.connect, self.vacancies[:1500])
+        create_indexes(self.connect, VACANCY_INDEXES)
+
+    def tearDown(self):
+        self.connect.close()
+
+    def assert_rollup(self, vacancy_name):
+        refresh_rollups(self.connect, [vacancy_name])
+        rollup = get_statistics(self.connect, vacancy_name, rollup=True)
+        for statistic, df in get_statistics(self.connect, vacancy_name).items():
+            self.assertEqual(list(rollup[statistic].itertuples(index=False, name=None)),
+                             list(df.itertuples(index=False, name=None)), statistic)
+
+    def test_rollup_matches_raw(self):
+        self.assert_rollup('python')
+        self.assert_rollup('py')
+
+    def test_rollup_appends_new_rows(self):
+        self.assert_rollup('python')
+        insert_vacancies(self.connect, self.vacancies[1500:])
+        self.assertEqual(refresh_rollups(self.connect), 2)
+        self.assertEqual(refresh_rollups(self.connect), 0)
+        self.assert_rollup('python')
+
+    def test_rollup_reset_on_change(self):
+        self.assert_rollup('python')
+        self.connect.execute("UPDATE vacancies SET area_name = 'Москва', name = 'Python' WHERE rowid <= 100")
+        self.assert_rollup('python')
+        self.connect.execute('DELETE FROM vacancies WHERE rowid > 1000')
+        self.assert_rollup('python')
+        self.connect.execute('DELETE FROM vacancies')
+        self.assert_rollup('python')
+        self.assertEqual(self.connect.execute('SELECT COUNT(*) FROM vacancy_rollup').fetchone(), (0,))
+
+    def test_rollup_refresh_without_changes(self):
+        for _ in range(2):
+            refresh_rollups(self.connect, ['python'])
+            changes = self.connect.total_changes
+            self.assertEqual(refresh_rollups(self.connect, ['python']), 0)
+            self.assertEqual(self.connect.total_changes, changes)
+            self.connect.execute('DELETE FROM vacancies')
+
+    def test_rollup_plan(self):
+        refresh_rollups(self.connect, ['python'])
+        plan = explain_statistics(self.connect, 'python', rollup=True)
+        self.assertFalse(any('vacancies' in line for line in plan))
+        self.assertIn('SEARCH profession_rollup USING PRIMARY KEY (profession=?)', plan)